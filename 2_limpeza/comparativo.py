@@ -0,0 +1,11 @@
+import os
+import sys
+
+# A comparação fica no pacote compartilhado belmicro.comparacao (na raiz do
+# repositório): gera a coluna Comparativo a partir dos resultados da limpeza.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from belmicro.comparacao.cli import main
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
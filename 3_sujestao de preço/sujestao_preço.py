@@ -1,218 +1,77 @@
-import pandas as pd
-import numpy as np
 import os
-import re
+import sys
 
-# Importar bibliotecas do openpyxl para formatação
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Alignment, Font, NamedStyle
-from openpyxl.utils import get_column_letter
+# Pacote compartilhado do pipeline (na raiz do repositório)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.caminhos import PASTA_LIMPEZA
+from belmicro.etapa_sugestao import ConfigSugestao, executar_sugestao
 
 # --- 1. CONFIGURAÇÃO ---
-ARQUIVO_ENTRADA = r"C:\Users\asf\Documents\resultado final shopee\limpeza coleta\resultados_shopee_finalissimo.xlsx"
-ARQUIVO_SAIDA = r"C:\Users\asf\Documents\resultado final shopee\limpeza coleta\REsLATORIO_CORRIGIDO_V5_FINAL.xlsx" # Novo nome de saída (V5)
+# Produtos com a coluna Comparativo (.parquet da etapa de comparação; um .xlsx feito
+# à mão também é aceito)
+ARQUIVO_ENTRADA = os.path.join(PASTA_LIMPEZA, "resultados_comparativo.parquet")
+# Relatório tipado (Parquet) para as próximas análises
+ARQUIVO_SAIDA_DADOS = os.path.join(PASTA_LIMPEZA, "relatorio_sugestao.parquet")
+# Modo incremental: guarda a impressão digital da entrada de cada termo e, na próxima
+# execução, só recalcula os termos que mudaram (o resto vem do relatório anterior);
+# as variações de preço em relação ao relatório anterior vão para uma aba própria
+MODO_INCREMENTAL = True
+ARQUIVO_IMPRESSOES = os.path.join(PASTA_LIMPEZA, "relatorio_sugestao_termos.parquet")
+ARQUIVO_VARIACOES = os.path.join(PASTA_LIMPEZA, "variacoes_precos.parquet")
+# Histórico de preços gravado pelo robô da limpeza (belmicro.historico). Com
+# PRECO_REFERENCIA = "atual", vale o preço da última coleta; com "mediana", o preço
+# de cada concorrente é a mediana dele nos últimos JANELA_MEDIANA_DIAS dias (produto
+# fora do histórico fica com o preço da coleta). As mudanças de preço da janela vão
+# para a aba Eventos_Precos.
+ARQUIVO_HISTORICO = os.path.join(PASTA_LIMPEZA, "historico_precos_limpeza.sqlite")
+PRECO_REFERENCIA = "atual"
+JANELA_MEDIANA_DIAS = 7
+# Relatório formatado para leitura (XLSX); None para não gerar
+ARQUIVO_SAIDA = os.path.join(PASTA_LIMPEZA, "REsLATORIO_CORRIGIDO_V5_FINAL.xlsx") # Novo nome de saída (V5)
 
 # Coluna que tem a análise "SIM" / "NÃO"
-COLUNA_ANALISE = "Comparativo" 
-
-print("🏁 INICIANDO SCRIPT DE SUGESTÃO DE PREÇO (V5 - Incluindo Belmicro) 🏁")
-
-# --- 2. FUNÇÃO DE LIMPEZA DE PREÇO ---
-def limpar_preco(valor):
-    """Converte texto/número de preço em float, corrigindo formatos e erros de 100x."""
-    if pd.isna(valor): return np.nan
-    if isinstance(valor, (int, float)):
-        if valor > 50000: return valor / 100.0
-        return float(valor)
-    s = str(valor).replace("R$", "").strip()
-    if ',' in s:
-        s = s.replace(".", "")
-        s = s.replace(",", ".")
+COLUNA_ANALISE = "Comparativo"
+
+# Estratégia do "Preço Sugerido" e outras para comparar lado a lado no relatório
+# (nomes de belmicro.estrategias.ESTRATEGIAS)
+ESTRATEGIA = "3º menor"
+ESTRATEGIAS_COMPARADAS = ["percentil 25", "ponderado por avaliação", "undercut por volume"]
+
+# --- 2. LIMPEZA DE PREÇO ---
+# Feita coluna a coluna por belmicro.numeros.converter_precos (formatos "R$ 1.234,56",
+# faixas "R$ 100 - R$ 150" e correção de preços 100x maiores).
+
+# --- 3. LÓGICA DE SUGESTÃO ---
+# Mapa de preços da Belmicro, filtro dos aprovados ("SIM"), 3º menor preço e posição
+# da Belmicro por termo: tudo vetorizado em belmicro.sugestao.gerar_sugestoes. A
+# etapa inteira (leitura, histórico, relatório incremental e planilha) fica em
+# belmicro.etapa_sugestao, também usada pelo orquestrador (python -m belmicro).
+
+
+def main():
+    print("🏁 INICIANDO SCRIPT DE SUGESTÃO DE PREÇO (V5 - Incluindo Belmicro) 🏁")
+    config = ConfigSugestao(
+        arquivo_entrada=ARQUIVO_ENTRADA,
+        arquivo_saida_dados=ARQUIVO_SAIDA_DADOS,
+        arquivo_saida=ARQUIVO_SAIDA,
+        modo_incremental=MODO_INCREMENTAL,
+        arquivo_impressoes=ARQUIVO_IMPRESSOES,
+        arquivo_variacoes=ARQUIVO_VARIACOES,
+        arquivo_historico=ARQUIVO_HISTORICO,
+        preco_referencia=PRECO_REFERENCIA,
+        janela_mediana_dias=JANELA_MEDIANA_DIAS,
+        coluna_analise=COLUNA_ANALISE,
+        estrategia=ESTRATEGIA,
+        estrategias_comparadas=ESTRATEGIAS_COMPARADAS,
+    )
     try:
-        preco = float(s)
-        if preco > 50000: return preco / 100.0
-        return preco
-    except Exception: return np.nan
-
-# --- 3. LER PLANILHA E PREPARAR DADOS ---
-print(f"📂 Lendo planilha: {ARQUIVO_ENTRADA}")
-try:
-    df = pd.read_excel(ARQUIVO_ENTRADA)
-except FileNotFoundError:
-    print(f"❌ ERRO: O arquivo '{ARQUIVO_ENTRADA}' não foi encontrado. Verifique o caminho.")
-    exit()
-
-print("🧹 Limpando e corrigindo todos os preços...")
-df["Preço (R$)"] = df.get("Preço (R$)", pd.Series(dtype=float)).apply(limpar_preco)
-df["Preço Belmicro (R$)"] = df.get("Preço Belmicro (R$)", pd.Series(dtype=float)).apply(limpar_preco)
-print("✅ Preços corrigidos e normalizados para float.")
-
-# --- 4. LÓGICA DE SUGESTÃO (CORRIGIDA) ---
-print("📊 Gerando relatório de sugestão de preço...")
-
-# --- ETAPA 4.1: CRIAR O "MAPA DE PREÇOS BELMICRO" ---
-# (Esta parte continua a mesma, crucial para a lógica)
-mapa_precos_belmicro = {}
-mapa_avaliacoes_belmicro = {}
-for termo, grupo in df.groupby("Termo Pesquisado"):
-    belmicro_row = grupo[grupo["Vendedor"].str.contains("belmicro", case=False, na=False)]
-    if not belmicro_row.empty:
-        mapa_precos_belmicro[termo] = belmicro_row.iloc[0]["Preço Belmicro (R$)"]
-        mapa_avaliacoes_belmicro[termo] = belmicro_row.iloc[0]["Avaliação Média"]
-print(" -> Mapa de preços de referência da Belmicro foi criado.")
-
-# --- ETAPA 4.2: FILTRAR PRODUTOS APROVADOS (AGORA INCLUINDO BELMICRO) ---
-# Em vez de filtrar *apenas* concorrentes, vamos filtrar TODOS os produtos "SIM"
-if COLUNA_ANALISE not in df.columns:
-    print(f"❌ ERRO: Coluna de filtro '{COLUNA_ANALISE}' não foi encontrada!")
-    exit()
-    
-df_aprovados = df[df[COLUNA_ANALISE].str.startswith('SIM', na=False)].copy()
-print(f" -> {len(df_aprovados)} produtos aprovados ('SIM') no total (Belmicro + Concorrentes) serão analisados.")
-
-
-# --- ETAPA 4.3: GERAR O RELATÓRIO FINAL (LÓGICA ATUALIZADA) ---
-linhas = []
-for termo, grupo in df_aprovados.groupby("Termo Pesquisado"):
-    
-    preco_belmicro = mapa_precos_belmicro.get(termo, np.nan)
-    avaliacao_belmicro = mapa_avaliacoes_belmicro.get(termo, "-")
-    
-    # Pega os preços dos concorrentes APROVADOS
-    concorrentes_df = grupo[~grupo["Vendedor"].str.contains("belmicro", case=False, na=False)]
-    precos_concorrentes = sorted(concorrentes_df["Preço (R$)"].dropna().unique().tolist())
-    
-    # Lista de todos os preços (Belmicro + Concorrentes APROVADOS)
-    precos_todos = list(precos_concorrentes)
-    if not np.isnan(preco_belmicro):
-        precos_todos.append(preco_belmicro)
-    precos_todos = sorted(list(set(precos_todos)))
-
-    if len(precos_todos) == 0:
-        continue
-
-    # Posição Belmicro
-    posicao = "-"
-    if not np.isnan(preco_belmicro) and preco_belmicro in precos_todos:
-        posicao = f"{precos_todos.index(preco_belmicro)+1}º de {len(precos_todos)}"
-
-    # Preço sugerido = 3º menor preço
-    preco_sugerido = np.nan
-    if len(precos_todos) >= 3:
-        preco_sugerido = precos_todos[2]
-    elif len(precos_todos) == 2:
-        preco_sugerido = precos_todos[1]
-    else:
-        preco_sugerido = precos_todos[0]
-
-    # --- ALTERAÇÃO AQUI: Adiciona a linha da Belmicro primeiro ---
-    belmicro_row_df = grupo[grupo["Vendedor"].str.contains("belmicro", case=False, na=False)]
-    if not belmicro_row_df.empty:
-        belmicro_row = belmicro_row_df.iloc[0] # Pega a primeira linha da Belmicro
-        linhas.append({
-            "Termo Pesquisado (produto belmicro)": termo,
-            "Termo Encontrado": belmicro_row["Nome"],
-            "Vendedor Concorrente": "BELMICRO (REFERÊNCIA)", # Identificação clara
-            "Preço Concorrente": np.nan, # Deixa o preço concorrente vazio
-            "Preço Belmicro Atual": preco_belmicro,
-            "Preço Sugerido": preco_sugerido, # Repete o sugerido para o grupo
-            "Avaliação Belmicro": avaliacao_belmicro,
-            "Avaliação Concorrente": belmicro_row["Avaliação Média"], # Avaliação dela mesma
-            "Link da Loja": belmicro_row["Link Loja"],
-            "URL": belmicro_row["URL"]
-        })
-    # --- FIM DA ALTERAÇÃO ---
-
-    # Agora adiciona os concorrentes
-    for _, row in concorrentes_df.iterrows():
-        linhas.append({
-            "Termo Pesquisado (produto belmicro)": termo,
-            "Termo Encontrado": row["Nome"],
-            "Vendedor Concorrente": row["Vendedor"],
-            "Preço Concorrente": row["Preço (R$)"],
-            "Preço Belmicro Atual": preco_belmicro,
-            "Preço Sugerido": preco_sugerido,
-            "Avaliação Belmicro": avaliacao_belmicro,
-            "Avaliação Concorrente": row["Avaliação Média"],
-            "Link da Loja": row["Link Loja"],
-            "URL": row["URL"]
-        })
-    
-    # Linha separadora
-    linhas.append({
-        "Termo Pesquisado (produto belmicro)": "──────────────────────────────────────────────"
-    })
-
-# --- 5. SALVAR RESULTADO ---
-print("💾 Salvando planilha final formatada...")
-df_final = pd.DataFrame(linhas)
-
-# Renomeia as colunas de preço para a formatação final
-df_final = df_final.rename(columns={
-    "Preço Concorrente": "Preço Concorrente (R$)",
-    "Preço Belmicro Atual": "Preço Belmicro (R$)",
-    "Preço Sugerido": "Preço Sugerido (R$)"
-})
-
-# Formata as colunas de preço para texto (R$)
-# Usamos .applymap para evitar o SettingWithCopyWarning, mas a lógica é a mesma
-df_final["Preço Concorrente (R$)"] = df_final["Preço Concorrente (R$)"].apply(lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") if pd.notna(x) else "")
-df_final["Preço Belmicro (R$)"] = df_final["Preço Belmicro (R$)"].apply(lambda x: f"R$ {x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") if pd.notna(x) else "")
-df_final["Preço Sugerido (R$)"] = df_final["Preço Sugerido (R$)"].apply(lambda x: f"R$ {x:,.2f} (3º lugar)".replace(",", "X").replace(".", ",").replace("X", ".") if pd.notna(x) else "")
-
-PASTA_SAIDA = os.path.dirname(ARQUIVO_SAIDA)
-if not os.path.exists(PASTA_SAIDA):
-    os.makedirs(PASTA_SAIDA)
-    print(f"✅ Pasta de saída criada em: {PASTA_SAIDA}")
-
-with pd.ExcelWriter(ARQUIVO_SAIDA, engine="openpyxl") as writer:
-    df_final.to_excel(writer, index=False, sheet_name="Relatorio_Final")
-    ws = writer.sheets["Relatorio_Final"]
-    
-    green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    yellow_fill = PatternFill(start_color="FFFFE0", end_color="FFFFE0", fill_type="solid") # Amarelo para Belmicro
-    align_center = Alignment(horizontal="center")
-    bold_font = Font(bold=True)
-
-    # Cabeçalhos
-    for cell in ws["1:1"]:
-        cell.font = bold_font
-        cell.alignment = align_center
-
-    # Encontra as colunas pelo nome final
-    col_letra_sugerido = get_column_letter(df_final.columns.get_loc("Preço Sugerido (R$)") + 1)
-    col_letra_conc = get_column_letter(df_final.columns.get_loc("Preço Concorrente (R$)") + 1)
-    col_letra_bel = get_column_letter(df_final.columns.get_loc("Preço Belmicro (R$)") + 1)
-    col_letra_vendedor = get_column_letter(df_final.columns.get_loc("Vendedor Concorrente") + 1)
+        return executar_sugestao(config)
+    except FileNotFoundError:
+        print(f"❌ ERRO: O arquivo '{config.arquivo_entrada}' não foi encontrado. Verifique o caminho.")
+    except KeyError as erro:
+        print(f"❌ ERRO: {erro.args[0]}")
+    return None
 
-    # Loop de formatação
-    for row in range(2, ws.max_row + 1):
-        # Pinta o Preço Sugerido de verde
-        ws[f"{col_letra_sugerido}{row}"].fill = green_fill
-        ws[f"{col_letra_sugerido}{row}"].alignment = align_center
-        
-        # Centraliza os outros preços
-        ws[f"{col_letra_conc}{row}"].alignment = align_center
-        ws[f"{col_letra_bel}{row}"].alignment = align_center
-        
-        # --- ALTERAÇÃO: Pinta a linha da Belmicro de Amarelo ---
-        cell_vendedor = ws[f"{col_letra_vendedor}{row}"]
-        if "BELMICRO (REFERÊNCIA)" in str(cell_vendedor.value):
-            for col_idx in range(1, ws.max_column + 1):
-                ws.cell(row=row, column=col_idx).fill = yellow_fill
-        # --- FIM DA ALTERAÇÃO ---
-        
-    # Ajustar largura das colunas
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2)
-        ws.column_dimensions[column].width = min(adjusted_width, 60)
 
-print(f"✅ Relatório gerado com sucesso: {ARQUIVO_SAIDA}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Pipeline Belmicro: coleta na Shopee, limpeza e sugestão de preço."""
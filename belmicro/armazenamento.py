@@ -0,0 +1,145 @@
+"""Armazenamento intermediário do pipeline em Parquet (colunar e tipado).
+
+As etapas trocam dados por arquivos .parquet com esquema declarado aqui: preços e
+contagens já chegam como float64 (sem reinterpretar "R$ 1.234,56" a cada etapa) e
+a leitura é feita com memory map. XLSX fica só como exportação para leitura humana
+(`exportar_xlsx`), e `ler_tabela` continua aceitando planilhas .xlsx/.csv como
+entrada (lista de produtos, comparativos feitos à mão).
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .numeros import converter_numeros
+
+TEXTO = pa.string()
+NUMERO = pa.float64()
+
+# Campos de cada produto coletado na Shopee (ver SELETORES_PRODUTO do robô)
+CAMPOS_PRODUTO = [
+    pa.field('Nome', TEXTO),
+    pa.field('Preço (R$)', NUMERO),
+    pa.field('Avaliação Média', NUMERO),
+    pa.field('Total de Avaliações', NUMERO),
+    pa.field('Vendidos', NUMERO),
+    pa.field('Vendedor', TEXTO),
+    pa.field('Link Loja', TEXTO),
+    pa.field('URL', TEXTO),
+]
+
+# Entrada da sugestão de preço: produtos + preço de referência + análise SIM/NÃO
+ESQUEMA_COMPARATIVO = pa.schema(CAMPOS_PRODUTO + [
+    pa.field('Termo Pesquisado', TEXTO),
+    pa.field('Preço Belmicro (R$)', NUMERO),
+    pa.field('Comparativo', TEXTO),
+])
+
+# Relatório de sugestão (valores numéricos, antes da formatação em R$)
+ESQUEMA_RELATORIO = pa.schema([
+    pa.field('Termo Pesquisado (produto belmicro)', TEXTO),
+    pa.field('Termo Encontrado', TEXTO),
+    pa.field('Vendedor Concorrente', TEXTO),
+    pa.field('Preço Concorrente', NUMERO),
+    pa.field('Preço Belmicro Atual', NUMERO),
+    pa.field('Preço Sugerido', NUMERO),
+    pa.field('Posição Belmicro', TEXTO),
+    pa.field('Avaliação Belmicro', NUMERO),
+    pa.field('Avaliação Concorrente', NUMERO),
+    pa.field('Link da Loja', TEXTO),
+    pa.field('URL', TEXTO),
+])
+
+# Modo incremental da sugestão: impressão digital da entrada de cada termo
+ESQUEMA_IMPRESSOES = pa.schema([
+    pa.field('termo', TEXTO),
+    pa.field('impressao', pa.uint64()),
+])
+
+# Preços que mudaram entre o relatório anterior e o atual
+ESQUEMA_VARIACOES = pa.schema([
+    pa.field('Termo Pesquisado (produto belmicro)', TEXTO),
+    pa.field('Tipo', TEXTO),
+    pa.field('Vendedor', TEXTO),
+    pa.field('Preço Anterior', NUMERO),
+    pa.field('Preço Atual', NUMERO),
+    pa.field('Variação (R$)', NUMERO),
+    pa.field('Variação (%)', NUMERO),
+    pa.field('Situação', TEXTO),
+    pa.field('URL', TEXTO),
+])
+
+
+def esquema_produtos(colunas_termo):
+    """Esquema da saída do robô: campos do produto + colunas de termo do perfil."""
+    return pa.schema(CAMPOS_PRODUTO + [pa.field(coluna, TEXTO) for coluna in colunas_termo])
+
+
+def _coluna_arrow(serie, tipo):
+    if pa.types.is_integer(tipo) and pd.api.types.is_integer_dtype(serie):
+        # Inteiros grandes (hashes) não podem passar por float64
+        return pa.array(serie.to_numpy(), type=tipo)
+    if pa.types.is_floating(tipo) or pa.types.is_integer(tipo):
+        # Textos que não são número ('Não encontrado', '-') viram nulo
+        return pa.array(converter_numeros(serie).to_numpy(), type=NUMERO, from_pandas=True).cast(tipo)
+    if pa.types.is_string(tipo):
+        return pa.Array.from_pandas(serie.astype('string'), type=tipo)
+    return pa.Array.from_pandas(serie, type=tipo)
+
+
+def tabela_arrow(df, esquema):
+    """DataFrame -> Table no esquema declarado.
+
+    Colunas do esquema que faltam no DataFrame ficam nulas; colunas a mais são
+    mantidas no fim, com o tipo inferido (ou texto, se a coluna for mista).
+    """
+    colunas, campos = [], []
+    for campo in esquema:
+        if campo.name in df.columns:
+            colunas.append(_coluna_arrow(df[campo.name], campo.type))
+        else:
+            colunas.append(pa.nulls(len(df), type=campo.type))
+        campos.append(campo)
+    for nome in df.columns:
+        if nome in esquema.names:
+            continue
+        try:
+            coluna = pa.Array.from_pandas(df[nome])
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            coluna = _coluna_arrow(df[nome], TEXTO)
+        colunas.append(coluna)
+        campos.append(pa.field(str(nome), coluna.type))
+    return pa.Table.from_arrays(colunas, schema=pa.schema(campos))
+
+
+def gravar_parquet(df, caminho, esquema):
+    """Grava o DataFrame em Parquet (zstd) no esquema declarado."""
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    pq.write_table(tabela_arrow(df, esquema), caminho, compression='zstd')
+
+
+def ler_parquet(caminho, colunas=None):
+    """Lê um Parquet do pipeline (memory map; `colunas` lê só as pedidas)."""
+    return pq.read_table(caminho, columns=colunas, memory_map=True).to_pandas()
+
+
+def ler_tabela(caminho, colunas=None):
+    """Lê a entrada de uma etapa conforme a extensão (.parquet, .xlsx/.xls ou .csv)."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.parquet':
+        return ler_parquet(caminho, colunas)
+    if extensao == '.csv':
+        return pd.read_csv(caminho, usecols=colunas)
+    return pd.read_excel(caminho, usecols=colunas)
+
+
+def exportar_xlsx(df, caminho):
+    """Cópia em XLSX para leitura humana (não é lida pelas outras etapas)."""
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    df.to_excel(caminho, index=False)
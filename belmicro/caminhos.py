@@ -0,0 +1,17 @@
+"""Pastas padrão dos arquivos do pipeline (máquina de produção, Windows).
+
+A pasta raiz pode ser trocada pela variável de ambiente BELMICRO_PASTA (ou por
+`--pasta` no orquestrador, `python -m belmicro`).
+"""
+
+import os
+
+PASTA_RESULTADOS = os.environ.get('BELMICRO_PASTA', r'C:\Users\asf\Documents\resultado final shopee')
+
+
+def pastas_etapas(raiz=PASTA_RESULTADOS):
+    """Pastas da coleta bruta e da limpeza dentro da pasta raiz."""
+    return os.path.join(raiz, 'coleta bruta'), os.path.join(raiz, 'limpeza coleta')
+
+
+PASTA_COLETA_BRUTA, PASTA_LIMPEZA = pastas_etapas()
@@ -0,0 +1,6 @@
+"""Robô de coleta da Shopee compartilhado pelas etapas de coleta bruta e limpeza."""
+
+from .config import PERFIS, PerfilExecucao
+from .execucao import executar_coleta
+
+__all__ = ['PERFIS', 'PerfilExecucao', 'executar_coleta']
@@ -0,0 +1,175 @@
+"""Estado da página logo depois de cada carregamento e acompanhamento dos bloqueios.
+
+Toda página aberta pelo robô é classificada como produto, busca, vazia, CAPTCHA
+ou tela de login, pelo endereço e pelos mesmos marcadores (XPath) no navegador
+e no HTML baixado. CAPTCHA e login são bloqueios: a extração levanta
+PaginaBloqueada em vez de devolver um produto com todos os campos 'Não
+encontrado', e o motor troca o navegador e tenta de novo (MotorReciclavel).
+
+O monitor BLOQUEIOS guarda o estado de cada carregamento com o horário, para
+acompanhar a taxa de bloqueio ao longo da execução.
+"""
+
+import json
+import threading
+import time
+
+import pandas as pd
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .metricas import METRICAS
+
+PRODUTO = 'produto'
+BUSCA = 'busca'
+VAZIA = 'vazia'
+CAPTCHA = 'captcha'
+LOGIN = 'login'
+DESCONHECIDA = 'desconhecida'
+ESTADOS_BLOQUEIO = (CAPTCHA, LOGIN)
+
+# Trechos do endereço para onde a Shopee redireciona quando bloqueia
+MARCADORES_URL = [
+    (CAPTCHA, ('/verify/', 'captcha')),
+    (LOGIN, ('/buyer/login',)),
+]
+# Elementos de cada tipo de página, na ordem em que são testados
+MARCADORES_HTML = [
+    (CAPTCHA, '//*[contains(@class,"shopee-captcha")]'),
+    (LOGIN, '//input[@name="loginKey"]'),
+    (PRODUTO, '//div[contains(@class,"page-product")]'),
+    (BUSCA, '//li[contains(@class,"shopee-search-item-result__item")]'),
+    (VAZIA, '//*[contains(@class,"shopee-search-empty-result-section")]'),
+]
+
+MODELO_SCRIPT_ESTADO = """
+const url = location.href.toLowerCase();
+for (const [estado, trechos] of %s) {
+    if (trechos.some(trecho => url.includes(trecho))) return estado;
+}
+for (const [estado, xpath] of %s) {
+    if (document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue) {
+        return estado;
+    }
+}
+return null;
+"""
+SCRIPT_ESTADO = MODELO_SCRIPT_ESTADO % (json.dumps(MARCADORES_URL), json.dumps(MARCADORES_HTML))
+
+
+class PaginaBloqueada(Exception):
+    """A página carregada era um CAPTCHA ou a tela de login (nada dela vira produto)."""
+
+    def __init__(self, estado, url):
+        super().__init__(f"{estado} em {url}")
+        self.estado = estado
+        self.url = url
+
+
+class SessaoExpirada(Exception):
+    """A tela de login apareceu no navegador principal e não há como pedir o login de novo."""
+
+    def __init__(self, caminho_perfil):
+        super().__init__(f"sessão da Shopee expirada no perfil {caminho_perfil}")
+        self.caminho_perfil = caminho_perfil
+
+
+def estado_pela_url(url):
+    """CAPTCHA ou LOGIN se o endereço for o de um bloqueio; None se não der para saber pela URL."""
+    url = (url or '').lower()
+    for estado, trechos in MARCADORES_URL:
+        if any(trecho in url for trecho in trechos):
+            return estado
+    return None
+
+
+def classificar_arvore(arvore, url):
+    """Estado da página a partir do HTML já interpretado pelo lxml."""
+    estado = estado_pela_url(url)
+    if estado:
+        return estado
+    for estado, xpath in MARCADORES_HTML:
+        if arvore.xpath(xpath):
+            return estado
+    return DESCONHECIDA
+
+
+def classificar_pagina(driver):
+    """Estado da página aberta no navegador (um único execute_script); None enquanto não dá para saber."""
+    return driver.execute_script(SCRIPT_ESTADO)
+
+
+def esperar_estado(driver, timeout):
+    """Espera a página se definir (produto, busca, vazia, CAPTCHA ou login) e devolve o estado.
+
+    Um CAPTCHA é reconhecido já na primeira verificação, sem esperar o timeout.
+    """
+    try:
+        return WebDriverWait(driver, timeout).until(classificar_pagina)
+    except TimeoutException:
+        return DESCONHECIDA
+
+
+class MonitorBloqueios:
+    """Estado de cada página carregada, com o horário (seguro entre threads)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.carregamentos = []   # (horário, estado, tipo de página esperado)
+        self.bloqueios = []       # detalhes de cada bloqueio, para o relatório
+        self.reciclagens = 0
+        self.descartadas = []     # URLs deixadas de fora: continuaram bloqueadas ou a extração falhou
+
+    def registrar(self, estado, url, pagina):
+        """Guarda o estado de uma página de `pagina` ('produto' ou 'busca') e devolve se é bloqueio."""
+        bloqueio = estado in ESTADOS_BLOQUEIO
+        with self._trava:
+            self.carregamentos.append((time.time(), estado, pagina))
+            if bloqueio:
+                self.bloqueios.append({'horario': time.strftime('%H:%M:%S'), 'estado': estado,
+                                       'pagina': pagina, 'url': url})
+        METRICAS.contar(f'pagina.{estado}', pagina=pagina)
+        return bloqueio
+
+    def reciclagem(self):
+        with self._trava:
+            self.reciclagens += 1
+        METRICAS.contar('reciclagem')
+
+    def descartar(self, url, motivo='bloqueio'):
+        """Produto que fica fora da saída (sem linha vazia); o termo dele não é concluído."""
+        with self._trava:
+            self.descartadas.append(url)
+        METRICAS.contar('bloqueio.descartada', motivo=motivo)
+
+    def taxa(self, segundos=None):
+        """Fração das páginas bloqueadas (todas, ou só as dos últimos `segundos`)."""
+        limite = time.time() - segundos if segundos else 0
+        with self._trava:
+            estados = [estado for horario, estado, _ in self.carregamentos if horario >= limite]
+        return sum(estado in ESTADOS_BLOQUEIO for estado in estados) / len(estados) if estados else 0.0
+
+    def serie(self, minutos=5):
+        """Páginas, bloqueios e taxa de bloqueio a cada `minutos` minutos da execução."""
+        with self._trava:
+            df = pd.DataFrame(self.carregamentos, columns=['horario', 'estado', 'pagina'])
+        df['bloqueada'] = df['estado'].isin(ESTADOS_BLOQUEIO)
+        df['intervalo'] = pd.to_datetime(df['horario'], unit='s').dt.floor(f'{minutos}min')
+        serie = df.groupby('intervalo').agg(paginas=('estado', 'size'), bloqueadas=('bloqueada', 'sum'))
+        serie['taxa'] = (serie['bloqueadas'] / serie['paginas']).round(3)
+        return serie
+
+    def resumo(self):
+        with self._trava:
+            total = len(self.carregamentos)
+            por_estado = pd.Series([estado for _, estado, _ in self.carregamentos], dtype=object).value_counts()
+            reciclagens, descartadas = self.reciclagens, len(self.descartadas)
+        bloqueadas = int(por_estado.reindex(list(ESTADOS_BLOQUEIO), fill_value=0).sum())
+        estados = ', '.join(f"{estado}: {quantidade}" for estado, quantidade in por_estado.items()) or 'nenhuma'
+        return (f"🛡️ Páginas: {total} carregadas ({estados}); {bloqueadas} bloqueadas "
+                f"({self.taxa():.1%}, {self.taxa(600):.1%} nos últimos 10 min), {reciclagens} navegadores "
+                f"reciclados, {descartadas} produtos deixados de fora (bloqueio ou falha na extração).")
+
+
+# Instância única usada pelo robô inteiro (busca, produtos, todos os workers)
+BLOQUEIOS = MonitorBloqueios()
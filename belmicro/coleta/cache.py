@@ -0,0 +1,105 @@
+import json
+import sqlite3
+import threading
+import time
+
+from ..produtos import chave_produto
+
+# Gravações entre dois descartes LRU (contar a tabela a cada gravação seria uma varredura por produto)
+GRAVACOES_POR_DESCARTE = 500
+
+
+class CacheProdutos:
+    """Cache persistente (SQLite) dos dados de produto, com validade e descarte LRU.
+
+    Produtos extraídos há menos de `ttl_horas` não são visitados de novo, nem em
+    outro termo da mesma execução nem em execuções dos dias seguintes.
+    """
+
+    def __init__(self, caminho, ttl_horas=24, max_itens=20000):
+        self.ttl_segundos = ttl_horas * 3600
+        self.max_itens = max_itens
+        self.acertos = 0
+        self.falhas = 0
+        self.expirados = 0
+        self.descartados = 0
+        self._gravacoes = 0
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS produtos (
+                chave TEXT PRIMARY KEY,
+                dados TEXT NOT NULL,
+                gravado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_produtos_acesso ON produtos (acessado_em);
+        """)
+        self.conexao.commit()
+
+    def obter(self, url, ttl_horas=None):
+        """Devolve uma cópia dos dados em cache do produto, ou None se não houver/expirou.
+
+        `ttl_horas` aceita uma validade menor só nesta consulta (ex.: termos voláteis
+        no modo incremental); o registro mais antigo que isso não é reaproveitado.
+        """
+        chave = chave_produto(url)
+        ttl_segundos = self.ttl_segundos if ttl_horas is None else min(self.ttl_segundos, ttl_horas * 3600)
+        agora = time.time()
+        with self._trava, self.conexao:
+            linha = self.conexao.execute(
+                'SELECT dados, gravado_em FROM produtos WHERE chave = ?', (chave,)
+            ).fetchone()
+            if linha is None:
+                self.falhas += 1
+                return None
+            if agora - linha[1] > ttl_segundos:
+                if agora - linha[1] > self.ttl_segundos:
+                    self.conexao.execute('DELETE FROM produtos WHERE chave = ?', (chave,))
+                self.expirados += 1
+                self.falhas += 1
+                return None
+            self.conexao.execute('UPDATE produtos SET acessado_em = ? WHERE chave = ?', (agora, chave))
+        self.acertos += 1
+        return json.loads(linha[0])
+
+    def gravar(self, url, dados):
+        agora = time.time()
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                'INSERT OR REPLACE INTO produtos (chave, dados, gravado_em, acessado_em) VALUES (?, ?, ?, ?)',
+                (chave_produto(url), json.dumps(dados, ensure_ascii=False), agora, agora),
+            )
+            self._gravacoes += 1
+            if self._gravacoes % GRAVACOES_POR_DESCARTE == 0:
+                self._descartar_excesso()
+
+    def _descartar_excesso(self):
+        """Descarta os itens usados há mais tempo (LRU) acima de max_itens.
+
+        Roda a cada GRAVACOES_POR_DESCARTE gravações e no fechar(): entre uma vez e
+        outra o cache passa do limite em no máximo esse tanto. A contagem é feita de
+        novo a cada vez porque outros processos (fragmentos) gravam no mesmo arquivo.
+        """
+        total = self.conexao.execute('SELECT COUNT(*) FROM produtos').fetchone()[0]
+        if total > self.max_itens:
+            excesso = total - self.max_itens
+            self.conexao.execute(
+                'DELETE FROM produtos WHERE chave IN '
+                '(SELECT chave FROM produtos ORDER BY acessado_em LIMIT ?)',
+                (excesso,),
+            )
+            self.descartados += excesso
+
+    def resumo(self):
+        consultas = self.acertos + self.falhas
+        taxa = (self.acertos / consultas * 100) if consultas else 0.0
+        return (f"🗃️ Cache de produtos: {self.acertos} acertos, {self.falhas} falhas "
+                f"({taxa:.1f}% de acerto), {self.expirados} expirados, {self.descartados} descartados (LRU).")
+
+    def fechar(self):
+        if self._gravacoes % GRAVACOES_POR_DESCARTE:
+            with self._trava, self.conexao:
+                self._descartar_excesso()
+        self.conexao.close()
@@ -0,0 +1,91 @@
+import argparse
+import dataclasses
+
+from .config import PERFIS
+from .distribuida import coordenar, executar_worker
+from .relevancia import LIMIAR_RELEVANCIA
+from .execucao import executar_coleta
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m belmicro.coleta',
+        description="Coleta de produtos da Shopee (coleta bruta ou limpeza, conforme o perfil).",
+    )
+    parser.add_argument('--perfil', choices=sorted(PERFIS), default='coleta',
+                        help="Perfil de execução: 'coleta' (etapa 1) ou 'limpeza' (etapa 2).")
+    parser.add_argument('--resume', action='store_true',
+                        help="Retoma a última execução a partir do diário, pulando termos e produtos já concluídos.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Coleta só os termos vencidos (os de preço mais volátil primeiro) e reaproveita "
+                             "a última coleta dos demais.")
+    parser.add_argument('--max-termos', type=int, help="No modo incremental, máximo de termos coletados nesta execução.")
+    parser.add_argument('--entrada', help="Planilha de termos, .xlsx ou .parquet (substitui a do perfil).")
+    parser.add_argument('--saida', help="Arquivo .parquet de resultados (substitui o do perfil).")
+    parser.add_argument('--xlsx', help="Exporta também uma cópia dos resultados em XLSX.")
+    parser.add_argument('--max-produtos', type=int, help="Limite de produtos por termo.")
+    parser.add_argument('--navegadores', type=int, help="Quantidade de Chrome extraindo produtos em paralelo.")
+    parser.add_argument('--paginas-simultaneas', type=int, help="Páginas de resultado buscadas ao mesmo tempo.")
+    parser.add_argument('--motor', choices=['selenium', 'http'], help="Motor de extração das páginas de produto.")
+    parser.add_argument('--carregamento', choices=['completo', 'leve'],
+                        help="'leve': Chrome sem imagens, fontes nem rastreadores, devolvendo a página no "
+                             "DOMContentLoaded.")
+    parser.add_argument('--cartoes', choices=['desligado', 'completar', 'somente'],
+                        help="Monta os produtos com os cartões da busca; 'completar' só abre a página "
+                             "quando falta um campo (ex.: vendedor ainda desconhecido).")
+    parser.add_argument('--relevancia', type=float, nargs='?', const=LIMIAR_RELEVANCIA, metavar='NOTA',
+                        help="Só abre os cartões com nota de relevância (0 a 1) contra o produto de referência "
+                             f"acima de NOTA (padrão {LIMIAR_RELEVANCIA}) e para de paginar quando eles acabam.")
+    parser.add_argument('--perfil-chrome', help="Perfil logado do Chrome (substitui o do perfil; um por worker "
+                                                "na mesma máquina).")
+    parser.add_argument('--sem-login', dest='aguardar_login', action='store_false', default=None,
+                        help="Não espera o Enter do login (perfil do Chrome já logado).")
+    distribuida = parser.add_mutually_exclusive_group()
+    distribuida.add_argument('--coordenar', metavar='FILA',
+                             help="Coleta distribuída: põe os termos na fila SQLite FILA, espera os workers e "
+                                  "grava a saída do perfil.")
+    distribuida.add_argument('--trabalhar', metavar='FILA',
+                             help="Coleta distribuída: worker que busca e extrai os trabalhos da fila FILA até "
+                                  "ela terminar (quantos quiser, em qualquer máquina que enxergue o arquivo).")
+    parser.add_argument('--fila-nova', action='store_true', help="Com --coordenar, descarta a fila interrompida e começa uma coleta nova.")
+    parser.add_argument('--worker', help="Com --trabalhar, nome do worker na fila (padrão: máquina-processo).")
+    return parser
+
+
+def perfil_dos_argumentos(args):
+    """Perfil escolhido com as substituições passadas na linha de comando."""
+    substituicoes = {
+        'arquivo_entrada': args.entrada,
+        'arquivo_saida': args.saida,
+        'arquivo_xlsx': args.xlsx,
+        'max_produtos': args.max_produtos,
+        'num_navegadores': args.navegadores,
+        'paginas_simultaneas': args.paginas_simultaneas,
+        'motor': args.motor,
+        'carregamento': args.carregamento,
+        'cartoes': args.cartoes,
+        'relevancia_minima': args.relevancia,
+        'caminho_perfil_chrome': args.perfil_chrome,
+        'aguardar_login': args.aguardar_login,
+    }
+    substituicoes = {campo: valor for campo, valor in substituicoes.items() if valor is not None}
+    perfil = PERFIS[args.perfil]
+    if 'arquivo_saida' in substituicoes:
+        # Diário e cache acompanham a pasta da nova saída
+        substituicoes.setdefault('arquivo_diario', None)
+        substituicoes.setdefault('arquivo_cache', None)
+        substituicoes.setdefault('arquivo_estado', None)
+        substituicoes.setdefault('arquivo_historico', None)
+        substituicoes.setdefault('arquivo_metricas', None)
+    return dataclasses.replace(perfil, **substituicoes)
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    perfil = perfil_dos_argumentos(args)
+    if args.coordenar:
+        coordenar(perfil, args.coordenar, nova=args.fila_nova)
+    elif args.trabalhar:
+        executar_worker(perfil, args.trabalhar, dono=args.worker)
+    else:
+        executar_coleta(perfil, retomar=args.resume, incremental=args.incremental, max_termos=args.max_termos)
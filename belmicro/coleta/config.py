@@ -0,0 +1,170 @@
+import os
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from ..armazenamento import esquema_produtos
+from ..caminhos import PASTA_COLETA_BRUTA, PASTA_LIMPEZA
+
+# Endereço do site. Pode ser trocado (variável de ambiente SHOPEE_URL_BASE) por um
+# servidor local com páginas HTML gravadas para testar o robô sem acessar a Shopee.
+URL_BASE = os.environ.get('SHOPEE_URL_BASE', 'https://shopee.com.br').rstrip('/')
+DOMINIO = urlparse(URL_BASE).netloc
+
+# Modo 'leve' do Chrome: só estes hosts são resolvidos (--host-resolver-rules); os
+# rastreadores e anúncios de terceiros nem chegam a abrir conexão
+HOSTS_PERMITIDOS_LEVE = [
+    urlparse(URL_BASE).hostname,
+    'shopee.com.br', '*.shopee.com.br', '*.shopeemobile.com', '*.susercontent.com',
+]
+# ...e, mesmo nesses hosts, o que só serve para desenhar a página é bloqueado
+# (Network.setBlockedURLs; '*' vale qualquer trecho)
+URLS_BLOQUEADAS_LEVE = [
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*',
+    '*.woff*', '*.ttf*', '*.otf*', '*.eot*',
+    '*.mp4*', '*.webm*', '*.m3u8*',
+    # Imagens dos produtos (CDN sem extensão no link) e vídeos
+    '*.img.susercontent.com/*', '*/video/*',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*facebook.net*',
+    '*tiktok.com*', '*hotjar.com*', '*clarity.ms*',
+]
+
+
+@dataclass
+class ModoCarregamento:
+    """Como o Chrome carrega as páginas (ver configurar_driver)."""
+
+    # 'normal' espera o load (imagens, fontes...); 'eager' devolve no DOMContentLoaded
+    estrategia: str = 'normal'
+    imagens: bool = True
+    # (largura, altura) da janela; None = maximizada
+    janela: tuple = None
+    urls_bloqueadas: list = field(default_factory=list)
+    # Vazio = todos os hosts
+    hosts_permitidos: list = field(default_factory=list)
+
+
+MODOS_CARREGAMENTO = {
+    'completo': ModoCarregamento(),
+    'leve': ModoCarregamento(estrategia='eager', imagens=False, janela=(1280, 900),
+                             urls_bloqueadas=URLS_BLOQUEADAS_LEVE, hosts_permitidos=HOSTS_PERMITIDOS_LEVE),
+}
+
+
+@dataclass
+class PerfilExecucao:
+    """Configuração de uma execução do robô.
+
+    As duas etapas do pipeline usam o mesmo robô e só diferem aqui: planilha de
+    entrada/saída, colunas de busca e de referência e limite de produtos por termo.
+    """
+
+    nome: str
+    arquivo_entrada: str
+    # Saída tipada (Parquet) lida pelas próximas etapas
+    arquivo_saida: str
+    coluna_pesquisa: str
+    # Coluna de saída -> origem do valor ('pesquisa' ou 'referencia')
+    colunas_termo: dict
+    coluna_referencia: str = None
+    # Cópia opcional em XLSX, só para leitura humana
+    arquivo_xlsx: str = None
+    max_produtos: int = 45
+    limite_paginas: int = 5  # Um limite de segurança para não rodar para sempre
+
+    # Diário de checkpoint (links e produtos já coletados), usado pelo --resume
+    arquivo_diario: str = None
+    # Produtos já extraídos há menos de cache_ttl_horas (em qualquer termo ou execução)
+    # não são abertos de novo; o registro em cache só recebe os novos termos.
+    arquivo_cache: str = None
+    cache_ttl_horas: int = 24
+    cache_max_itens: int = 20000
+    # Modo incremental (--incremental): resultados e preços da última coleta de cada
+    # termo; um termo só é coletado de novo depois do seu intervalo, que encurta
+    # (até o mínimo) quanto mais voláteis forem os preços dele
+    arquivo_estado: str = None
+    intervalo_minimo_horas: float = 6
+    intervalo_maximo_horas: float = 72
+    # Histórico de preços (só acréscimo): cada produto extraído vira uma observação
+    arquivo_historico: str = None
+    # Cronômetros e contadores da execução, uma medição por linha (JSON lines)
+    arquivo_metricas: str = None
+
+    # Perfil logado do Chrome e cópias dele para os workers do pool
+    caminho_perfil_chrome: str = r'C:\meu-perfil-selenium'
+    # False: não espera o Enter do usuário (perfil já logado; processos em paralelo)
+    aguardar_login: bool = True
+    pasta_perfis_workers: str = r'C:\meu-perfil-selenium-workers'
+    # > 1: produtos de cada termo extraídos em paralelo por vários Chrome
+    num_navegadores: int = 1
+    # > 1: páginas de resultado buscadas em paralelo (Playwright assíncrono)
+    paginas_simultaneas: int = 1
+    # 'selenium' (abre cada produto no Chrome) ou 'http' (HTML direto, Chrome só para o que faltar)
+    motor: str = 'selenium'
+    # Carregamento das páginas no Chrome: 'completo' ou 'leve' (MODOS_CARREGAMENTO)
+    carregamento: str = 'completo'
+    # Linhas montadas com os cartões da busca: 'desligado' (abre todo produto),
+    # 'completar' (abre só os produtos cujo cartão não tem algum dos campos_cartao)
+    # ou 'somente' (nunca abre a página do produto)
+    cartoes: str = 'desligado'
+    campos_cartao: tuple = ('Nome', 'Preço (R$)', 'Vendedor')
+    # Nota mínima (0 a 1) do cartão contra o produto de referência para ele ser aberto;
+    # None desliga o filtro (ver relevancia.py)
+    relevancia_minima: float = None
+
+    def __post_init__(self):
+        pasta = os.path.dirname(self.arquivo_saida)
+        if self.arquivo_diario is None:
+            self.arquivo_diario = os.path.join(pasta, f'diario_{self.nome}.sqlite')
+        if self.arquivo_cache is None:
+            self.arquivo_cache = os.path.join(pasta, f'cache_produtos_{self.nome}.sqlite')
+        if self.arquivo_estado is None:
+            self.arquivo_estado = os.path.join(pasta, f'estado_{self.nome}.sqlite')
+        if self.arquivo_historico is None:
+            self.arquivo_historico = os.path.join(pasta, f'historico_precos_{self.nome}.sqlite')
+        if self.arquivo_metricas is None:
+            self.arquivo_metricas = os.path.join(pasta, f'metricas_{self.nome}.jsonl')
+
+    @property
+    def esquema(self):
+        return esquema_produtos(self.colunas_termo)
+
+    @property
+    def colunas_obrigatorias(self):
+        return [coluna for coluna in (self.coluna_referencia, self.coluna_pesquisa) if coluna]
+
+    def rotular(self, dados, termo_pesquisa, termo_referencia=None):
+        """Grava no produto as colunas de termo que esta etapa entrega."""
+        for coluna, origem in self.colunas_termo.items():
+            dados[coluna] = termo_pesquisa if origem == 'pesquisa' else termo_referencia
+        return dados
+
+
+def criar_perfis(pasta_coleta_bruta=PASTA_COLETA_BRUTA, pasta_limpeza=PASTA_LIMPEZA):
+    """Perfis das duas etapas do robô com os arquivos nas pastas dadas."""
+    return {
+        # Etapa 1: coleta bruta, uma coluna de busca e até 45 produtos por termo
+        'coleta': PerfilExecucao(
+            nome='coleta',
+            arquivo_entrada=os.path.join(pasta_coleta_bruta, 'lista produtos.xlsx'),
+            arquivo_saida=os.path.join(pasta_coleta_bruta, 'resultados_shopee_finalissimo.parquet'),
+            coluna_pesquisa='Descricao',
+            colunas_termo={'Termo Pesquisado': 'pesquisa'},
+            max_produtos=45,
+        ),
+        # Etapa 2: busca pelo termo otimizado, guardando também o nome de referência Belmicro
+        'limpeza': PerfilExecucao(
+            nome='limpeza',
+            arquivo_entrada=os.path.join(pasta_coleta_bruta, 'lista produtos.xlsx'),
+            arquivo_saida=os.path.join(pasta_limpeza, 'resultados_shopee_finalissimo.parquet'),
+            coluna_pesquisa='Termo_Busca',  # Nome otimizado para a busca (Ex: Consul CMA20BB)
+            coluna_referencia='Descricao',  # Nome completo do produto (Ex: Micro-ondas Consul 20L...)
+            colunas_termo={
+                'Termo_Referencia_Belmicro': 'referencia',
+                'Termo_Pesquisado_Otimizado': 'pesquisa',
+            },
+            max_produtos=20,
+        ),
+    }
+
+
+PERFIS = criar_perfis()
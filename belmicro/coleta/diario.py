@@ -0,0 +1,161 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+
+def guardar_anterior(caminho):
+    """Guarda o diário como '.anterior', com o que ainda estava no WAL, e apaga o original.
+
+    A cópia é feita pela API de backup do SQLite, que lê também as páginas do
+    -wal; renomear só o arquivo principal deixaria o -wal e o -shm para trás
+    (o '.anterior' sem as últimas gravações e um -wal velho ao lado do diário novo).
+    """
+    destino = caminho + '.anterior'
+    for sufixo in ('', '-wal', '-shm'):
+        if os.path.exists(destino + sufixo):
+            os.remove(destino + sufixo)
+    antigo = sqlite3.connect(caminho)
+    copia = sqlite3.connect(destino)
+    try:
+        antigo.backup(copia)
+    finally:
+        copia.close()
+        antigo.close()
+    for sufixo in ('', '-wal', '-shm'):
+        if os.path.exists(caminho + sufixo):
+            os.remove(caminho + sufixo)
+
+
+class DiarioColeta:
+    """Diário de checkpoint (SQLite, só acrescenta) de uma execução do robô.
+
+    Guarda os links descobertos de cada termo e cada produto assim que é extraído,
+    permitindo retomar uma coleta interrompida sem repetir paginação nem produtos.
+    """
+
+    def __init__(self, caminho, retomar=False):
+        if not retomar and os.path.exists(caminho):
+            # Execução nova: o diário anterior é guardado, nunca apagado
+            guardar_anterior(caminho)
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        # O pool de navegadores grava a partir de várias threads
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS termos (
+                termo TEXT PRIMARY KEY,
+                concluido INTEGER NOT NULL DEFAULT 0,
+                links_completos INTEGER NOT NULL DEFAULT 0,
+                atualizado_em TEXT
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                termo TEXT NOT NULL,
+                posicao INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (termo, url)
+            );
+            CREATE TABLE IF NOT EXISTS produtos (
+                termo TEXT NOT NULL,
+                url TEXT NOT NULL,
+                dados TEXT NOT NULL,
+                criado_em TEXT NOT NULL,
+                PRIMARY KEY (termo, url)
+            );
+        """)
+        try:
+            # Diários gravados antes da paginação em fluxo não têm esta coluna
+            self.conexao.execute('ALTER TABLE termos ADD COLUMN links_completos INTEGER NOT NULL DEFAULT 0')
+        except sqlite3.OperationalError:
+            pass
+        self.conexao.commit()
+
+    def _agora(self):
+        return datetime.now().isoformat(timespec='seconds')
+
+    def termo_concluido(self, termo):
+        linha = self.conexao.execute('SELECT concluido FROM termos WHERE termo = ?', (termo,)).fetchone()
+        return bool(linha and linha[0])
+
+    def links_completos(self, termo):
+        """True se a paginação do termo terminou (todos os links estão no diário)."""
+        linha = self.conexao.execute('SELECT links_completos FROM termos WHERE termo = ?', (termo,)).fetchone()
+        return bool(linha and linha[0])
+
+    def urls_do_termo(self, termo):
+        """Links já descobertos para o termo (lista vazia se a paginação não foi feita)."""
+        cursor = self.conexao.execute('SELECT url FROM urls WHERE termo = ? ORDER BY posicao', (termo,))
+        return [linha[0] for linha in cursor]
+
+    def urls_concluidas(self, termo):
+        cursor = self.conexao.execute('SELECT url FROM produtos WHERE termo = ?', (termo,))
+        return {linha[0] for linha in cursor}
+
+    def registrar_urls(self, termo, urls, inicio=0):
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                'INSERT OR IGNORE INTO termos (termo, concluido, atualizado_em) VALUES (?, 0, ?)',
+                (termo, self._agora()),
+            )
+            self.conexao.executemany(
+                'INSERT OR IGNORE INTO urls (termo, posicao, url) VALUES (?, ?, ?)',
+                [(termo, posicao, url) for posicao, url in enumerate(urls, start=inicio)],
+            )
+
+    def registrar_url(self, termo, posicao, url):
+        """Registra um link assim que ele é descoberto (paginação em fluxo)."""
+        self.registrar_urls(termo, [url], inicio=posicao)
+
+    def registrar_produto(self, termo, url, dados):
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                'INSERT OR IGNORE INTO produtos (termo, url, dados, criado_em) VALUES (?, ?, ?, ?)',
+                (termo, url, json.dumps(dados, ensure_ascii=False), self._agora()),
+            )
+
+    def marcar_links_completos(self, termo):
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                'INSERT INTO termos (termo, links_completos, atualizado_em) VALUES (?, 1, ?) '
+                'ON CONFLICT(termo) DO UPDATE SET links_completos = 1, atualizado_em = excluded.atualizado_em',
+                (termo, self._agora()),
+            )
+
+    def marcar_termo_concluido(self, termo):
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                'INSERT INTO termos (termo, concluido, atualizado_em) VALUES (?, 1, ?) '
+                'ON CONFLICT(termo) DO UPDATE SET concluido = 1, atualizado_em = excluded.atualizado_em',
+                (termo, self._agora()),
+            )
+
+    def produtos(self):
+        """Todos os produtos extraídos, na ordem dos termos e dos links descobertos."""
+        cursor = self.conexao.execute("""
+            SELECT p.dados FROM produtos p
+            JOIN termos t ON t.termo = p.termo
+            LEFT JOIN urls u ON u.termo = p.termo AND u.url = p.url
+            ORDER BY t.rowid, u.posicao
+        """)
+        return [json.loads(linha[0]) for linha in cursor]
+
+    def termos_concluidos(self):
+        """(termo, atualizado_em) dos termos concluídos nesta execução, na ordem em que entraram."""
+        cursor = self.conexao.execute('SELECT termo, atualizado_em FROM termos WHERE concluido = 1 ORDER BY rowid')
+        return cursor.fetchall()
+
+    def produtos_do_termo(self, termo):
+        """Produtos extraídos de um termo, na ordem dos links descobertos."""
+        cursor = self.conexao.execute("""
+            SELECT p.dados FROM produtos p
+            LEFT JOIN urls u ON u.termo = p.termo AND u.url = p.url
+            WHERE p.termo = ?
+            ORDER BY u.posicao
+        """, (termo,))
+        return [json.loads(linha[0]) for linha in cursor]
+
+    def fechar(self):
+        self.conexao.close()
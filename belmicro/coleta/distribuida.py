@@ -0,0 +1,273 @@
+"""Coleta distribuída: um coordenador e qualquer número de workers em volta de uma FilaColeta.
+
+O coordenador põe os termos da planilha na fila, espera os workers e monta a
+saída do perfil (o mesmo Parquet, com o mesmo esquema, de executar_coleta) na
+ordem dos termos da planilha e dos links de cada busca. Cada worker, em
+qualquer processo ou máquina que enxergue o arquivo da fila, arrenda um
+trabalho por vez: o de termo faz a busca e enfileira os produtos descobertos;
+o de produto abre a página e devolve os dados. Um produto que aparece em
+vários termos é extraído uma vez só, e o que continuou bloqueado volta para a
+fila (outro worker, de outra máquina, tenta de novo).
+
+    python -m belmicro.coleta --perfil limpeza --coordenar Z:\\filas\\fila_limpeza.sqlite
+    python -m belmicro.coleta --perfil limpeza --trabalhar Z:\\filas\\fila_limpeza.sqlite
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..armazenamento import exportar_xlsx, gravar_parquet
+from ..historico import HistoricoPrecos
+from ..produtos import chave_produto
+from .bloqueio import BLOQUEIOS, PaginaBloqueada, SessaoExpirada
+from .execucao import abrir_navegador, ler_pesquisas, reabrir_navegador
+from .extracao import ESTATISTICAS_SELETORES, criar_motor, normalizar_campos_numericos
+from .fila import CONCLUIDO, DURACAO_ARRENDAMENTO, FALHOU, PRODUTO, TERMO, FilaColeta
+from .metricas import METRICAS
+from .motores import MotorReciclavel
+from .paginacao import coletar_links_termo
+from .relevancia import FiltroRelevancia
+
+# Segundos entre as verificações do coordenador e a espera do worker sem trabalho pendente
+INTERVALO_COORDENADOR = 10
+PAUSA_FILA_VAZIA = 5
+
+
+def nome_worker():
+    """Identificação do worker na fila: máquina e processo."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def enfileirar_termos(fila, perfil, df_pesquisas):
+    """Põe na fila os termos da planilha que ainda não estão nela; devolve quantos entraram."""
+    itens = []
+    for _, linha in df_pesquisas.iterrows():
+        termo = linha[perfil.coluna_pesquisa]
+        if pd.isna(termo): continue
+        referencia = linha[perfil.coluna_referencia] if perfil.coluna_referencia else None
+        itens.append((str(termo), {'termo': str(termo), 'referencia': None if pd.isna(referencia) else str(referencia)}))
+    return fila.adicionar(TERMO, itens)
+
+
+def montar_saida(fila, perfil, historico=None):
+    """(produtos, termos que falharam): os produtos dos termos concluídos, rotulados pelo perfil.
+
+    A ordem é a dos termos na planilha e a dos links de cada busca. Produtos que
+    continuaram bloqueados em todas as tentativas ficam de fora. Com `historico`,
+    cada produto vira uma observação de preço no horário em que a busca do termo
+    terminou (montar de novo não duplica).
+    """
+    extraidos = fila.resultados(PRODUTO)
+    produtos, falharam = [], []
+    for termo, dados_termo, situacao, resultado, concluido_em in fila.trabalhos(TERMO):
+        if situacao != CONCLUIDO:
+            falharam.append(termo)
+            continue
+        do_termo = [perfil.rotular(dict(extraidos[chave_produto(url)], URL=url), termo, dados_termo['referencia'])
+                    for url in resultado['links'] if chave_produto(url) in extraidos]
+        if historico is not None:
+            historico.registrar(termo, do_termo, concluido_em)
+        produtos += do_termo
+    return produtos, falharam
+
+
+def coordenar(perfil, caminho_fila, nova=False, intervalo=INTERVALO_COORDENADOR):
+    """Enfileira os termos do perfil, espera os workers esvaziarem a fila e grava a saída.
+
+    Rodar de novo com uma fila interrompida continua de onde parou (os termos já
+    enfileirados não entram de novo); uma fila já terminada é de uma coleta
+    anterior e é esvaziada, assim como qualquer fila com `nova`.
+    """
+    df_pesquisas = ler_pesquisas(perfil)
+    if df_pesquisas is None:
+        return None
+    fila = FilaColeta(caminho_fila)
+    if nova or fila.terminada():
+        fila.limpar()
+    else:
+        print(f"🔁 Continuando a fila '{caminho_fila}': {fila.resumo()}")
+    novos = enfileirar_termos(fila, perfil, df_pesquisas)
+    print(f"📬 {novos} termos novos na fila '{caminho_fila}'. Nas máquinas dos workers: "
+          f"python -m belmicro.coleta --perfil {perfil.nome} --trabalhar {caminho_fila}")
+    try:
+        while not fila.terminada():
+            liberados = fila.liberar_vencidos()
+            if liberados:
+                print(f"  -> ⏰ {liberados} arrendamentos vencidos (worker parado) voltaram para a fila.")
+            print(f"  {time.strftime('%H:%M:%S')} {fila.resumo()}")
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        print("\n⏸️ Espera interrompida. A fila continua no arquivo: rode o coordenador de novo para "
+              "esperar os workers e montar a saída.")
+        fila.fechar()
+        return None
+
+    print(fila.resumo())
+    historico = HistoricoPrecos(perfil.arquivo_historico)
+    todos_os_dados, falharam = montar_saida(fila, perfil, historico)
+    produtos_falharam = fila.contagem().get((PRODUTO, FALHOU), 0)
+    fila.fechar()
+    print(historico.resumo())
+    historico.fechar()
+    if falharam or produtos_falharam:
+        print(f"  -> 🚫 Ficaram de fora {len(falharam)} termos e {produtos_falharam} produtos que falharam em "
+              f"todas as tentativas" + (f" (termos: {', '.join(falharam[:5])})" if falharam else "") + ".")
+    if not todos_os_dados:
+        print("\nNenhum dado foi coletado. O arquivo de saída não foi gerado.")
+        return None
+    df_resultados = normalizar_campos_numericos(pd.DataFrame(todos_os_dados))
+    gravar_parquet(df_resultados, perfil.arquivo_saida, perfil.esquema)
+    print(f"\nProcesso finalizado! Os dados foram salvos em '{perfil.arquivo_saida}'.")
+    if perfil.arquivo_xlsx:
+        exportar_xlsx(df_resultados, perfil.arquivo_xlsx)
+        print(f"  -> Cópia em XLSX: '{perfil.arquivo_xlsx}'.")
+    return df_resultados
+
+
+class Batimento:
+    """Thread que renova os arrendamentos do worker enquanto ele trabalha."""
+
+    def __init__(self, fila, dono, duracao=DURACAO_ARRENDAMENTO):
+        self.fila = fila
+        self.dono = dono
+        self.duracao = duracao
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._bater, daemon=True)
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def _bater(self):
+        # Três batimentos por arrendamento: um atrasado não deixa o trabalho vencer
+        while not self._parar.wait(self.duracao / 3):
+            try:
+                self.fila.renovar(self.dono, self.duracao)
+            except sqlite3.OperationalError as erro:
+                print(f"    ⚠️ Batimento não gravado na fila: {erro}")
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+
+def trabalhar(fila, dono, buscar, extrair, duracao=DURACAO_ARRENDAMENTO, pausa=PAUSA_FILA_VAZIA):
+    """Arrenda e executa trabalhos da fila até ela terminar; devolve {tipo: concluídos}.
+
+    `buscar(termo, referencia)` devolve os links do termo e `extrair(url)` os
+    dados do produto (None se ele continuou bloqueado). PaginaBloqueada, None ou
+    qualquer erro devolvem o trabalho à fila para outra tentativa.
+    """
+    concluidos = {TERMO: 0, PRODUTO: 0}
+    batimento = Batimento(fila, dono, duracao).iniciar()
+    try:
+        while True:
+            trabalho = fila.arrendar(dono, duracao)
+            if trabalho is None:
+                if fila.terminada():
+                    break
+                # Fila ainda vazia ou só com trabalhos arrendados: outra busca pode descobrir produtos
+                time.sleep(pausa)
+                continue
+            try:
+                if trabalho.tipo == TERMO:
+                    print(f"\n[{dono}] Pesquisando por: '{trabalho.chave}' (tentativa {trabalho.tentativas})")
+                    links = buscar(trabalho.dados['termo'], trabalho.dados['referencia'])
+                    novos = fila.adicionar(PRODUTO, [(chave_produto(url), {'url': url}) for url in links])
+                    print(f"  -> {len(links)} links, {novos} produtos novos na fila.")
+                    resultado = {'links': links}
+                else:
+                    print(f"    - [{dono}] Extraindo dados: {trabalho.dados['url'][:60]}...")
+                    resultado = extrair(trabalho.dados['url'])
+                    if resultado is None:
+                        fila.falhar(trabalho, dono, 'bloqueio')
+                        continue
+            except SessaoExpirada:
+                # Sem sessão o worker não tem mais o que fazer; os outros continuam a fila
+                fila.falhar(trabalho, dono, 'sessão expirada')
+                raise
+            except PaginaBloqueada as bloqueio:
+                print(f"  -> 🚫 {bloqueio.estado.upper()} em '{trabalho.chave}': o trabalho volta para a fila.")
+                fila.falhar(trabalho, dono, bloqueio.estado)
+                continue
+            except Exception as erro:
+                print(f"    ⚠️ [{dono}] Erro no trabalho '{trabalho.chave}': {erro}")
+                fila.falhar(trabalho, dono, erro)
+                continue
+            if fila.concluir(trabalho, resultado):
+                concluidos[trabalho.tipo] += 1
+                METRICAS.contar(f'fila.{trabalho.tipo}')
+    finally:
+        batimento.parar()
+    return concluidos
+
+
+def executar_worker(perfil, caminho_fila, dono=None, duracao=DURACAO_ARRENDAMENTO):
+    """Worker com o Chrome do perfil: busca e extrai como executar_coleta até a fila terminar.
+
+    Um CAPTCHA ou a tela de login recicla o navegador (MotorReciclavel) e o
+    trabalho volta para a fila; a tela de login pede o login de novo (sem
+    `aguardar_login`, o worker para e os outros seguem com a fila). O filtro de relevância do perfil vale; os
+    cartões da busca não (todo produto é aberto).
+    """
+    dono = dono or nome_worker()
+    print(f"👷 Worker '{dono}' na fila '{caminho_fila}' (perfil '{perfil.nome}').")
+    if perfil.cartoes != 'desligado':
+        print("  -> ⚠️ Os cartões da busca não são usados na coleta distribuída: todo produto é aberto.")
+    arquivo_metricas = os.path.join(os.path.dirname(perfil.arquivo_metricas),
+                                    f'metricas_{perfil.nome}_{dono}.jsonl')
+    METRICAS.iniciar(arquivo_metricas)
+    driver = abrir_navegador(perfil)
+    wait = WebDriverWait(driver, 15)
+
+    def reabrir():
+        """Abre outro navegador (a busca passa a usar ele também)."""
+        nonlocal driver, wait
+        driver = reabrir_navegador(perfil, motor.ultimo_bloqueio)
+        wait = WebDriverWait(driver, 15)
+        return criar_motor(driver, perfil.motor)
+
+    motor = MotorReciclavel(reabrir, motor=criar_motor(driver, perfil.motor))
+
+    def buscar(termo, referencia):
+        filtro = None
+        if perfil.relevancia_minima is not None:
+            filtro = FiltroRelevancia(referencia or termo, perfil.relevancia_minima)
+        cartoes = {} if filtro else None
+        try:
+            links = coletar_links_termo(driver, wait, termo, perfil.max_produtos, perfil.limite_paginas,
+                                        cartoes, filtro)
+        except PaginaBloqueada as bloqueio:
+            # O termo volta para a fila; o próximo trabalho já usa o navegador novo
+            motor.reciclar(bloqueio.estado)
+            raise
+        if filtro is not None:
+            links = filtro.escolher(links, cartoes, perfil.max_produtos)
+            print(f"  -> {filtro.resumo()}")
+            METRICAS.contar('relevancia.poupados', filtro.poupados, termo=termo,
+                            paginas=filtro.paginas_lidas, parou_cedo=filtro.parou_cedo)
+        return links[:perfil.max_produtos]
+
+    fila = FilaColeta(caminho_fila)
+    try:
+        concluidos = trabalhar(fila, dono, buscar, motor.extrair, duracao)
+    except SessaoExpirada as erro:
+        print(f"\n🔒 Worker '{dono}' parou: {erro}. Faça o login no perfil e inicie o worker de novo.")
+        return None
+    finally:
+        fila.fechar()
+        motor.encerrar()
+    print(f"\n✅ Worker '{dono}': fila terminada, {concluidos[TERMO]} termos e {concluidos[PRODUTO]} "
+          f"produtos concluídos por ele.")
+    print(BLOQUEIOS.resumo())
+    print(ESTATISTICAS_SELETORES.relatorio())
+    print(METRICAS.resumo())
+    METRICAS.fechar()
+    print(f"  -> Medições gravadas em '{arquivo_metricas}'.")
+    return concluidos
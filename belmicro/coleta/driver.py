@@ -0,0 +1,73 @@
+import json
+
+from .config import MODOS_CARREGAMENTO
+from .metricas import METRICAS
+
+# Tempo até o DOM ficar pronto (Navigation Timing) do documento aberto agora
+SCRIPT_PRONTA = """
+const navegacao = performance.getEntriesByType('navigation')[0];
+return navegacao ? navegacao.domContentLoadedEventEnd : null;
+"""
+
+
+def configurar_driver(caminho_perfil, carregamento='completo'):
+    """Configura o Chrome usando o undetected-chromedriver com versão especificada.
+
+    `carregamento` escolhe um dos MODOS_CARREGAMENTO: no 'leve' a página volta no
+    DOMContentLoaded, sem imagens, numa janela menor, e imagens, fontes, vídeos e
+    rastreadores são bloqueados antes de serem baixados.
+    """
+    # Importado aqui para que o motor HTTP e os testes offline não dependam do Chrome
+    import undetected_chromedriver as uc
+
+    modo = MODOS_CARREGAMENTO[carregamento]
+    options = uc.ChromeOptions()
+    if modo.janela:
+        options.add_argument(f"--window-size={modo.janela[0]},{modo.janela[1]}")
+    else:
+        options.add_argument("--start-maximized")
+    options.page_load_strategy = modo.estrategia
+    if not modo.imagens:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if modo.hosts_permitidos:
+        # Os demais hosts não resolvem: a conexão falha sem ir à rede
+        excecoes = ', '.join(f'EXCLUDE {host}' for host in modo.hosts_permitidos)
+        options.add_argument(f'--host-resolver-rules=MAP * ~NOTFOUND, {excecoes}')
+    # Log de desempenho (só a rede): medir_carga soma os bytes recebidos de cada página
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+    options.add_argument(f'--user-data-dir={caminho_perfil}')
+
+    print(f"Iniciando driver com undetected-chromedriver (carregamento '{carregamento}')...")
+
+    # Verifique sua versão em Ajuda > Sobre o Google Chrome
+    versao_do_chrome = 142
+    driver = uc.Chrome(options=options, use_subprocess=True, version_main=versao_do_chrome)
+    if modo.urls_bloqueadas:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': modo.urls_bloqueadas})
+    driver.log_desempenho = True
+    return driver
+
+
+def medir_carga(driver, pagina):
+    """Grava nas métricas os bytes recebidos e o tempo até o DOM ficar pronto da página aberta.
+
+    Os bytes vêm do log de desempenho do Chrome (Network.loadingFinished) desde a
+    última medição. Drivers que não vieram de configurar_driver são ignorados.
+    """
+    if not getattr(driver, 'log_desempenho', False):
+        return
+    recebidos = 0
+    for evento in driver.get_log('performance'):
+        if '"Network.loadingFinished"' not in evento['message']:
+            continue
+        recebidos += json.loads(evento['message'])['message']['params'].get('encodedDataLength', 0)
+    METRICAS.contar('carga.paginas', pagina=pagina)
+    METRICAS.contar('carga.bytes', int(recebidos), pagina=pagina)
+    pronta_ms = driver.execute_script(SCRIPT_PRONTA)
+    if pronta_ms:
+        METRICAS.registrar('carga.pronta', pronta_ms / 1000, pagina=pagina)
+
@@ -0,0 +1,158 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..numeros import converter_precos
+from ..produtos import chave_produto
+
+# Intervalo entre coletas de um termo: termos com preços estáveis esperam até o
+# máximo; quanto mais os preços mexem, mais perto do mínimo
+INTERVALO_MINIMO_HORAS = 6
+INTERVALO_MAXIMO_HORAS = 72
+# Variação média dos preços (entre duas coletas) que reduz o intervalo à metade
+VOLATILIDADE_REFERENCIA = 0.02
+# Peso da última coleta na média móvel exponencial da volatilidade
+PESO_VOLATILIDADE = 0.5
+
+
+def intervalo_horas(volatilidade, minimo=INTERVALO_MINIMO_HORAS, maximo=INTERVALO_MAXIMO_HORAS):
+    """Horas até um termo precisar ser coletado de novo, pela volatilidade dos preços."""
+    return float(np.clip(maximo / (1 + volatilidade / VOLATILIDADE_REFERENCIA), minimo, maximo))
+
+
+def variacao_precos(anteriores, atuais):
+    """Variação relativa média dos produtos presentes nas duas coletas (None se nenhum)."""
+    comuns = [chave for chave in atuais if chave in anteriores and anteriores[chave] and atuais[chave] is not None]
+    if not comuns:
+        return None
+    antes = np.array([anteriores[chave] for chave in comuns])
+    depois = np.array([atuais[chave] for chave in comuns])
+    return float(np.mean(np.abs(depois - antes) / antes))
+
+
+class EstadoColeta:
+    """Estado entre execuções do robô (SQLite) para o modo incremental.
+
+    Guarda, por termo, o último conjunto de resultados, o preço de cada produto
+    nessa coleta e a volatilidade dos preços. Cada execução incremental só coleta
+    os termos vencidos (os mais voláteis primeiro) e reaproveita os resultados
+    guardados dos demais para montar a saída completa.
+    """
+
+    def __init__(self, caminho, intervalo_minimo=INTERVALO_MINIMO_HORAS, intervalo_maximo=INTERVALO_MAXIMO_HORAS):
+        self.intervalo_minimo = intervalo_minimo
+        self.intervalo_maximo = intervalo_maximo
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS termos (
+                termo TEXT PRIMARY KEY,
+                coletado_em REAL NOT NULL,
+                volatilidade REAL NOT NULL DEFAULT 0,
+                produtos INTEGER NOT NULL DEFAULT 0,
+                coletas INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS resultados (
+                termo TEXT NOT NULL,
+                posicao INTEGER NOT NULL,
+                chave TEXT NOT NULL,
+                preco REAL,
+                dados TEXT NOT NULL,
+                PRIMARY KEY (termo, posicao)
+            );
+        """)
+        self.conexao.commit()
+
+    def situacao(self, termos, agora=None):
+        """Uma linha por termo: última coleta, volatilidade, intervalo e prioridade.
+
+        Prioridade = idade / intervalo; o termo está vencido com prioridade >= 1.
+        Termos nunca coletados têm prioridade infinita.
+        """
+        agora = time.time() if agora is None else agora
+        salvos = pd.read_sql_query('SELECT termo, coletado_em, volatilidade, produtos FROM termos', self.conexao)
+        situacao = pd.DataFrame({'termo': pd.unique(pd.Series(list(termos), dtype=object))})
+        situacao = situacao.merge(salvos, on='termo', how='left')
+        situacao['idade_horas'] = (agora - situacao['coletado_em']) / 3600
+        situacao['intervalo_horas'] = [intervalo_horas(v, self.intervalo_minimo, self.intervalo_maximo)
+                                       for v in situacao['volatilidade'].fillna(0)]
+        situacao['prioridade'] = (situacao['idade_horas'] / situacao['intervalo_horas']).fillna(np.inf)
+        return situacao
+
+    def termos_vencidos(self, termos, max_termos=None, agora=None):
+        """Termos a coletar nesta execução, do mais para o menos prioritário."""
+        situacao = self.situacao(termos, agora)
+        vencidos = situacao[situacao['prioridade'] >= 1].sort_values('prioridade', ascending=False, kind='stable')
+        return list(vencidos['termo'][:max_termos])
+
+    def precos(self, termo):
+        cursor = self.conexao.execute('SELECT chave, preco FROM resultados WHERE termo = ?', (termo,))
+        return dict(cursor.fetchall())
+
+    def registrar_termo(self, termo, produtos, coletado_em=None):
+        """Troca o conjunto de resultados do termo e atualiza a volatilidade.
+
+        Devolve a variação média dos preços em relação à coleta anterior (None se
+        não havia produtos em comum). Registrar a mesma coleta de novo (ex.: ao
+        retomar) não altera nada.
+        """
+        coletado_em = time.time() if coletado_em is None else coletado_em
+        linha = self.conexao.execute(
+            'SELECT coletado_em, volatilidade, coletas FROM termos WHERE termo = ?', (termo,)).fetchone()
+        if linha and linha[0] >= coletado_em:
+            return None
+        precos = converter_precos(pd.Series([dados.get('Preço (R$)') for dados in produtos], dtype=object),
+                                  corrigir_100x=False)
+        chaves = [chave_produto(dados.get('URL', '')) for dados in produtos]
+        atuais = {chave: (None if pd.isna(preco) else float(preco)) for chave, preco in zip(chaves, precos)}
+        variacao = variacao_precos(self.precos(termo), atuais)
+
+        volatilidade = linha[1] if linha else 0.0
+        if variacao is not None:
+            # A primeira variação medida (2ª coleta) substitui o valor inicial
+            volatilidade = variacao if not linha or linha[2] <= 1 else (
+                PESO_VOLATILIDADE * variacao + (1 - PESO_VOLATILIDADE) * volatilidade)
+        with self._trava, self.conexao:
+            self.conexao.execute('DELETE FROM resultados WHERE termo = ?', (termo,))
+            self.conexao.executemany(
+                'INSERT INTO resultados (termo, posicao, chave, preco, dados) VALUES (?, ?, ?, ?, ?)',
+                [(termo, posicao, chave, atuais[chave], json.dumps(dados, ensure_ascii=False))
+                 for posicao, (chave, dados) in enumerate(zip(chaves, produtos))],
+            )
+            self.conexao.execute(
+                'INSERT INTO termos (termo, coletado_em, volatilidade, produtos, coletas) VALUES (?, ?, ?, ?, 1) '
+                'ON CONFLICT(termo) DO UPDATE SET coletado_em = excluded.coletado_em, '
+                'volatilidade = excluded.volatilidade, produtos = excluded.produtos, coletas = coletas + 1',
+                (termo, coletado_em, volatilidade, len(produtos)),
+            )
+        return variacao
+
+    def produtos(self, termos):
+        """Último conjunto de resultados guardado de cada termo, na ordem dos termos."""
+        dados = []
+        for termo in pd.unique(pd.Series(list(termos), dtype=object)):
+            cursor = self.conexao.execute('SELECT dados FROM resultados WHERE termo = ? ORDER BY posicao', (termo,))
+            dados.extend(json.loads(linha[0]) for linha in cursor)
+        return dados
+
+    def resumo(self, termos, agora=None):
+        situacao = self.situacao(termos, agora)
+        coletados = situacao['coletado_em'].notna()
+        vencidos = (situacao['prioridade'] >= 1).sum()
+        volatilidade = situacao.loc[coletados, 'volatilidade'].mean() if coletados.any() else 0.0
+        return (f"🗓️ Estado incremental: {coletados.sum()}/{len(situacao)} termos com coleta guardada, "
+                f"{vencidos} vencidos, volatilidade média {volatilidade:.1%}.")
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def horario_diario(texto):
+    """Converte o 'atualizado_em' do diário (ISO) em timestamp."""
+    return datetime.fromisoformat(texto).timestamp()
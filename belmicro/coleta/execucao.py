@@ -0,0 +1,382 @@
+import itertools
+import random
+
+import pandas as pd
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..armazenamento import exportar_xlsx, gravar_parquet, ler_tabela
+from ..historico import HistoricoPrecos
+from .bloqueio import BLOQUEIOS, LOGIN, PaginaBloqueada, SessaoExpirada
+from .cache import CacheProdutos
+from .config import URL_BASE
+from .diario import DiarioColeta
+from .estado import EstadoColeta, horario_diario
+from .driver import configurar_driver
+from .extracao import (ESTATISTICAS_SELETORES, completar_com_cartao, criar_motor, dados_do_cartao, id_loja,
+                       normalizar_campos_numericos)
+from .limitador import LIMITADOR
+from .metricas import METRICAS
+from .motores import MotorReciclavel
+from .paginacao import coletar_links_termo, link_valido
+from .pool import PoolNavegadores, clonar_perfil, preparar_perfis_workers
+from .relevancia import FiltroRelevancia
+
+
+def ler_pesquisas(perfil):
+    """Lê a planilha de termos do perfil; devolve None (com mensagem) se não der."""
+    try:
+        df_pesquisas = ler_tabela(perfil.arquivo_entrada)
+        print(f"Planilha '{perfil.arquivo_entrada}' lida com sucesso. {len(df_pesquisas)} itens para pesquisar.")
+    except FileNotFoundError:
+        print(f"ERRO: O arquivo '{perfil.arquivo_entrada}' não foi encontrado. Verifique o caminho no código.")
+        return None
+
+    faltando = [coluna for coluna in perfil.colunas_obrigatorias if coluna not in df_pesquisas.columns]
+    if faltando:
+        print(f"ERRO: A planilha de entrada precisa ter as colunas {', '.join(repr(c) for c in perfil.colunas_obrigatorias)}.")
+        return None
+    return df_pesquisas
+
+
+def abrir_navegador(perfil):
+    """Chrome com o perfil logado, já na Shopee (pede o login ao usuário se o perfil mandar)."""
+    driver = configurar_driver(perfil.caminho_perfil_chrome, perfil.carregamento)
+    driver.get(f"{URL_BASE}/")
+    if perfil.aguardar_login:
+        print("\n" + "="*80)
+        input("### AÇÃO NECESSÁRIA: Se for o primeiro uso, faça o login na Shopee. ###\n### Depois, volte aqui e pressione Enter para iniciar a pesquisa. ###")
+        print("="*80 + "\n")
+
+    pausa_inicial = random.uniform(3, 5)
+    print(f"Ok, aguardando {pausa_inicial:.1f} segundos antes de começar...")
+    METRICAS.dormir(pausa_inicial, 'pausa.inicial')
+    return driver
+
+
+def reabrir_navegador(perfil, estado=None):
+    """Chrome novo com o perfil logado depois de um bloqueio do navegador principal.
+
+    O principal usa o próprio perfil logado, não uma cópia, então não há o que
+    recopiar. Depois de um CAPTCHA basta reabrir. Depois da tela de login a
+    sessão caiu, e reabrir com o mesmo perfil cairia de novo: o login é pedido
+    ao usuário, ou, sem `aguardar_login`, levanta SessaoExpirada.
+    """
+    if estado == LOGIN and not perfil.aguardar_login:
+        raise SessaoExpirada(perfil.caminho_perfil_chrome)
+    driver = configurar_driver(perfil.caminho_perfil_chrome, perfil.carregamento)
+    driver.get(f"{URL_BASE}/")
+    if estado == LOGIN:
+        print("\n" + "="*80)
+        input("### AÇÃO NECESSÁRIA: A Shopee pediu o login de novo. Faça o login na janela aberta. ###\n### Depois, volte aqui e pressione Enter para continuar. ###")
+        print("="*80 + "\n")
+    return driver
+
+
+def links_async(links, situacao_busca):
+    """Links da paginação em paralelo até um eventual bloqueio, que fica marcado em `situacao_busca`."""
+    try:
+        yield from links
+    except PaginaBloqueada as bloqueio:
+        print(f"  -> 🚫 Busca bloqueada ({bloqueio.estado}) na paginação em paralelo. "
+              "O termo fica para a próxima execução (--resume).")
+        situacao_busca['bloqueada'] = True
+
+
+def executar_coleta(perfil, retomar=False, driver=None, incremental=False, max_termos=None):
+    """Roda o robô inteiro para um perfil e grava a planilha de saída.
+
+    `driver` permite reaproveitar um navegador já aberto (e logado); sem ele o
+    Chrome é aberto com o perfil configurado e o login é pedido ao usuário.
+    Com `incremental`, só os termos vencidos são coletados (no máximo
+    `max_termos`, os mais voláteis primeiro) e a saída completa reaproveita a
+    última coleta guardada dos demais (ver EstadoColeta).
+
+    Um CAPTCHA ou a tela de login troca o navegador que caiu nele (MotorReciclavel);
+    o termo com produtos que continuaram bloqueados não é marcado como concluído,
+    e o `retomar` tenta só esses produtos de novo. A tela de login no navegador
+    principal pede o login de novo (ou, sem `perfil.aguardar_login`, encerra a
+    coleta com o que já está no diário).
+
+    Com `perfil.cartoes` ligado, os produtos saem dos cartões da página de
+    resultado e a página do produto só é aberta para o que o cartão não mostra.
+    Com `perfil.relevancia_minima`, só os cartões parecidos com o produto de
+    referência são abertos, do mais para o menos relevante.
+    """
+    print(f"Iniciando o processo de scraping da Shopee (perfil '{perfil.nome}')...")
+    METRICAS.iniciar(perfil.arquivo_metricas)
+    if driver is None:
+        driver = abrir_navegador(perfil)
+    wait = WebDriverWait(driver, 15)
+
+    df_pesquisas = ler_pesquisas(perfil)
+    if df_pesquisas is None:
+        driver.quit()
+        return None
+
+    estado = None
+    intervalos = {}
+    todos_os_termos = df_pesquisas[perfil.coluna_pesquisa].dropna()
+    if incremental:
+        estado = EstadoColeta(perfil.arquivo_estado, perfil.intervalo_minimo_horas, perfil.intervalo_maximo_horas)
+        print(estado.resumo(todos_os_termos))
+        a_coletar = estado.termos_vencidos(todos_os_termos, max_termos)
+        intervalos = estado.situacao(a_coletar).set_index('termo')['intervalo_horas'].to_dict()
+        # Os termos vencidos, do mais para o menos prioritário
+        df_pesquisas = df_pesquisas.set_index(perfil.coluna_pesquisa, drop=False).loc[a_coletar].reset_index(drop=True)
+        print(f"🔄 Modo incremental: {len(a_coletar)} de {todos_os_termos.nunique()} termos serão coletados agora.")
+
+    pool = None
+    if perfil.num_navegadores > 1:
+        perfis_chrome = preparar_perfis_workers(perfil.caminho_perfil_chrome, perfil.pasta_perfis_workers, perfil.num_navegadores)
+
+        def motor_worker(id_worker):
+            def reabrir():
+                # Perfil copiado de novo: o do worker pode ter ficado marcado pelo bloqueio
+                clonar_perfil(perfil.caminho_perfil_chrome, perfis_chrome[id_worker])
+                return criar_motor(configurar_driver(perfis_chrome[id_worker], perfil.carregamento), perfil.motor)
+            return MotorReciclavel(reabrir, motor=criar_motor(
+                configurar_driver(perfis_chrome[id_worker], perfil.carregamento), perfil.motor))
+
+        pool = PoolNavegadores(
+            perfil.num_navegadores,
+            motor_worker,
+            lambda motor, url: motor.extrair(url),
+            pausa=None, # o ritmo é dado pelo LIMITADOR compartilhado
+        ).iniciar()
+
+    def reabrir_principal():
+        """Abre outro navegador principal (a busca passa a usar ele também)."""
+        nonlocal driver, wait
+        driver = reabrir_navegador(perfil, motor.ultimo_bloqueio)
+        wait = WebDriverWait(driver, 15)
+        return criar_motor(driver, perfil.motor)
+
+    motor = MotorReciclavel(reabrir_principal, motor=criar_motor(driver, perfil.motor))
+
+    def buscar_links(termo, cartoes, filtro):
+        """Links do termo; se a busca cair num bloqueio, recicla o navegador principal e tenta de novo."""
+        for tentativa in range(motor.max_tentativas + 1):
+            try:
+                return coletar_links_termo(driver, wait, termo, perfil.max_produtos, perfil.limite_paginas,
+                                           cartoes, filtro)
+            except PaginaBloqueada as bloqueio:
+                if tentativa == motor.max_tentativas:
+                    raise
+                print(f"  -> ♻️ Busca bloqueada ({bloqueio.estado}): reciclando o navegador principal...")
+                motor.reciclar(bloqueio.estado)
+
+    # 💾 Cada link descoberto e cada produto extraído vai direto para o diário
+    diario = DiarioColeta(perfil.arquivo_diario, retomar=retomar)
+    if retomar:
+        print(f"🔁 Retomando a partir do diário '{perfil.arquivo_diario}'.")
+    cache = CacheProdutos(perfil.arquivo_cache, ttl_horas=perfil.cache_ttl_horas, max_itens=perfil.cache_max_itens)
+    historico = HistoricoPrecos(perfil.arquivo_historico)
+    # Nome de cada loja já vista (completa o Vendedor dos cartões da busca)
+    vendedores = historico.vendedores() if perfil.cartoes != 'desligado' else {}
+
+    coletor_async = None
+    if perfil.paginas_simultaneas > 1:
+        # Importado só aqui: o Playwright é necessário apenas neste modo
+        from .paginacao_async import ColetorLinksAsync
+        coletor_async = ColetorLinksAsync(
+            URL_BASE, link_valido,
+            paginas_simultaneas=perfil.paginas_simultaneas,
+            limite_paginas=perfil.limite_paginas,
+            max_links=perfil.max_produtos,
+            cookies=driver.get_cookies(),
+            limitador=LIMITADOR,
+        )
+
+    for index, linha in df_pesquisas.iterrows():
+        termo_pesquisa = linha[perfil.coluna_pesquisa]
+        termo_referencia = linha[perfil.coluna_referencia] if perfil.coluna_referencia else None
+        if pd.isna(termo_pesquisa): continue
+
+        if termo_referencia is None:
+            print(f"\n[{index + 1}/{len(df_pesquisas)}] Pesquisando por: '{termo_pesquisa}'")
+        else:
+            print(f"\n[{index + 1}/{len(df_pesquisas)}] Pesquisando por: '{termo_pesquisa}' (Ref: '{termo_referencia}')")
+
+        if diario.termo_concluido(termo_pesquisa):
+            print("  -> Termo já concluído no diário. Pulando.")
+            continue
+
+        inicio_termo = METRICAS.agora()
+        descartadas_antes = len(BLOQUEIOS.descartadas)
+        filtro = None
+        # A paginação em paralelo só descobre um bloqueio depois de entregar links
+        situacao_busca = {'bloqueada': False}
+        if perfil.relevancia_minima is not None:
+            filtro = FiltroRelevancia(termo_referencia or termo_pesquisa, perfil.relevancia_minima)
+        # Campos brutos dos cartões da busca, por URL (com perfil.cartoes ou o filtro de relevância)
+        cartoes = {} if perfil.cartoes != 'desligado' or filtro else None
+        if diario.links_completos(termo_pesquisa):
+            links_salvos = diario.urls_do_termo(termo_pesquisa)
+            print(f"  -> {len(links_salvos)} links recuperados do diário (paginação já feita).")
+            fonte_links = iter(links_salvos)
+            filtro = None  # a escolha dos relevantes já foi feita
+        elif coletor_async:
+            fonte_links = links_async(coletor_async.coletar(termo_pesquisa, cartoes, filtro), situacao_busca)
+            if filtro is not None:
+                # Os links chegam página a página: os relevantes seguem para a extração sem esperar a busca
+                fonte_links = filtro.filtrar(fonte_links, cartoes, perfil.max_produtos)
+        else:
+            try:
+                links_buscados = buscar_links(termo_pesquisa, cartoes, filtro)
+            except SessaoExpirada as erro:
+                print(f"  -> 🔒 {erro}: a coleta para aqui. Faça o login no perfil e rode com --resume.")
+                break
+            except PaginaBloqueada:
+                print("  -> 🚫 A busca continua bloqueada. O termo fica para a próxima execução (--resume).")
+                continue
+            if filtro is not None:
+                # Só os mais relevantes vão para a extração (o resto nem entra no diário)
+                links_buscados = filtro.escolher(links_buscados, cartoes, perfil.max_produtos)
+            fonte_links = iter(links_buscados)
+
+        ja_extraidas = diario.urls_concluidas(termo_pesquisa)
+        contagem = {'links': 0, 'diario': 0, 'cache': 0, 'cartao': 0}
+        # Produtos montados com o cartão que ainda precisam da página (URL -> dados do cartão)
+        pendentes_cartao = {}
+
+        def registrar(dados, termo=termo_pesquisa, referencia=termo_referencia):
+            perfil.rotular(dados, termo, referencia)
+            with METRICAS.fase('gravar.diario'):
+                diario.registrar_produto(termo, dados['URL'], dados)
+            METRICAS.contar('produtos')
+
+        def registrar_extraido(dados, registrar=registrar, termo=termo_pesquisa, pendentes_cartao=pendentes_cartao):
+            dados = completar_com_cartao(dados, pendentes_cartao.pop(dados['URL'], None))
+            if dados.get('Vendedor', 'Não encontrado') != 'Não encontrado' and id_loja(dados['URL']):
+                vendedores[id_loja(dados['URL'])] = dados['Vendedor']
+            # Só guarda no cache (e no histórico) produtos que a página realmente mostrou;
+            # os reaproveitados do cache ou do diário já entraram no histórico quando foram extraídos
+            if dados.get('Nome', 'Não encontrado') != 'Não encontrado':
+                with METRICAS.fase('gravar.cache'):
+                    cache.gravar(dados['URL'], dados)
+                with METRICAS.fase('gravar.historico'):
+                    historico.registrar(termo, [dados])
+            registrar(dados)
+
+        def links_para_extrair(termo=termo_pesquisa, fonte_links=fonte_links, ja_extraidas=ja_extraidas,
+                               contagem=contagem, registrar=registrar, registrar_extraido=registrar_extraido,
+                               cartoes=cartoes, pendentes_cartao=pendentes_cartao, situacao_busca=situacao_busca):
+            """Registra cada link no diário e só repassa os que precisam ser abertos."""
+            # Aplicamos o limite MÁXIMO
+            for posicao, url in enumerate(itertools.islice(fonte_links, perfil.max_produtos)):
+                contagem['links'] += 1
+                diario.registrar_url(termo, posicao, url)
+                if url in ja_extraidas:
+                    contagem['diario'] += 1
+                    METRICAS.contar('produtos.diario')
+                    continue
+                # No modo incremental, produto com registro mais velho que o intervalo do termo é aberto de novo
+                dados_cache = cache.obter(url, ttl_horas=intervalos.get(termo))
+                if dados_cache is not None:
+                    dados_cache['URL'] = url
+                    registrar(dados_cache)
+                    contagem['cache'] += 1
+                    METRICAS.contar('produtos.cache')
+                    continue
+                if cartoes and url in cartoes:
+                    dados_cartao = dados_do_cartao(url, cartoes[url], vendedores)
+                    faltando = [campo for campo in perfil.campos_cartao if dados_cartao[campo] == 'Não encontrado']
+                    if not faltando or perfil.cartoes == 'somente':
+                        registrar_extraido(dados_cartao)
+                        contagem['cartao'] += 1
+                        METRICAS.contar('produtos.cartao')
+                        continue
+                    # A página só completa o que falta no cartão
+                    pendentes_cartao[url] = dados_cartao
+                    METRICAS.contar('cartao.completado', campos=','.join(faltando))
+                yield url
+            if not situacao_busca['bloqueada']:
+                diario.marcar_links_completos(termo)
+
+        if pool:
+            print(f"  -> Extraindo com {perfil.num_navegadores} navegadores em paralelo...")
+            pool.extrair(links_para_extrair(), ao_concluir=lambda indice, dados: registrar_extraido(dados))
+        else:
+            try:
+                for i, url in enumerate(links_para_extrair()):
+                    print(f"    - Extraindo dados [{i+1}]: {url[:60]}...")
+                    try:
+                        dados = motor.extrair(url)
+                    except SessaoExpirada:
+                        raise
+                    except Exception as erro:
+                        # Como no pool: uma página ruim não derruba a coleta
+                        print(f"    ⚠️ Erro ao extrair {url[:60]}: {erro}")
+                        BLOQUEIOS.descartar(url, 'erro')
+                        dados = None
+                    if dados is not None:
+                        registrar_extraido(dados)
+            except SessaoExpirada as erro:
+                # O termo não é marcado como concluído: o --resume continua dele
+                print(f"  -> 🔒 {erro}: a coleta para aqui. Faça o login no perfil e rode com --resume.")
+                break
+
+        print(f"\n  -> Busca por '{termo_pesquisa}' concluída.")
+        print(f"  -> Produtos processados (limite de {perfil.max_produtos}): {contagem['links']}")
+        if contagem['diario'] or contagem['cache']:
+            print(f"  -> {contagem['diario']} já estavam no diário e {contagem['cache']} foram reaproveitados do cache.")
+        if contagem['cartao']:
+            print(f"  -> {contagem['cartao']} montados só com o cartão da busca (sem abrir a página).")
+        if not contagem['links']:
+            print("  -> Nenhum link válido encontrado para este termo.")
+        if filtro is not None:
+            print(f"  -> {filtro.resumo()}")
+            METRICAS.contar('relevancia.poupados', filtro.poupados, termo=termo_pesquisa,
+                            paginas=filtro.paginas_lidas, parou_cedo=filtro.parou_cedo)
+
+        bloqueadas = len(BLOQUEIOS.descartadas) - descartadas_antes
+        if bloqueadas:
+            print(f"  -> 🚫 {bloqueadas} produtos ficaram de fora (bloqueio ou falha); rode com --resume para tentar de novo.")
+        elif not situacao_busca['bloqueada']:
+            diario.marcar_termo_concluido(termo_pesquisa)
+        METRICAS.registrar('termo.total', METRICAS.agora() - inicio_termo, links=contagem['links'])
+
+    # A saída é gerada uma única vez, no fim, a partir do diário
+    if estado:
+        # Os termos coletados nesta execução substituem a coleta guardada; a saída
+        # tem a última coleta de todos os termos da planilha
+        for termo, atualizado_em in diario.termos_concluidos():
+            variacao = estado.registrar_termo(termo, diario.produtos_do_termo(termo), horario_diario(atualizado_em))
+            if variacao is not None:
+                print(f"  -> '{termo}': preços variaram {variacao:.1%} em média desde a última coleta.")
+        todos_os_dados = estado.produtos(todos_os_termos)
+        print(estado.resumo(todos_os_termos))
+        estado.fechar()
+    else:
+        todos_os_dados = diario.produtos()
+    diario.fechar()
+    print(cache.resumo())
+    print(historico.resumo())
+    historico.fechar()
+    print(LIMITADOR.resumo())
+    print(BLOQUEIOS.resumo())
+    if BLOQUEIOS.bloqueios:
+        print(f"  -> Taxa de bloqueio a cada 5 minutos:\n{BLOQUEIOS.serie().to_string()}")
+    print(ESTATISTICAS_SELETORES.relatorio())
+    cache.fechar()
+    df_resultados = None
+    if todos_os_dados:
+        df_resultados = normalizar_campos_numericos(pd.DataFrame(todos_os_dados))
+        with METRICAS.fase('gravar.saida'):
+            gravar_parquet(df_resultados, perfil.arquivo_saida, perfil.esquema)
+        print(f"\nProcesso finalizado! Os dados foram salvos em '{perfil.arquivo_saida}'.")
+        if perfil.arquivo_xlsx:
+            with METRICAS.fase('gravar.xlsx'):
+                exportar_xlsx(df_resultados, perfil.arquivo_xlsx)
+            print(f"  -> Cópia em XLSX: '{perfil.arquivo_xlsx}'.")
+    else:
+        print("\nNenhum dado foi coletado. O arquivo de saída não foi gerado.")
+    if coletor_async:
+        coletor_async.encerrar()
+    if pool:
+        pool.encerrar()
+    motor.encerrar()
+    print(METRICAS.resumo())
+    METRICAS.fechar()
+    print(f"  -> Medições gravadas em '{perfil.arquivo_metricas}'.")
+    return df_resultados
@@ -0,0 +1,211 @@
+import json
+import math
+from urllib.parse import urlsplit
+
+from lxml import html as lxml_html
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..numeros import converter_numeros, converter_precos
+from ..produtos import PADRAO_ID_PRODUTO
+from .bloqueio import BLOQUEIOS, DESCONHECIDA, PRODUTO, PaginaBloqueada, classificar_arvore, esperar_estado
+from .driver import medir_carga
+from .limitador import LIMITADOR
+from .metricas import METRICAS
+from .motores import MotorHttp, MotorSelenium
+from .seletores import SELETORES_PRODUTO, EstatisticasSeletores, avaliar_spec_lxml, compilar_script
+
+
+# Todos os campos e alternativas em um único execute_script (uma ida ao navegador)
+SCRIPT_EXTRACAO = compilar_script(SELETORES_PRODUTO)
+ESTATISTICAS_SELETORES = EstatisticasSeletores(SELETORES_PRODUTO)
+
+
+def dados_vazios(url_produto):
+    """Registro de produto com todos os campos 'Não encontrado'."""
+    dados_produto = {campo: 'Não encontrado' for campo in SELETORES_PRODUTO}
+    dados_produto['URL'] = url_produto
+    return dados_produto
+
+
+def preencher_campos(dados_produto, brutos, apenas_faltando=False):
+    """Converte os valores brutos {campo: [texto, índice]} e grava em dados_produto."""
+    ESTATISTICAS_SELETORES.registrar(brutos)
+    # Campos que só saíram por um XPath alternativo, ou por nenhum
+    alternativos = sum(1 for achado in brutos.values() if achado and achado[1] > 0)
+    ausentes = sum(1 for achado in brutos.values() if achado is None)
+    if alternativos:
+        METRICAS.contar('seletor.alternativo', alternativos)
+    if ausentes:
+        METRICAS.contar('seletor.ausente', ausentes)
+    for campo, achado in brutos.items():
+        if achado is None:
+            continue
+        if apenas_faltando and dados_produto[campo] != 'Não encontrado':
+            continue
+        # Os campos numéricos ficam como texto aqui e são convertidos de uma vez, na coluna
+        # inteira, por normalizar_campos_numericos() na hora de montar a planilha
+        dados_produto[campo] = achado[0].strip()
+
+
+def extrair_dados_produto(driver, url_produto):
+    with METRICAS.fase('produto.total'):
+        return _extrair_dados_produto(driver, url_produto)
+
+
+def _extrair_dados_produto(driver, url_produto):
+    LIMITADOR.aguardar()
+    with METRICAS.fase('produto.carregar'):
+        driver.get(url_produto)
+    dados_produto = dados_vazios(url_produto)
+
+    # Primeiro o estado da página: CAPTCHA e login param aqui, sem esperar o timeout
+    with METRICAS.fase('produto.esperar_pagina'):
+        estado = esperar_estado(driver, 15)
+    medir_carga(driver, 'produto')
+    if BLOQUEIOS.registrar(estado, url_produto, 'produto'):
+        print(f"🛑 {estado.upper()} ao abrir: {url_produto}")
+        LIMITADOR.falha(estado)
+        raise PaginaBloqueada(estado, url_produto)
+    if estado != PRODUTO:
+        print(f"⏳ Timeout ao carregar: {url_produto}" if estado == DESCONHECIDA
+              else f"⚠️ Página sem produto ({estado}): {url_produto}")
+        METRICAS.contar('timeout', espera='pagina')
+        LIMITADOR.falha('timeout')
+        # Sem linha vazia: o produto fica de fora e o --resume tenta de novo
+        BLOQUEIOS.descartar(url_produto, 'timeout')
+        return None
+
+    # Em vez de uma pausa fixa, espera o título (renderizado pelo JS) aparecer
+    try:
+        with METRICAS.fase('produto.esperar_titulo'):
+            WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.XPATH, '//h1')))
+    except TimeoutException:
+        METRICAS.contar('timeout', espera='titulo')
+
+    with METRICAS.fase('produto.seletores'):
+        brutos = driver.execute_script(SCRIPT_EXTRACAO)
+    preencher_campos(dados_produto, brutos)
+    LIMITADOR.sucesso()
+
+    return dados_produto
+
+
+def _produto_json_embutido(arvore):
+    """Procura o bloco JSON-LD do tipo Product que a página traz no HTML."""
+    for script in arvore.xpath('//script[@type="application/ld+json"]'):
+        try:
+            conteudo = json.loads(script.text_content())
+        except ValueError:
+            continue
+        for item in conteudo if isinstance(conteudo, list) else [conteudo]:
+            if isinstance(item, dict) and item.get('@type') == 'Product':
+                return item
+    return None
+
+
+def _numero_json(valor):
+    """Número de um campo do JSON-LD (número, '1234.56' ou texto como '1,2mil'); None se não houver."""
+    if valor in (None, ''):
+        return None
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        numero = converter_numeros([valor]).iloc[0]
+        return None if math.isnan(numero) else float(numero)
+
+
+def extrair_dados_html(html, url_produto):
+    """Mesmos campos de extrair_dados_produto, mas a partir do HTML já baixado.
+
+    Levanta PaginaBloqueada se o HTML for o de um CAPTCHA ou da tela de login.
+    """
+    dados_produto = dados_vazios(url_produto)
+    arvore = lxml_html.fromstring(html)
+    estado = classificar_arvore(arvore, url_produto)
+    if BLOQUEIOS.registrar(estado, url_produto, 'produto'):
+        raise PaginaBloqueada(estado, url_produto)
+
+    # 1º: estado JSON embutido (mais estável que as classes do CSS)
+    produto_json = _produto_json_embutido(arvore)
+    if produto_json:
+        if produto_json.get('name'):
+            dados_produto['Nome'] = produto_json['name'].strip()
+        ofertas = produto_json.get('offers') or {}
+        preco = _numero_json(ofertas.get('lowPrice') or ofertas.get('price'))
+        if preco is not None:
+            dados_produto['Preço (R$)'] = preco
+        nota = produto_json.get('aggregateRating') or {}
+        avaliacao = _numero_json(nota.get('ratingValue'))
+        if avaliacao is not None:
+            dados_produto['Avaliação Média'] = avaliacao
+        total_avaliacoes = _numero_json(nota.get('ratingCount'))
+        if total_avaliacoes is not None:
+            dados_produto['Total de Avaliações'] = int(total_avaliacoes)
+
+    # 2º: os mesmos seletores do caminho Selenium para o que faltou
+    brutos = avaliar_spec_lxml(arvore, url_produto, SELETORES_PRODUTO)
+    preencher_campos(dados_produto, brutos, apenas_faltando=True)
+
+    return dados_produto
+
+
+def id_loja(url_produto):
+    """Id da loja no link do produto (.../Nome-i.<loja>.<item>), ou None."""
+    encontrado = PADRAO_ID_PRODUTO.search(urlsplit(url_produto).path)
+    return encontrado.group(1) if encontrado else None
+
+
+def dados_do_cartao(url_produto, brutos, vendedores=None):
+    """Registro de produto montado só com o cartão da busca, sem abrir a página.
+
+    O Link Loja sai do id da loja no link e o Vendedor, do nome já visto para a
+    mesma loja em `vendedores` ({id da loja: nome}); o resto fica 'Não encontrado'.
+    """
+    dados_produto = dados_vazios(url_produto)
+    for campo, achado in brutos.items():
+        if achado is not None:
+            dados_produto[campo] = achado[0].strip()
+    loja = id_loja(url_produto)
+    if loja:
+        partes = urlsplit(url_produto)
+        dados_produto['Link Loja'] = f"{partes.scheme}://{partes.netloc}/shop/{loja}"
+        dados_produto['Vendedor'] = (vendedores or {}).get(loja, 'Não encontrado')
+    return dados_produto
+
+
+def completar_com_cartao(dados_pagina, dados_cartao):
+    """Produto da página com os campos que ela não mostrou tirados do cartão da busca."""
+    if dados_cartao is None:
+        return dados_pagina
+    for campo, valor in dados_cartao.items():
+        if dados_pagina.get(campo, 'Não encontrado') == 'Não encontrado':
+            dados_pagina[campo] = valor
+    return dados_pagina
+
+
+def normalizar_campos_numericos(df):
+    """Converte as colunas numéricas do spec (preço, avaliação, vendidos...) de uma vez.
+
+    Textos que não são número (ex.: 'Não encontrado') continuam como estão, como
+    fazia o antigo limpar_numero.
+    """
+    for campo, spec in SELETORES_PRODUTO.items():
+        if spec['tipo'] == 'texto' or campo not in df.columns:
+            continue
+        if spec['tipo'] == 'preco':
+            valores = converter_precos(df[campo], corrigir_100x=False)
+        else:
+            valores = converter_numeros(df[campo])
+        df[campo] = valores.where(valores.notna(), df[campo])
+    return df
+
+
+def criar_motor(driver, motor='selenium'):
+    """Monta o motor de extração ('selenium' ou 'http') para um driver."""
+    motor_selenium = MotorSelenium(driver, extrair_dados_produto)
+    if motor == 'http':
+        return MotorHttp(extrair_dados_html, fallback=motor_selenium, cookies=driver.get_cookies(), limitador=LIMITADOR)
+    return motor_selenium
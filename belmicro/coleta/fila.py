@@ -0,0 +1,188 @@
+"""Fila de trabalhos da coleta distribuída (SQLite), com arrendamento e batimentos.
+
+Cada trabalho é um termo da planilha (a busca) ou um produto descoberto por uma
+busca. Um worker arrenda o próximo trabalho pendente por alguns segundos e
+renova o arrendamento com batimentos enquanto trabalha; o arrendamento vencido
+(worker travado, máquina desligada) volta para a fila e outro worker o pega.
+Cada arrendamento conta como uma tentativa: depois de `max_tentativas` o
+trabalho fica como falhou, em vez de derrubar os workers para sempre.
+
+Arrendar é uma transação IMMEDIATE (trava de escrita antes de ler), então dois
+processos nunca pegam o mesmo trabalho. Em várias máquinas, o arquivo fica numa
+pasta compartilhada; por isso a fila usa o diário de rollback em vez do WAL dos
+outros arquivos SQLite do robô (o WAL depende de memória compartilhada entre
+os processos e não funciona em pasta de rede). A fila grava pouco (um registro
+por busca ou produto), então isso não pesa.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+TERMO = 'termo'
+PRODUTO = 'produto'
+
+PENDENTE = 'pendente'
+ARRENDADO = 'arrendado'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+
+DURACAO_ARRENDAMENTO = 120
+MAX_TENTATIVAS = 3
+
+
+@dataclass
+class Trabalho:
+    id: int
+    tipo: str
+    chave: str
+    dados: dict
+    tentativas: int
+
+
+class FilaColeta:
+    """Fila durável de termos e produtos, compartilhada por coordenador e workers."""
+
+    def __init__(self, caminho, max_tentativas=MAX_TENTATIVAS):
+        self.caminho = caminho
+        self.max_tentativas = max_tentativas
+        self._trava = threading.Lock()
+        # O batimento renova os arrendamentos de outra thread; outros processos
+        # esperam até 30 s pela trava do arquivo
+        self.conexao = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self.conexao.execute('PRAGMA journal_mode=DELETE')
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS trabalhos (
+                id INTEGER PRIMARY KEY,
+                tipo TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                dados TEXT NOT NULL,
+                situacao TEXT NOT NULL DEFAULT 'pendente',
+                dono TEXT,
+                expira_em REAL,
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                resultado TEXT,
+                erro TEXT,
+                atualizado_em REAL NOT NULL,
+                UNIQUE (tipo, chave)
+            );
+            CREATE INDEX IF NOT EXISTS idx_trabalhos_situacao ON trabalhos (situacao, tipo, id);
+        """)
+        self.conexao.commit()
+
+    def adicionar(self, tipo, itens):
+        """Enfileira os (chave, dados) que ainda não estão na fila; devolve quantos entraram."""
+        with self._trava, self.conexao:
+            antes = self.conexao.total_changes
+            self.conexao.executemany(
+                'INSERT OR IGNORE INTO trabalhos (tipo, chave, dados, atualizado_em) VALUES (?, ?, ?, ?)',
+                [(tipo, chave, json.dumps(dados, ensure_ascii=False), time.time()) for chave, dados in itens],
+            )
+            return self.conexao.total_changes - antes
+
+    def _liberar_vencidos(self, agora):
+        return self.conexao.execute(
+            'UPDATE trabalhos SET situacao = CASE WHEN tentativas >= ? THEN ? ELSE ? END, dono = NULL, '
+            "erro = 'arrendamento vencido', atualizado_em = ? WHERE situacao = ? AND expira_em < ?",
+            (self.max_tentativas, FALHOU, PENDENTE, agora, ARRENDADO, agora),
+        ).rowcount
+
+    def liberar_vencidos(self):
+        """Devolve à fila os trabalhos cujo arrendamento venceu sem batimento; devolve quantos."""
+        with self._trava, self.conexao:
+            self.conexao.execute('BEGIN IMMEDIATE')
+            return self._liberar_vencidos(time.time())
+
+    def arrendar(self, dono, duracao=DURACAO_ARRENDAMENTO, tipos=(PRODUTO, TERMO)):
+        """Próximo trabalho pendente, arrendado a `dono` por `duracao` segundos (None se não houver).
+
+        Os tipos são tentados na ordem dada: por padrão os produtos já
+        descobertos saem antes das buscas de termos novos.
+        """
+        agora = time.time()
+        with self._trava, self.conexao:
+            self.conexao.execute('BEGIN IMMEDIATE')
+            self._liberar_vencidos(agora)
+            for tipo in tipos:
+                linha = self.conexao.execute(
+                    'UPDATE trabalhos SET situacao = ?, dono = ?, expira_em = ?, tentativas = tentativas + 1, '
+                    'atualizado_em = ? WHERE id = (SELECT id FROM trabalhos WHERE situacao = ? AND tipo = ? '
+                    'ORDER BY id LIMIT 1) RETURNING id, tipo, chave, dados, tentativas',
+                    (ARRENDADO, dono, agora + duracao, agora, PENDENTE, tipo),
+                ).fetchall()
+                if linha:
+                    id_trabalho, tipo, chave, dados, tentativas = linha[0]
+                    return Trabalho(id_trabalho, tipo, chave, json.loads(dados), tentativas)
+        return None
+
+    def renovar(self, dono, duracao=DURACAO_ARRENDAMENTO):
+        """Batimento: estende os arrendamentos de `dono`; devolve quantos continuam com ele."""
+        agora = time.time()
+        with self._trava, self.conexao:
+            return self.conexao.execute(
+                'UPDATE trabalhos SET expira_em = ?, atualizado_em = ? WHERE dono = ? AND situacao = ?',
+                (agora + duracao, agora, dono, ARRENDADO),
+            ).rowcount
+
+    def concluir(self, trabalho, resultado):
+        """Grava o resultado; False se outro worker já tinha concluído (arrendamento vencido)."""
+        with self._trava, self.conexao:
+            return bool(self.conexao.execute(
+                'UPDATE trabalhos SET situacao = ?, resultado = ?, dono = NULL, expira_em = NULL, erro = NULL, '
+                'atualizado_em = ? WHERE id = ? AND situacao != ?',
+                (CONCLUIDO, json.dumps(resultado, ensure_ascii=False), time.time(), trabalho.id, CONCLUIDO),
+            ).rowcount)
+
+    def falhar(self, trabalho, dono, erro):
+        """Devolve o trabalho à fila (ou marca como falhou, esgotadas as tentativas)."""
+        with self._trava, self.conexao:
+            self.conexao.execute(
+                'UPDATE trabalhos SET situacao = CASE WHEN tentativas >= ? THEN ? ELSE ? END, dono = NULL, '
+                'expira_em = NULL, erro = ?, atualizado_em = ? WHERE id = ? AND dono = ? AND situacao = ?',
+                (self.max_tentativas, FALHOU, PENDENTE, str(erro), time.time(), trabalho.id, dono, ARRENDADO),
+            )
+
+    def contagem(self):
+        """{(tipo, situacao): quantidade} dos trabalhos da fila."""
+        cursor = self.conexao.execute('SELECT tipo, situacao, COUNT(*) FROM trabalhos GROUP BY tipo, situacao')
+        return {(tipo, situacao): quantidade for tipo, situacao, quantidade in cursor}
+
+    def terminada(self):
+        """True se a fila tem trabalhos e nenhum está pendente ou arrendado."""
+        contagem = self.contagem()
+        return bool(contagem) and not any(situacao in (PENDENTE, ARRENDADO) for _, situacao in contagem)
+
+    def trabalhos(self, tipo):
+        """(chave, dados, situacao, resultado, atualizado_em) dos trabalhos do tipo, na ordem em que entraram."""
+        cursor = self.conexao.execute(
+            'SELECT chave, dados, situacao, resultado, atualizado_em FROM trabalhos WHERE tipo = ? ORDER BY id',
+            (tipo,))
+        return [(chave, json.loads(dados), situacao, json.loads(resultado) if resultado else None, atualizado_em)
+                for chave, dados, situacao, resultado, atualizado_em in cursor]
+
+    def resultados(self, tipo):
+        """{chave: resultado} dos trabalhos concluídos do tipo."""
+        cursor = self.conexao.execute(
+            'SELECT chave, resultado FROM trabalhos WHERE tipo = ? AND situacao = ?', (tipo, CONCLUIDO))
+        return {chave: json.loads(resultado) for chave, resultado in cursor}
+
+    def limpar(self):
+        """Esvazia a fila (coleta nova com o mesmo arquivo)."""
+        with self._trava, self.conexao:
+            self.conexao.execute('DELETE FROM trabalhos')
+
+    def resumo(self):
+        contagem = self.contagem()
+        partes = []
+        for tipo in (TERMO, PRODUTO):
+            situacoes = ', '.join(f"{quantidade} {situacao}" for (tipo_trabalho, situacao), quantidade
+                                  in sorted(contagem.items()) if tipo_trabalho == tipo)
+            partes.append(f"{tipo}s: {situacoes or 'nenhum'}")
+        donos = self.conexao.execute(
+            'SELECT COUNT(DISTINCT dono) FROM trabalhos WHERE situacao = ?', (ARRENDADO,)).fetchone()[0]
+        return f"📬 Fila '{self.caminho}': {'; '.join(partes)}; {donos} workers trabalhando."
+
+    def fechar(self):
+        self.conexao.close()
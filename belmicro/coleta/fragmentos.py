@@ -0,0 +1,112 @@
+"""Coleta com a lista de termos dividida entre vários processos (fragmentos).
+
+Cada fragmento é uma execução completa do robô (`executar_coleta`) em outro
+processo, com a sua parte dos termos, o seu diário e a sua cópia do perfil
+logado do Chrome; cache, estado incremental e histórico de preços são os mesmos
+arquivos SQLite para todos. No fim as saídas são juntadas na ordem dos termos na
+planilha de entrada, então o resultado não depende de qual processo terminou
+primeiro nem do número de fragmentos.
+"""
+
+import dataclasses
+import math
+import multiprocessing
+import os
+
+import pandas as pd
+
+from ..armazenamento import exportar_xlsx, gravar_parquet, ler_tabela
+from .metricas import resumir_arquivos
+from .pool import clonar_perfil
+
+
+def dividir_termos(df_pesquisas, coluna_pesquisa, fragmentos):
+    """Lista de DataFrames: os termos distintos distribuídos em rodízio pela ordem da planilha."""
+    termos = pd.unique(df_pesquisas[coluna_pesquisa].dropna())
+    fragmento = pd.Series(range(len(termos)), index=termos) % fragmentos
+    destino = df_pesquisas[coluna_pesquisa].map(fragmento)
+    return [df_pesquisas[destino == numero].reset_index(drop=True) for numero in range(fragmentos)]
+
+
+def perfil_fragmento(perfil, numero):
+    """Perfil de um fragmento: entrada, saída, diário e Chrome próprios; caches compartilhados."""
+    pasta = os.path.join(os.path.dirname(perfil.arquivo_saida), 'fragmentos')
+    pasta_chrome = os.path.join(perfil.pasta_perfis_workers, f'fragmento_{numero}')
+    return dataclasses.replace(
+        perfil,
+        nome=f'{perfil.nome}_{numero}',
+        arquivo_entrada=os.path.join(pasta, f'{perfil.nome}_{numero}_termos.parquet'),
+        arquivo_saida=os.path.join(pasta, f'{perfil.nome}_{numero}.parquet'),
+        arquivo_xlsx=None,
+        arquivo_diario=os.path.join(pasta, f'diario_{perfil.nome}_{numero}.sqlite'),
+        arquivo_metricas=os.path.join(pasta, f'metricas_{perfil.nome}_{numero}.jsonl'),
+        caminho_perfil_chrome=os.path.join(pasta_chrome, 'perfil'),
+        pasta_perfis_workers=os.path.join(pasta_chrome, 'workers'),
+        aguardar_login=False,
+    )
+
+
+def _coletar_fragmento(argumentos):
+    # Importado no processo filho (spawn): cada fragmento carrega o robô sozinho
+    from .execucao import executar_coleta
+
+    perfil, retomar, incremental, max_termos = argumentos
+    df = executar_coleta(perfil, retomar=retomar, incremental=incremental, max_termos=max_termos)
+    return None if df is None else perfil.arquivo_saida
+
+
+def juntar_saidas(perfil, saidas, df_pesquisas):
+    """Junta as saídas dos fragmentos na ordem dos termos da planilha de entrada."""
+    partes = [ler_tabela(saida) for saida in saidas if saida]
+    if not partes:
+        return None
+    df = pd.concat(partes, ignore_index=True)
+    coluna_termo = next(coluna for coluna, origem in perfil.colunas_termo.items() if origem == 'pesquisa')
+    termos = pd.unique(df_pesquisas[perfil.coluna_pesquisa].dropna())
+    ordem = df[coluna_termo].map(pd.Series(range(len(termos)), index=termos))
+    # Estável: dentro de cada termo vale a ordem em que o robô gravou os produtos
+    return df.iloc[ordem.argsort(kind='stable')].reset_index(drop=True)
+
+
+def coletar_em_fragmentos(perfil, fragmentos, retomar=False, incremental=False, max_termos=None):
+    """Roda o robô em `fragmentos` processos e grava a saída juntada do perfil."""
+    from .execucao import ler_pesquisas
+
+    df_pesquisas = ler_pesquisas(perfil)
+    if df_pesquisas is None:
+        return None
+    partes = dividir_termos(df_pesquisas, perfil.coluna_pesquisa, fragmentos)
+    perfis = []
+    for numero, parte in enumerate(partes):
+        perfil_parte = perfil_fragmento(perfil, numero)
+        os.makedirs(os.path.dirname(perfil_parte.arquivo_saida), exist_ok=True)
+        parte.astype('string').to_parquet(perfil_parte.arquivo_entrada, index=False)
+        clonar_perfil(perfil.caminho_perfil_chrome, perfil_parte.caminho_perfil_chrome)
+        perfis.append(perfil_parte)
+    print(f"🧩 {len(df_pesquisas)} termos divididos em {fragmentos} processos.")
+
+    max_por_fragmento = math.ceil(max_termos / fragmentos) if max_termos else None
+    argumentos = [(perfil_parte, retomar, incremental, max_por_fragmento) for perfil_parte in perfis]
+    with multiprocessing.get_context('spawn').Pool(fragmentos) as processos:
+        saidas = processos.map(_coletar_fragmento, argumentos)
+
+    # Métricas somadas dos fragmentos (os percentis valem para o conjunto)
+    arquivos_metricas = [perfil_parte.arquivo_metricas for perfil_parte in perfis
+                         if os.path.exists(perfil_parte.arquivo_metricas)]
+    if arquivos_metricas:
+        tabela, contadores, produtos_por_minuto = resumir_arquivos(arquivos_metricas)
+        print(f"\n⏱️ Métricas dos {len(arquivos_metricas)} fragmentos: {produtos_por_minuto:.1f} produtos/min")
+        print(tabela.to_string())
+        print(f"  contadores: {contadores}")
+
+    df = juntar_saidas(perfil, saidas, df_pesquisas)
+    if df is None:
+        print("\nNenhum dado foi coletado. O arquivo de saída não foi gerado.")
+        return None
+    gravar_parquet(df, perfil.arquivo_saida, perfil.esquema)
+    print(f"\n🧩 {sum(1 for saida in saidas if saida)} fragmentos juntados: {len(df)} produtos em "
+          f"'{perfil.arquivo_saida}'.")
+    if perfil.arquivo_xlsx:
+        exportar_xlsx(df, perfil.arquivo_xlsx)
+        print(f"  -> Cópia em XLSX: '{perfil.arquivo_xlsx}'.")
+    return df
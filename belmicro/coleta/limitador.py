@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+
+from .metricas import METRICAS
+
+
+class LimitadorAdaptativo:
+    """Balde de fichas com controle AIMD, compartilhado por todos os acessos ao site.
+
+    Cada acesso chama `aguardar()` antes do `get`. Acessos limpos chamam `sucesso()`
+    e a taxa sobe aos poucos (aumento aditivo); CAPTCHA, timeout ou resultado vazio
+    chamam `falha(motivo)`, que corta a taxa pela metade (redução multiplicativa) e
+    impõe uma pausa que dobra a cada falha seguida.
+    """
+
+    def __init__(self, taxa_inicial=0.4, taxa_min=0.05, taxa_max=2.0, incremento=0.02,
+                 fator_reducao=0.5, capacidade=2, pausa_base=10.0, pausa_max=300.0, variacao=0.2):
+        self.taxa = taxa_inicial          # acessos por segundo
+        self.taxa_min = taxa_min
+        self.taxa_max = taxa_max
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.capacidade = capacidade
+        self.pausa_base = pausa_base
+        self.pausa_max = pausa_max
+        self.variacao = variacao          # aleatoriedade para não ficar com ritmo de robô
+        self.fichas = float(capacidade)
+        self.ultima_recarga = time.monotonic()
+        self.bloqueado_ate = 0.0
+        self.falhas_seguidas = 0
+        self.total_acessos = 0
+        self.total_sucessos = 0
+        self.falhas_por_motivo = {}
+        self.eventos_backoff = []
+        self._trava = threading.Lock()
+
+    def _recarregar(self, agora):
+        decorrido = agora - self.ultima_recarga
+        self.fichas = min(self.capacidade, self.fichas + decorrido * self.taxa)
+        self.ultima_recarga = agora
+
+    def aguardar(self):
+        """Reserva uma ficha e dorme o tempo necessário até poder acessar."""
+        with self._trava:
+            agora = time.monotonic()
+            self._recarregar(agora)
+            self.fichas -= 1
+            espera = max(0.0, -self.fichas / self.taxa, self.bloqueado_ate - agora)
+            self.total_acessos += 1
+        if espera > 0:
+            METRICAS.dormir(espera * random.uniform(1 - self.variacao, 1 + self.variacao), 'espera.limitador')
+
+    def sucesso(self):
+        with self._trava:
+            self.total_sucessos += 1
+            self.falhas_seguidas = 0
+            self.taxa = min(self.taxa_max, self.taxa + self.incremento)
+
+    def falha(self, motivo):
+        with self._trava:
+            agora = time.monotonic()
+            self.falhas_seguidas += 1
+            self.falhas_por_motivo[motivo] = self.falhas_por_motivo.get(motivo, 0) + 1
+            taxa_anterior = self.taxa
+            self.taxa = max(self.taxa_min, self.taxa * self.fator_reducao)
+            pausa = min(self.pausa_max, self.pausa_base * 2 ** (self.falhas_seguidas - 1))
+            self.bloqueado_ate = max(self.bloqueado_ate, agora + pausa)
+            self.fichas = min(self.fichas, 0.0)
+            self.eventos_backoff.append({
+                'horario': time.strftime('%H:%M:%S'),
+                'motivo': motivo,
+                'taxa_anterior': round(taxa_anterior, 3),
+                'taxa_nova': round(self.taxa, 3),
+                'pausa_s': round(pausa, 1),
+            })
+        print(f"🐢 Recuo por {motivo}: taxa {taxa_anterior:.2f} -> {self.taxa:.2f} acessos/s, pausa de {pausa:.0f}s.")
+
+    def metricas(self):
+        with self._trava:
+            return {
+                'taxa_atual': round(self.taxa, 3),
+                'acessos': self.total_acessos,
+                'sucessos': self.total_sucessos,
+                'falhas_por_motivo': dict(self.falhas_por_motivo),
+                'eventos_backoff': list(self.eventos_backoff),
+            }
+
+    def resumo(self):
+        m = self.metricas()
+        falhas = ', '.join(f"{motivo}: {qtd}" for motivo, qtd in m['falhas_por_motivo'].items()) or 'nenhuma'
+        return (f"🚦 Limitador: taxa final {m['taxa_atual']:.2f} acessos/s, {m['acessos']} acessos, "
+                f"{len(m['eventos_backoff'])} recuos (falhas: {falhas}).")
+
+
+# Instância única usada por todos os acessos ao site (busca, produtos, todos os workers)
+LIMITADOR = LimitadorAdaptativo(taxa_inicial=0.4, taxa_min=0.05, taxa_max=2.0)
@@ -0,0 +1,143 @@
+"""Cronômetros e contadores do robô, exportados em JSON lines.
+
+Cada fase medida (carregar a página, esperar um seletor, ler os campos, pausas,
+gravações...) vira uma linha no arquivo de métricas da execução:
+
+    {"ts": 1700000000.123, "tipo": "fase", "fase": "produto.carregar", "ms": 1834.2}
+    {"ts": 1700000000.456, "tipo": "contador", "contador": "captcha", "quantidade": 1}
+
+No fim da execução `resumo()` mostra, por fase, quantas medições, o tempo total e
+os percentis 50/95/99, mais os contadores e a vazão em produtos por minuto; a
+mesma tabela vai para o arquivo como uma linha "resumo". `resumir_arquivos` refaz
+a tabela a partir de um ou mais arquivos (ex.: um por fragmento).
+"""
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+PERCENTIS = (50, 95, 99)
+COLUNAS_RESUMO = ['medicoes', 'total_s'] + [f'p{percentil}_ms' for percentil in PERCENTIS]
+
+
+def tabela_percentis(duracoes_ms):
+    """DataFrame por fase (medições, total em s e percentis em ms) de {fase: [ms, ...]}."""
+    linhas = {
+        fase: [len(valores), sum(valores) / 1000] + list(np.percentile(valores, PERCENTIS))
+        for fase, valores in duracoes_ms.items() if valores
+    }
+    tabela = pd.DataFrame.from_dict(linhas, orient='index', columns=COLUNAS_RESUMO).rename_axis('fase')
+    tabela['medicoes'] = tabela['medicoes'].astype(int)
+    return tabela.sort_values('total_s', ascending=False).round(1)
+
+
+class Metricas:
+    """Medições de uma execução (seguro entre threads: os workers do pool usam a mesma instância)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._arquivo = None
+        self.iniciar()
+
+    def iniciar(self, caminho_jsonl=None):
+        """Zera as medições; com `caminho_jsonl`, cada medição também é gravada no arquivo (um por execução)."""
+        with self._trava:
+            if self._arquivo:
+                self._arquivo.close()
+            self._relogio = time.perf_counter()
+            self.duracoes_ms = defaultdict(list)
+            self.contadores = Counter()
+            self._arquivo = open(caminho_jsonl, 'w', encoding='utf-8') if caminho_jsonl else None
+
+    def _gravar(self, registro):
+        if self._arquivo:
+            self._arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+    @staticmethod
+    def agora():
+        """Relógio das medições (para fases que não cabem num bloco `with`)."""
+        return time.perf_counter()
+
+    def registrar(self, fase, segundos, **rotulos):
+        """Guarda uma duração já medida."""
+        ms = segundos * 1000
+        with self._trava:
+            self.duracoes_ms[fase].append(ms)
+            self._gravar({'ts': round(time.time(), 3), 'tipo': 'fase', 'fase': fase, 'ms': round(ms, 2), **rotulos})
+
+    @contextmanager
+    def fase(self, nome, **rotulos):
+        """Mede o bloco `with` como a fase `nome` (a exceção, se houver, vai nos rótulos)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        except BaseException as erro:
+            rotulos['erro'] = type(erro).__name__
+            raise
+        finally:
+            self.registrar(nome, time.perf_counter() - inicio, **rotulos)
+
+    def dormir(self, segundos, fase='pausa'):
+        """time.sleep medido: as pausas fixas/aleatórias aparecem no resumo."""
+        with self.fase(fase):
+            time.sleep(segundos)
+
+    def contar(self, nome, quantidade=1, **rotulos):
+        with self._trava:
+            self.contadores[nome] += quantidade
+            self._gravar({'ts': round(time.time(), 3), 'tipo': 'contador', 'contador': nome,
+                          'quantidade': quantidade, **rotulos})
+
+    def percentis(self):
+        with self._trava:
+            return tabela_percentis({fase: list(valores) for fase, valores in self.duracoes_ms.items()})
+
+    def produtos_por_minuto(self):
+        minutos = (time.perf_counter() - self._relogio) / 60
+        return self.contadores['produtos'] / minutos if minutos > 0 else 0.0
+
+    def resumo(self):
+        tabela = self.percentis()
+        contadores = ', '.join(f"{nome}: {quantidade}" for nome, quantidade in sorted(self.contadores.items()))
+        carga = ''
+        if self.contadores['carga.paginas']:
+            # Bytes recebidos por página carregada no Chrome (ver driver.medir_carga)
+            por_pagina = self.contadores['carga.bytes'] / self.contadores['carga.paginas']
+            carga = f"\n  carga: {por_pagina / 1024:.0f} KB por página em {self.contadores['carga.paginas']} páginas"
+        return (f"⏱️ Métricas: {self.contadores['produtos']} produtos, {self.produtos_por_minuto():.1f} produtos/min\n"
+                + (tabela.to_string() if len(tabela) else "  (nenhuma fase medida)")
+                + f"\n  contadores: {contadores or 'nenhum'}" + carga)
+
+    def fechar(self):
+        """Acrescenta a linha de resumo ao arquivo e o fecha."""
+        tabela = self.percentis()
+        with self._trava:
+            self._gravar({'ts': round(time.time(), 3), 'tipo': 'resumo',
+                          'produtos_por_minuto': round(self.produtos_por_minuto(), 2),
+                          'contadores': dict(self.contadores),
+                          'fases': tabela.reset_index().to_dict('records')})
+            if self._arquivo:
+                self._arquivo.close()
+                self._arquivo = None
+
+
+def resumir_arquivos(caminhos):
+    """(tabela de percentis, contadores, produtos/min) somando um ou mais arquivos JSONL."""
+    registros = pd.concat([pd.read_json(caminho, lines=True, convert_dates=False) for caminho in caminhos],
+                          ignore_index=True)
+    fases = registros[registros['tipo'] == 'fase']
+    tabela = tabela_percentis(fases.groupby('fase')['ms'].agg(list).to_dict())
+    contadores = registros[registros['tipo'] == 'contador'].groupby('contador')['quantidade'].sum().astype(int)
+    # Vazão: os arquivos podem ser de processos em paralelo, então vale o intervalo total
+    minutos = (registros['ts'].max() - registros['ts'].min()) / 60
+    produtos = int(contadores.get('produtos', 0))
+    return tabela, contadores.to_dict(), (produtos / minutos if minutos > 0 else 0.0)
+
+
+# Instância única usada pelo robô inteiro (busca, produtos, todos os workers)
+METRICAS = Metricas()
@@ -0,0 +1,199 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .bloqueio import BLOQUEIOS, PaginaBloqueada, estado_pela_url
+from .metricas import METRICAS
+
+VALOR_PADRAO = 'Não encontrado'
+# Sem eles o produto não serve: só a falta destes campos no HTML chama o navegador
+CAMPOS_OBRIGATORIOS = ('Nome', 'Preço (R$)')
+
+CABECALHOS_HTTP = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+}
+
+
+class MotorSelenium:
+    """Motor de extração que abre a página no navegador (caminho original do robô)."""
+
+    nome = 'selenium'
+
+    def __init__(self, driver, funcao_extracao):
+        self.driver = driver
+        self.funcao_extracao = funcao_extracao
+
+    def extrair(self, url):
+        return self.funcao_extracao(self.driver, url)
+
+    def encerrar(self):
+        self.driver.quit()
+
+
+class MotorHttp:
+    """Motor de extração que baixa o HTML por uma sessão HTTP keep-alive.
+
+    A página é interpretada por `funcao_parse(html, url)` (HTML + JSON embutido).
+    Se faltar um dos CAMPOS_OBRIGATORIOS e houver um `fallback` (normalmente um
+    MotorSelenium), os campos que faltam são completados pelo navegador; campos
+    vazios de verdade (sem avaliações, sem vendidos) não chamam o navegador. Um
+    CAPTCHA, tela de login ou 403/429 vai inteiro para o `fallback`; sem ele,
+    levanta PaginaBloqueada. Timeout ou outra falha sem `fallback` descarta o
+    produto (devolve None, sem linha vazia na saída).
+    """
+
+    nome = 'http'
+
+    def __init__(self, funcao_parse, fallback=None, cookies=None, tamanho_pool=10, timeout=10, limitador=None):
+        self.funcao_parse = funcao_parse
+        self.fallback = fallback
+        self.limitador = limitador
+        self.timeout = timeout
+        self.sessao = criar_sessao_http(cookies, tamanho_pool)
+        self.total_http = 0
+        self.total_fallback = 0
+
+    def extrair(self, url):
+        self.total_http += 1
+        if self.limitador:
+            self.limitador.aguardar()
+        try:
+            with METRICAS.fase('http.baixar'):
+                resposta = self.sessao.get(url, timeout=self.timeout)
+            resposta.raise_for_status()
+            # Redirecionada para a verificação ou para o login
+            estado = estado_pela_url(resposta.url)
+            if estado and BLOQUEIOS.registrar(estado, url, 'produto'):
+                raise PaginaBloqueada(estado, url)
+            with METRICAS.fase('http.interpretar'):
+                dados = self.funcao_parse(resposta.text, url)
+            if self.limitador:
+                self.limitador.sucesso()
+        except PaginaBloqueada as bloqueio:
+            print(f"    🛑 {bloqueio.estado.upper()} no HTTP em {url[:60]}")
+            if self.limitador:
+                self.limitador.falha(bloqueio.estado)
+            if self.fallback is None:
+                raise
+            dados = None
+        except requests.Timeout as erro:
+            print(f"    ⚠️ Timeout HTTP em {url[:60]}: {erro}")
+            METRICAS.contar('timeout', espera='http')
+            if self.limitador:
+                self.limitador.falha('timeout')
+            dados = None
+        except requests.RequestException as erro:
+            print(f"    ⚠️ Falha HTTP em {url[:60]}: {erro}")
+            # 403/429 costumam ser o bloqueio anti-robô
+            resposta_erro = getattr(erro, 'response', None)
+            bloqueio = resposta_erro is not None and resposta_erro.status_code in (403, 429)
+            if self.limitador:
+                self.limitador.falha('bloqueio_http' if bloqueio else 'erro_http')
+            if bloqueio:
+                METRICAS.contar('bloqueio_http')
+                if self.fallback is None:
+                    raise PaginaBloqueada('bloqueio_http', url) from erro
+            dados = None
+
+        if self.fallback is None:
+            if dados is None:
+                BLOQUEIOS.descartar(url, 'falha_http')
+            return dados
+
+        if dados is None:
+            self.total_fallback += 1
+            METRICAS.contar('http.fallback')
+            return self.fallback.extrair(url)
+
+        if any(dados.get(campo, VALOR_PADRAO) == VALOR_PADRAO for campo in CAMPOS_OBRIGATORIOS):
+            self.total_fallback += 1
+            METRICAS.contar('http.fallback')
+            dados_navegador = self.fallback.extrair(url)
+            if dados_navegador is None:
+                # O navegador também falhou (e já descartou o produto)
+                return None
+            for campo, valor in dados.items():
+                if valor == VALOR_PADRAO:
+                    dados[campo] = dados_navegador.get(campo, VALOR_PADRAO)
+        return dados
+
+    def encerrar(self):
+        self.sessao.close()
+        if self.fallback is not None:
+            self.fallback.encerrar()
+        if self.total_http:
+            print(f"🌐 Motor HTTP: {self.total_http} páginas, {self.total_fallback} precisaram do navegador.")
+
+
+class MotorReciclavel:
+    """Motor que, diante de um CAPTCHA ou da tela de login, troca o navegador e tenta de novo.
+
+    `fabrica()` cria um motor novo (navegador reaberto, perfil recopiado) e pode
+    consultar `ultimo_bloqueio` (CAPTCHA, login...) para decidir como reabrir. A
+    URL bloqueada é tentada de novo no motor novo; depois de `max_tentativas`
+    reciclagens ela é descartada (devolve None) em vez de virar uma linha vazia.
+    """
+
+    def __init__(self, fabrica, motor=None, max_tentativas=2, pausa_bloqueio=30):
+        self.fabrica = fabrica
+        self.ultimo_bloqueio = None
+        self.motor = motor if motor is not None else fabrica()
+        self.max_tentativas = max_tentativas
+        self.pausa_bloqueio = pausa_bloqueio
+
+    @property
+    def nome(self):
+        return self.motor.nome
+
+    def reciclar(self, estado=None):
+        """Pausa, fecha o motor bloqueado (por `estado`) e abre outro pela fábrica."""
+        BLOQUEIOS.reciclagem()
+        self.ultimo_bloqueio = estado
+        try:
+            self.motor.encerrar()
+        except Exception as erro:
+            print(f"    ⚠️ Erro ao fechar o navegador bloqueado: {erro}")
+        # Já fechado: se a fábrica falhar, o encerrar() do fim não fecha de novo
+        self.motor = None
+        if self.pausa_bloqueio:
+            METRICAS.dormir(self.pausa_bloqueio, 'pausa.bloqueio')
+        self.motor = self.fabrica()
+
+    def extrair(self, url):
+        for tentativa in range(self.max_tentativas + 1):
+            try:
+                return self.motor.extrair(url)
+            except PaginaBloqueada as bloqueio:
+                if tentativa == self.max_tentativas:
+                    break
+                print(f"    ♻️ {bloqueio.estado.upper()}: reciclando o navegador "
+                      f"(tentativa {tentativa + 1}/{self.max_tentativas})...")
+                self.reciclar(bloqueio.estado)
+        print(f"    🚫 Continua bloqueado, produto deixado de fora: {url[:60]}")
+        BLOQUEIOS.descartar(url)
+        return None
+
+    def encerrar(self):
+        if self.motor is not None:
+            self.motor.encerrar()
+
+
+def criar_sessao_http(cookies=None, tamanho_pool=10):
+    """Cria uma sessão requests com pool de conexões persistentes e retentativas."""
+    sessao = requests.Session()
+    sessao.headers.update(CABECALHOS_HTTP)
+    # Sem 429: o urllib3 dormiria o Retry-After fora do LIMITADOR e, esgotadas as
+    # tentativas, levantaria RetryError sem a resposta, escondendo o bloqueio_http
+    retentativas = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+    adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=retentativas)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    # Reaproveita os cookies do navegador logado (formato de driver.get_cookies())
+    for cookie in cookies or []:
+        sessao.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    return sessao
@@ -0,0 +1,130 @@
+from urllib.parse import quote
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from ..produtos import chave_produto
+from .config import DOMINIO, URL_BASE
+from .driver import medir_carga
+from .bloqueio import BLOQUEIOS, BUSCA, DESCONHECIDA, PaginaBloqueada, classificar_pagina
+from .limitador import LIMITADOR
+from .metricas import METRICAS
+from .seletores import compilar_script_cartoes
+
+# Link e campos de todos os cartões da página de resultado em um único execute_script
+SCRIPT_CARTOES = compilar_script_cartoes()
+
+
+def link_valido(href):
+    """Filtros 1 a 3: link de produto do próprio site (sem busca nem 'produtos similares')."""
+    # --- MUDANÇA v1.6 (NOVO FILTRO) ---
+    # Adicionamos a condição 'find_similar_products' not in href
+    filtro_1 = href and DOMINIO in href
+    filtro_2 = filtro_1 and 'search' not in href
+    filtro_3 = filtro_1 and 'find_similar_products' not in href # <-- NOVO FILTRO AQUI
+    return bool(filtro_1 and filtro_2 and filtro_3)
+
+
+def coletar_links_termo(driver, wait, termo_pesquisa, max_produtos, limite_paginas, cartoes=None, relevancia=None):
+    """Percorre as páginas de resultado do termo e devolve os links de produto.
+
+    Com um dict em `cartoes`, guarda nele também os campos brutos do cartão de
+    cada link ({url: {campo: [texto, índice] ou None}}, ver SELETORES_CARTAO).
+    Com um FiltroRelevancia em `relevancia`, a meta de `max_produtos` conta só os
+    cartões relevantes e a paginação para na página que não trouxer nenhum; os
+    links voltam todos, na ordem da busca, para o filtro escolher depois.
+    Levanta PaginaBloqueada se alguma página de resultado cair no CAPTCHA ou no login.
+    """
+    # --- LÓGICA DE PAGINAÇÃO v1.5 ---
+
+    urls_para_visitar_total = [] # Lista de links para este termo
+    chaves_vistas = set() # Produtos (loja + item) já incluídos, para o filtro 4
+    numero_pagina = 0 # Começa na página 1 (que tem o índice 0)
+    relevantes = 0 # Links com nota de relevância acima do limiar (só com `relevancia`)
+    if relevancia is not None and cartoes is None:
+        cartoes = {} # A nota sai do nome do cartão
+
+    while (relevantes if relevancia else len(urls_para_visitar_total)) < max_produtos and numero_pagina < limite_paginas:
+
+        print(f"  -> Acessando Página {numero_pagina + 1}...")
+
+        try:
+            termo_formatado = quote(termo_pesquisa)
+            # Adicionamos o parâmetro &page={numero_pagina}
+            url_de_busca = f"{URL_BASE}/search?keyword={termo_formatado}&page={numero_pagina}"
+            LIMITADOR.aguardar()
+            with METRICAS.fase('busca.carregar'):
+                driver.get(url_de_busca)
+
+            # Resultado, busca vazia, CAPTCHA ou login: o que aparecer primeiro
+            with METRICAS.fase('busca.esperar'):
+                estado = wait.until(classificar_pagina)
+            medir_carga(driver, 'busca')
+            if BLOQUEIOS.registrar(estado, url_de_busca, 'busca'):
+                print(f"  -> 🛑 {estado.upper()} na Página {numero_pagina + 1}.")
+                LIMITADOR.falha(estado)
+                raise PaginaBloqueada(estado, url_de_busca)
+            if estado != BUSCA:
+                raise NoSuchElementException(f"página de resultado sem produtos ({estado})")
+            LIMITADOR.sucesso()
+
+            print(f"  -> Coletando links da Página {numero_pagina + 1}...")
+
+            seletor_links = "li.shopee-search-item-result__item a[href]"
+            links_desta_pagina = []
+            relevantes_desta_pagina = 0
+            with METRICAS.fase('busca.links'):
+                if cartoes is not None:
+                    campos_cartoes = dict(driver.execute_script(SCRIPT_CARTOES))
+                    elementos_link = list(campos_cartoes)
+                else:
+                    elementos_link = driver.find_elements(By.CSS_SELECTOR, seletor_links)
+
+                for link in elementos_link:
+                    try:
+                        href = link if cartoes is not None else link.get_attribute('href')
+
+                        filtro_4 = href and chave_produto(href) not in chaves_vistas
+
+                        if link_valido(href) and filtro_4:
+                            links_desta_pagina.append(href)
+                            urls_para_visitar_total.append(href)
+                            chaves_vistas.add(chave_produto(href))
+                            if cartoes is not None:
+                                cartoes[href] = campos_cartoes[href]
+                            if relevancia is not None:
+                                nome = (campos_cartoes[href].get('Nome') or [''])[0]
+                                relevantes_desta_pagina += relevancia.avaliar(href, nome)
+                    except:
+                        continue
+
+            # Se a página não retornar nenhum link novo, paramos
+            if not links_desta_pagina:
+                print(f"  -> Nenhum link novo encontrado na Página {numero_pagina + 1}. Provavelmente chegamos ao fim.")
+                break
+
+            print(f"  -> {len(links_desta_pagina)} links novos encontrados.")
+            print(f"  -> Total de links acumulados: {len(urls_para_visitar_total)} (Meta: {max_produtos})")
+
+            numero_pagina += 1 # Prepara para a próxima página
+
+            if relevancia is not None:
+                relevancia.paginas_lidas = numero_pagina
+                relevantes += relevantes_desta_pagina
+                print(f"  -> {relevantes_desta_pagina} cartões relevantes nesta página ({relevantes} no total).")
+                # A busca vem da mais para a menos relevante: daqui para a frente só piora
+                if not relevantes_desta_pagina:
+                    print(f"  -> Nenhum cartão relevante na Página {numero_pagina}. Parando a paginação.")
+                    relevancia.parou_cedo = True
+                    break
+
+        except (NoSuchElementException, TimeoutException) as erro:
+            if isinstance(erro, TimeoutException):
+                BLOQUEIOS.registrar(DESCONHECIDA, url_de_busca, 'busca')
+            print(f"  -> Nenhum resultado encontrado na Página {numero_pagina + 1}. Parando a busca por este termo.")
+            LIMITADOR.falha('vazio')
+            METRICAS.contar('busca.vazia')
+            break # Para o loop 'while' e vai para o próximo termo
+
+    # --- FIM DO BLOCO DE PAGINAÇÃO ---
+    return urls_para_visitar_total
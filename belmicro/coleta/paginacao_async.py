@@ -0,0 +1,171 @@
+import asyncio
+import queue
+import threading
+from urllib.parse import quote
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+
+from ..produtos import chave_produto
+from .bloqueio import BLOQUEIOS, BUSCA, DESCONHECIDA, SCRIPT_ESTADO, PaginaBloqueada
+from .metricas import METRICAS
+from .seletores import compilar_script_cartoes
+
+# Mesma classificação (URL + marcadores do HTML) do classificar_pagina do Selenium
+SCRIPT_ESTADO_ASYNC = '() => {' + SCRIPT_ESTADO + '}'
+# Link e campos de cada cartão, como no coletar_links_termo (o script vira o corpo de uma função)
+SCRIPT_CARTOES = '() => {' + compilar_script_cartoes() + '}'
+
+
+class ColetorLinksAsync:
+    """Busca as páginas de resultado de um termo em paralelo (Playwright assíncrono).
+
+    Roda o seu próprio loop asyncio numa thread separada. `coletar(termo)` é um
+    gerador: devolve os links na ordem das páginas assim que cada página fica
+    pronta, enquanto as páginas seguintes continuam carregando em segundo plano.
+    Assim a extração dos produtos começa antes de a paginação terminar. Uma
+    página de resultado no CAPTCHA ou no login levanta PaginaBloqueada no
+    gerador, depois dos links das páginas anteriores.
+    """
+
+    def __init__(self, url_base, filtro_link, paginas_simultaneas=3, limite_paginas=5,
+                 max_links=45, cookies=None, limitador=None, headless=True):
+        self.url_base = url_base
+        self.filtro_link = filtro_link
+        self.paginas_simultaneas = paginas_simultaneas
+        self.limite_paginas = limite_paginas
+        self.max_links = max_links
+        self.limitador = limitador
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._executar(self._abrir(cookies or [], headless))
+
+    def _executar(self, corrotina):
+        return asyncio.run_coroutine_threadsafe(corrotina, self._loop).result()
+
+    async def _abrir(self, cookies, headless):
+        self._playwright = await async_playwright().start()
+        self._navegador = await self._playwright.chromium.launch(headless=headless)
+        self._contexto = await self._navegador.new_context(locale='pt-BR')
+        # Reaproveita a sessão logada do Chrome principal (formato de driver.get_cookies())
+        if cookies:
+            await self._contexto.add_cookies([
+                {
+                    'name': c['name'],
+                    'value': c['value'],
+                    'domain': c['domain'],
+                    'path': c.get('path', '/'),
+                    'secure': c.get('secure', False),
+                    'httpOnly': c.get('httpOnly', False),
+                }
+                for c in cookies
+            ])
+
+    def coletar(self, termo, cartoes=None, relevancia=None):
+        """Gera os links de produto do termo, na ordem das páginas de resultado.
+
+        Com um dict em `cartoes`, guarda nele os campos brutos do cartão de cada link
+        (preenchido antes de o link sair do gerador). Com um FiltroRelevancia em
+        `relevancia`, como no coletar_links_termo: cada cartão recebe a nota antes de
+        sair, a meta de `max_links` conta só os relevantes e a paginação para na
+        página que não trouxer nenhum.
+        """
+        fila = queue.Queue()
+        futuro = asyncio.run_coroutine_threadsafe(
+            self._coletar_termo(termo, fila, cartoes, relevancia), self._loop)
+        while True:
+            href = fila.get()
+            if href is None:
+                break
+            yield href
+        futuro.result()  # propaga erros da paginação
+
+    async def _coletar_termo(self, termo, fila, cartoes, relevancia):
+        tarefas = {}
+        try:
+            for numero_pagina in range(min(self.paginas_simultaneas, self.limite_paginas)):
+                tarefas[numero_pagina] = asyncio.create_task(self._links_da_pagina(termo, numero_pagina))
+            proxima_pagina = len(tarefas)
+
+            chaves_vistas = set()
+            entregues = 0
+            relevantes = 0
+            for numero_pagina in range(self.limite_paginas):
+                if numero_pagina not in tarefas:
+                    break
+                links = await tarefas.pop(numero_pagina)
+
+                novos = 0
+                relevantes_desta_pagina = 0
+                for href, campos in links:
+                    chave = chave_produto(href) if href else None
+                    if self.filtro_link(href) and chave not in chaves_vistas:
+                        chaves_vistas.add(chave)
+                        if cartoes is not None:
+                            cartoes[href] = campos
+                        if relevancia is not None:
+                            relevantes_desta_pagina += relevancia.avaliar(href, ((campos or {}).get('Nome') or [''])[0])
+                        fila.put(href)
+                        novos += 1
+                        entregues += 1
+                        if (relevantes + relevantes_desta_pagina if relevancia else entregues) >= self.max_links:
+                            break
+                print(f"  -> [async] Página {numero_pagina + 1}: {novos} links novos (total {entregues}).")
+
+                if relevancia is not None:
+                    relevancia.paginas_lidas = numero_pagina + 1
+                    relevantes += relevantes_desta_pagina
+                    # A busca vem da mais para a menos relevante: daqui para a frente só piora
+                    if novos and not relevantes_desta_pagina:
+                        print(f"  -> [async] Nenhum cartão relevante na Página {numero_pagina + 1}. Parando a paginação.")
+                        relevancia.parou_cedo = True
+                        break
+                if not novos or (relevantes if relevancia else entregues) >= self.max_links:
+                    break
+                if proxima_pagina < self.limite_paginas:
+                    tarefas[proxima_pagina] = asyncio.create_task(self._links_da_pagina(termo, proxima_pagina))
+                    proxima_pagina += 1
+        finally:
+            for tarefa in tarefas.values():
+                tarefa.cancel()
+            fila.put(None)
+
+    async def _links_da_pagina(self, termo, numero_pagina):
+        if self.limitador:
+            await asyncio.get_running_loop().run_in_executor(None, self.limitador.aguardar)
+        url_de_busca = f"{self.url_base}/search?keyword={quote(termo)}&page={numero_pagina}"
+        pagina = await self._contexto.new_page()
+        try:
+            with METRICAS.fase('busca.carregar', motor='async'):
+                await pagina.goto(url_de_busca, wait_until='domcontentloaded', timeout=30000)
+            # Resultado, busca vazia, CAPTCHA ou login: o que aparecer primeiro
+            try:
+                with METRICAS.fase('busca.esperar', motor='async'):
+                    estado = await (await pagina.wait_for_function(SCRIPT_ESTADO_ASYNC, timeout=15000)).json_value()
+            except PlaywrightTimeout:
+                estado = DESCONHECIDA
+            if BLOQUEIOS.registrar(estado, url_de_busca, 'busca'):
+                print(f"  -> 🛑 [async] {estado.upper()} na Página {numero_pagina + 1}.")
+                if self.limitador:
+                    self.limitador.falha(estado)
+                raise PaginaBloqueada(estado, url_de_busca)
+            if estado != BUSCA:
+                METRICAS.contar('busca.vazia')
+                if self.limitador:
+                    self.limitador.falha('vazio')
+                return []
+            if self.limitador:
+                self.limitador.sucesso()
+            return await pagina.evaluate(SCRIPT_CARTOES)
+        finally:
+            await pagina.close()
+
+    async def _fechar(self):
+        await self._contexto.close()
+        await self._navegador.close()
+        await self._playwright.stop()
+
+    def encerrar(self):
+        self._executar(self._fechar())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
@@ -0,0 +1,131 @@
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+
+from .bloqueio import BLOQUEIOS, PaginaBloqueada
+from .metricas import METRICAS
+
+# Arquivos/pastas do perfil do Chrome que não devem ser copiados para os workers
+# (travas de instância única e caches que só ocupam espaço).
+IGNORAR_NO_CLONE = shutil.ignore_patterns(
+    'Singleton*', 'lockfile', '*.lock', 'LOCK',
+    'Cache', 'Code Cache', 'GPUCache', 'ShaderCache', 'GrShaderCache', 'Crashpad',
+)
+
+
+def clonar_perfil(caminho_origem, caminho_destino):
+    """Copia o perfil logado do Chrome para a pasta de um worker (mantém cookies/sessão)."""
+    if os.path.exists(caminho_destino):
+        shutil.rmtree(caminho_destino, ignore_errors=True)
+    shutil.copytree(caminho_origem, caminho_destino, ignore=IGNORAR_NO_CLONE, dirs_exist_ok=True)
+    return caminho_destino
+
+
+def preparar_perfis_workers(caminho_origem, pasta_workers, num_workers):
+    """Cria uma cópia do perfil para cada worker e devolve a lista de caminhos."""
+    caminhos = []
+    for id_worker in range(num_workers):
+        destino = os.path.join(pasta_workers, f'worker_{id_worker}')
+        caminhos.append(clonar_perfil(caminho_origem, destino))
+    print(f"📁 {num_workers} perfis de worker clonados em '{pasta_workers}'.")
+    return caminhos
+
+
+class PoolNavegadores:
+    """Pool de N navegadores que consomem URLs de uma fila compartilhada.
+
+    Cada worker tem o seu próprio driver (criado por `fabrica_driver(id_worker)`),
+    respeita a sua própria pausa entre produtos e grava o resultado na posição
+    original da URL, de modo que a saída sai na mesma ordem da entrada. URLs
+    bloqueadas (CAPTCHA/login que o motor não conseguiu contornar) ficam de fora.
+    """
+
+    def __init__(self, num_workers, fabrica_driver, funcao_extracao, pausa=(1.5, 3.0)):
+        self.num_workers = num_workers
+        self.fabrica_driver = fabrica_driver
+        self.funcao_extracao = funcao_extracao
+        self.pausa = pausa
+        self.drivers = []
+
+    def iniciar(self):
+        # Os drivers são criados em sequência: o undetected-chromedriver modifica o
+        # binário do chromedriver ao iniciar e várias instâncias ao mesmo tempo brigam por ele.
+        for id_worker in range(self.num_workers):
+            print(f"🚗 Iniciando navegador do worker {id_worker}...")
+            self.drivers.append(self.fabrica_driver(id_worker))
+        return self
+
+    def extrair(self, urls, ao_concluir=None):
+        """Extrai todas as URLs em paralelo e devolve os dados na ordem de entrada.
+
+        `urls` pode ser uma lista ou qualquer iterável (inclusive um gerador que
+        ainda está descobrindo links): os workers começam a extrair assim que o
+        primeiro link chega. `ao_concluir(indice, dados)` é chamado (na thread do
+        worker) assim que cada produto termina.
+        """
+        if not self.drivers:
+            self.iniciar()
+
+        fila = queue.Queue()
+        resultados = {}
+        total = len(urls) if hasattr(urls, '__len__') else None
+        threads = []
+        for id_worker, driver in enumerate(self.drivers):
+            t = threading.Thread(
+                target=self._trabalhar,
+                args=(id_worker, driver, fila, resultados, total, ao_concluir),
+                daemon=True,
+            )
+            t.start()
+            threads.append(t)
+
+        try:
+            for indice, url in enumerate(urls):
+                fila.put((indice, url))
+        finally:
+            # Sinal de fim para cada worker, mesmo se o gerador de links falhar no meio
+            for _ in threads:
+                fila.put(None)
+            for t in threads:
+                t.join()
+        return [resultados[indice] for indice in sorted(resultados)]
+
+    def _trabalhar(self, id_worker, driver, fila, resultados, total, ao_concluir):
+        while True:
+            item = fila.get()
+            if item is None:
+                return
+            indice, url = item
+            posicao = f"{indice + 1}/{total}" if total else f"{indice + 1}"
+            print(f"    - [worker {id_worker}] Extraindo dados [{posicao}]: {url[:60]}...")
+            try:
+                dados = self.funcao_extracao(driver, url)
+            except PaginaBloqueada as bloqueio:
+                print(f"    🛑 [worker {id_worker}] {bloqueio.estado.upper()} em {url[:60]}")
+                BLOQUEIOS.descartar(url)
+                dados = None
+            except Exception as erro:
+                print(f"    ⚠️ [worker {id_worker}] Erro ao extrair {url[:60]}: {erro}")
+                BLOQUEIOS.descartar(url, 'erro')
+                dados = None
+            # None = página bloqueada ou falha: nada de linha vazia na saída
+            if dados is not None:
+                resultados[indice] = dados
+                if ao_concluir:
+                    ao_concluir(indice, dados)
+            # Pausa individual de cada worker entre produtos (None = sem pausa fixa)
+            if self.pausa:
+                METRICAS.dormir(random.uniform(*self.pausa), 'pausa.worker')
+
+    def encerrar(self):
+        for driver in self.drivers:
+            try:
+                # Aceita tanto drivers do Selenium quanto motores de extração
+                fechar = getattr(driver, 'encerrar', None) or driver.quit
+                fechar()
+            except Exception:
+                pass
+        self.drivers = []
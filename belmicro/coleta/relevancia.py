@@ -0,0 +1,100 @@
+"""Relevância dos cartões da busca para o produto de referência da Belmicro.
+
+Nota de 0 a 1 a partir do nome do cartão, com as mesmas regras do pré-filtro
+do comparativo (belmicro/comparacao/prefiltro.py): capacidade ou código de
+modelo diferentes zeram a nota, o mesmo código ou quase todos os tokens da
+referência dão 1, e no meio vale a fração dos tokens da referência presentes
+(com o mesmo código, fica no meio do caminho até 1). Acessórios (capa,
+suporte, prato...) que a referência não é valem um terço.
+
+Com a nota, a paginação para quando uma página de resultado não traz nenhum
+cartão relevante e só os mais relevantes vão para a extração, em vez de abrir
+produtos que o comparativo marcaria como NÃO depois.
+"""
+
+from ..comparacao.prefiltro import NAO, SIM, classificar_par, cobertura, descrever
+
+LIMIAR_RELEVANCIA = 0.45
+# Palavras que indicam peça ou acessório do produto, e não o produto
+PALAVRAS_ACESSORIO = frozenset("""
+acessorio acessorios adesivo borracha capa compativel controle filtro gaxeta kit lampada
+pe pecas peca placa prato protetor puxador reposicao resistencia suporte tampa
+""".split())
+PESO_ACESSORIO = 1 / 3
+MESMO_CODIGO = 'mesmo código, nomes diferentes'
+
+
+def pontuar(nome, referencia):
+    """Nota de relevância (0 a 1) do nome de um cartão para o nome de referência."""
+    if not nome or not referencia:
+        return 0.0
+    decisao, motivo = classificar_par(nome, referencia)
+    if decisao == NAO:
+        return 0.0
+    anuncio, ref = descrever(nome), descrever(referencia)
+    nota = 1.0 if decisao == SIM else cobertura(anuncio, ref)
+    if motivo == MESMO_CODIGO:
+        # Título curto com o mesmo código de modelo ainda é o produto
+        nota = (1.0 + nota) / 2
+    # Palavras do título antes das palavras vazias: 'kit' é vazia para a comparação de nomes
+    if (set(anuncio.normalizado.split()) & PALAVRAS_ACESSORIO) - set(ref.normalizado.split()):
+        nota *= PESO_ACESSORIO
+    return nota
+
+
+class FiltroRelevancia:
+    """Notas dos cartões de um termo e a escolha dos que vão para a extração."""
+
+    def __init__(self, referencia, limiar=LIMIAR_RELEVANCIA):
+        self.referencia = referencia
+        self.limiar = limiar
+        self.notas = {}          # URL -> nota, na ordem em que os cartões apareceram
+        self.paginas_lidas = 0
+        self.parou_cedo = False  # a paginação parou por falta de cartões relevantes
+        self.poupados = 0        # produtos irrelevantes que deixaram de ser abertos
+
+    def avaliar(self, url, nome):
+        """Guarda a nota do cartão e devolve se ele é relevante."""
+        self.notas[url] = pontuar(nome, self.referencia)
+        return self.notas[url] >= self.limiar
+
+    def escolher(self, urls, cartoes, maximo):
+        """Os `maximo` links relevantes de maior nota (empates na ordem da busca).
+
+        `urls` vem na ordem da busca e `cartoes` tem os campos brutos de cada um;
+        links sem cartão passam como relevantes. Guarda em `poupados` quantos dos
+        `maximo` primeiros da busca (os que seriam abertos sem o filtro) eram irrelevantes.
+        """
+        for url in urls:
+            if url not in self.notas and cartoes.get(url):
+                self.avaliar(url, (cartoes[url].get('Nome') or [''])[0])
+        notas = [(self.notas.get(url, 1.0), posicao, url) for posicao, url in enumerate(urls)]
+        self.poupados = sum(nota < self.limiar for nota, _, _ in notas[:maximo])
+        relevantes = sorted((item for item in notas if item[0] >= self.limiar), key=lambda item: (-item[0], item[1]))
+        return [url for _, _, url in relevantes[:maximo]]
+
+    def filtrar(self, urls, cartoes, maximo):
+        """Gera, na ordem da busca, os `maximo` primeiros links relevantes de `urls`.
+
+        Versão preguiçosa do escolher, para links que ainda estão chegando (paginação
+        em paralelo): cada link sai assim que chega, sem esperar o fim da busca, e os
+        irrelevantes entre os `maximo` primeiros vão contando em `poupados`.
+        """
+        self.poupados = 0
+        entregues = 0
+        for posicao, url in enumerate(urls):
+            if url not in self.notas and cartoes.get(url):
+                self.avaliar(url, (cartoes[url].get('Nome') or [''])[0])
+            if self.notas.get(url, 1.0) < self.limiar:
+                self.poupados += posicao < maximo
+                continue
+            yield url
+            entregues += 1
+            if entregues >= maximo:
+                return
+
+    def resumo(self):
+        relevantes = sum(nota >= self.limiar for nota in self.notas.values())
+        parada = ", parou por relevância" if self.parou_cedo else ""
+        return (f"🎯 Relevância: {relevantes}/{len(self.notas)} cartões relevantes em {self.paginas_lidas} "
+                f"páginas de busca{parada}; {self.poupados} produtos irrelevantes não foram abertos.")
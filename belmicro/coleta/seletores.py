@@ -0,0 +1,195 @@
+import json
+import threading
+from urllib.parse import urljoin
+
+# Campos da página de produto e seus seletores, em ordem de preferência.
+# O primeiro XPath que devolver algo não-vazio vence; os seguintes são alternativas
+# para as várias versões do layout da Shopee.
+#   tipo: como a coluna é convertida (ver normalizar_campos_numericos no robô)
+#   atributo: lê um atributo do elemento em vez do texto
+SELETORES_PRODUTO = {
+    'Nome': {
+        'xpaths': ['//h1'],
+        'tipo': 'texto',
+    },
+    'Preço (R$)': {
+        'xpaths': [
+            '//div[contains(@class,"IZPeQz")]',
+            '//div[contains(@class,"pqTWkA")]',
+            '//span[contains(text(),"R$")]',
+        ],
+        'tipo': 'preco',
+    },
+    'Avaliação Média': {
+        'xpaths': [
+            '(//button[contains(@class,"e2p50f")]/div)[1]',
+            '//div[contains(@class,"product-rating-overview__rating-score")]',
+        ],
+        'tipo': 'decimal',
+    },
+    'Total de Avaliações': {
+        'xpaths': [
+            '//button[contains(@class,"e2p50f")]/div[@class="F9RHbS"]',
+            '//div[contains(text(),"avaliações")]',
+        ],
+        'tipo': 'numero',
+    },
+    'Vendidos': {
+        'xpaths': ['//div[contains(@class,"aleSBU")]'],
+        'tipo': 'numero',
+    },
+    'Vendedor': {
+        'xpaths': ['//section[contains(@class,"page-product__shop")]//div[contains(@class,"fV3TIn")]'],
+        'tipo': 'texto',
+    },
+    'Link Loja': {
+        'xpaths': ['//section[contains(@class,"page-product__shop")]//a[contains(@class,"lG5Xxv")]'],
+        'atributo': 'href',
+        'tipo': 'texto',
+    },
+}
+
+# Campos que os cartões da página de resultado já mostram, com XPaths relativos ao
+# cartão (li.shopee-search-item-result__item). Vendedor e Link Loja não aparecem nele.
+SELETOR_CARTAO = 'li.shopee-search-item-result__item'
+SELETORES_CARTAO = {
+    'Nome': {
+        'xpaths': ['.//div[contains(@class,"line-clamp-2")]', './/div[@data-sqe="name"]//div'],
+        'tipo': 'texto',
+    },
+    'Preço (R$)': {
+        'xpaths': [
+            './/span[contains(@class,"font-medium")]',
+            './/span[contains(text(),"R$")]/following-sibling::span[1]',
+        ],
+        'tipo': 'preco',
+    },
+    'Avaliação Média': {
+        'xpaths': ['.//img[contains(@alt,"rating")]/following-sibling::div[1]'],
+        'tipo': 'decimal',
+    },
+    'Vendidos': {
+        'xpaths': ['.//div[contains(text(),"vendido")]'],
+        'tipo': 'numero',
+    },
+}
+
+MODELO_SCRIPT = """
+const spec = %s;
+const resultado = {};
+for (const [campo, s] of Object.entries(spec)) {
+    resultado[campo] = null;
+    for (let i = 0; i < s.xpaths.length; i++) {
+        const no = document.evaluate(
+            s.xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (!no) continue;
+        const valor = s.atributo
+            ? (no[s.atributo] || no.getAttribute(s.atributo) || '')
+            : (no.innerText || no.textContent || '').trim();
+        if (valor) { resultado[campo] = [valor, i]; break; }
+    }
+}
+return resultado;
+"""
+
+
+def compilar_script(spec=SELETORES_PRODUTO):
+    """Gera o JavaScript que lê todos os campos do spec em um único execute_script.
+
+    O script devolve {campo: [valor bruto, índice do seletor usado] ou null}.
+    """
+    return MODELO_SCRIPT % json.dumps(spec, ensure_ascii=False)
+
+
+MODELO_SCRIPT_CARTOES = """
+const spec = %s;
+const cartoes = [];
+for (const cartao of document.querySelectorAll(%s)) {
+    const link = cartao.querySelector('a[href]');
+    if (!link) continue;
+    const campos = {};
+    for (const [campo, s] of Object.entries(spec)) {
+        campos[campo] = null;
+        for (let i = 0; i < s.xpaths.length; i++) {
+            const no = document.evaluate(
+                s.xpaths[i], cartao, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+            const valor = no ? (no.innerText || no.textContent || '').trim() : '';
+            if (valor) { campos[campo] = [valor, i]; break; }
+        }
+    }
+    cartoes.push([link.href, campos]);
+}
+return cartoes;
+"""
+
+
+def compilar_script_cartoes(spec=SELETORES_CARTAO, seletor_cartao=SELETOR_CARTAO):
+    """JavaScript que lê, num único execute_script, o link e os campos de cada cartão da busca.
+
+    O script devolve [[href, {campo: [valor bruto, índice] ou null}], ...], na ordem da página.
+    """
+    return MODELO_SCRIPT_CARTOES % (json.dumps(spec, ensure_ascii=False), json.dumps(seletor_cartao))
+
+
+def avaliar_cartoes_lxml(arvore, url_base, spec=SELETORES_CARTAO):
+    """Mesmo resultado do script dos cartões, sobre o HTML da busca já baixado (lxml)."""
+    cartoes = []
+    for cartao in arvore.xpath('//li[contains(@class,"shopee-search-item-result__item")]'):
+        links = cartao.xpath('.//a/@href')
+        if links:
+            cartoes.append([urljoin(url_base, links[0]), avaliar_spec_lxml(cartao, url_base, spec)])
+    return cartoes
+
+
+def avaliar_spec_lxml(arvore, url_base, spec=SELETORES_PRODUTO):
+    """Mesmo resultado do script compilado, mas sobre um HTML já baixado (lxml)."""
+    resultado = {}
+    for campo, s in spec.items():
+        resultado[campo] = None
+        for indice, xpath in enumerate(s['xpaths']):
+            elementos = arvore.xpath(xpath)
+            if not elementos:
+                continue
+            if s.get('atributo'):
+                valor = elementos[0].get(s['atributo']) or ''
+                if valor and s['atributo'] == 'href':
+                    valor = urljoin(url_base, valor)
+            else:
+                valor = elementos[0].text_content().strip()
+            if valor:
+                resultado[campo] = [valor, indice]
+                break
+    return resultado
+
+
+class EstatisticasSeletores:
+    """Conta quantas vezes cada seletor (e cada alternativa) resolveu o seu campo."""
+
+    def __init__(self, spec=SELETORES_PRODUTO):
+        self.spec = spec
+        self.acertos = {campo: [0] * len(s['xpaths']) for campo, s in spec.items()}
+        self.vazios = {campo: 0 for campo in spec}
+        self._trava = threading.Lock()
+
+    def registrar(self, brutos):
+        with self._trava:
+            for campo in self.spec:
+                achado = brutos.get(campo)
+                if achado is None:
+                    self.vazios[campo] += 1
+                else:
+                    self.acertos[campo][achado[1]] += 1
+
+    def relatorio(self):
+        linhas = ["🎯 Uso dos seletores por campo:"]
+        for campo, s in self.spec.items():
+            total = sum(self.acertos[campo]) + self.vazios[campo]
+            if not total:
+                continue
+            linhas.append(f"  {campo}: {self.vazios[campo]}/{total} sem valor")
+            for indice, xpath in enumerate(s['xpaths']):
+                qtd = self.acertos[campo][indice]
+                linhas.append(f"    [{indice}] {qtd / total * 100:5.1f}%  {xpath}")
+        return "\n".join(linhas)
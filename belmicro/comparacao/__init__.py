@@ -0,0 +1,10 @@
+"""Comparação dos anúncios com o produto de referência da Belmicro (coluna Comparativo)."""
+
+from .cache import CacheComparacoes
+from .etapa import executar_comparacao, gerar_comparativo
+from .indice import IndiceProdutos
+from .llm import ClienteGroq
+from .prefiltro import classificar_par
+
+__all__ = ['CacheComparacoes', 'ClienteGroq', 'IndiceProdutos', 'classificar_par', 'executar_comparacao',
+           'gerar_comparativo']
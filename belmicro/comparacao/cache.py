@@ -0,0 +1,64 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+from .prefiltro import descrever
+
+
+def chave_par(nome, referencia):
+    """Chave do par pelos nomes normalizados (caixa, acento e medidas não importam)."""
+    texto = f"{descrever(nome).normalizado}\x1f{descrever(referencia).normalizado}"
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+class CacheComparacoes:
+    """Respostas do LLM já obtidas, em SQLite, para não perguntar o mesmo par de novo."""
+
+    def __init__(self, caminho):
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS comparacoes (
+                chave TEXT PRIMARY KEY,
+                resposta TEXT NOT NULL,
+                origem TEXT NOT NULL,
+                gravado_em REAL NOT NULL
+            );
+        """)
+        self.conexao.commit()
+
+    def obter_varios(self, chaves):
+        """{chave: resposta} das chaves que já estão no cache."""
+        chaves = list(chaves)
+        encontrados = {}
+        with self._trava:
+            # Consulta em blocos (limite de parâmetros do SQLite)
+            for inicio in range(0, len(chaves), 500):
+                bloco = chaves[inicio:inicio + 500]
+                marcadores = ','.join('?' * len(bloco))
+                encontrados.update(self.conexao.execute(
+                    f'SELECT chave, resposta FROM comparacoes WHERE chave IN ({marcadores})', bloco
+                ).fetchall())
+        self.acertos += len(encontrados)
+        self.falhas += len(chaves) - len(encontrados)
+        return encontrados
+
+    def gravar_varios(self, respostas, origem):
+        agora = time.time()
+        with self._trava, self.conexao:
+            self.conexao.executemany(
+                'INSERT OR REPLACE INTO comparacoes (chave, resposta, origem, gravado_em) VALUES (?, ?, ?, ?)',
+                [(chave, resposta, origem, agora) for chave, resposta in respostas.items()],
+            )
+
+    def resumo(self):
+        consultas = self.acertos + self.falhas
+        taxa = (self.acertos / consultas * 100) if consultas else 0.0
+        return f"🗃️ Cache de comparações: {self.acertos} acertos, {self.falhas} falhas ({taxa:.1f}% de acerto)."
+
+    def fechar(self):
+        self.conexao.close()
@@ -0,0 +1,44 @@
+import argparse
+import os
+
+from ..caminhos import PASTA_LIMPEZA
+from .etapa import COLUNA_REFERENCIA, TAMANHO_LOTE, executar_comparacao
+from .llm import MODELO_PADRAO
+
+ARQUIVO_ENTRADA = os.path.join(PASTA_LIMPEZA, 'resultados_shopee_finalissimo.parquet')
+ARQUIVO_SAIDA = os.path.join(PASTA_LIMPEZA, 'resultados_comparativo.parquet')
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m belmicro.comparacao',
+        description="Gera a coluna Comparativo (SIM/NÃO): o anúncio é o mesmo produto da Belmicro?",
+    )
+    parser.add_argument('--entrada', default=ARQUIVO_ENTRADA, help="Resultados da limpeza (.parquet ou .xlsx).")
+    parser.add_argument('--saida', default=ARQUIVO_SAIDA, help="Arquivo .parquet com a coluna Comparativo.")
+    parser.add_argument('--xlsx', help="Exporta também uma cópia em XLSX.")
+    parser.add_argument('--coluna-referencia', default=COLUNA_REFERENCIA,
+                        help="Coluna com o nome do produto Belmicro de referência.")
+    parser.add_argument('--referencias',
+                        help="Planilha com os produtos Belmicro (coluna 'Descricao'), para preencher a referência "
+                             "pelo índice local quando a entrada não tiver a coluna de referência.")
+    parser.add_argument('--cache', help="Cache SQLite das respostas do LLM (padrão: ao lado da saída).")
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE, help="Pares por chamada ao LLM.")
+    parser.add_argument('--modelo', default=MODELO_PADRAO, help="Modelo da Groq.")
+    parser.add_argument('--sem-llm', action='store_true',
+                        help="Não chama o LLM: os ambíguos são decididos pela semelhança dos nomes.")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    try:
+        return executar_comparacao(args.entrada, args.saida, args.xlsx, args.coluna_referencia, args.referencias,
+                                   args.cache, args.lote, args.modelo, usar_llm=not args.sem_llm)
+    except FileNotFoundError:
+        print(f"❌ ERRO: O arquivo '{args.entrada}' não foi encontrado.")
+        return None
+    except ValueError as erro:
+        # Configuração inválida, como a falta da GROQ_API_KEY (a mensagem sugere o --sem-llm)
+        print(f"❌ ERRO: {erro}")
+        return None
@@ -0,0 +1,143 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+from ..armazenamento import ESQUEMA_COMPARATIVO, exportar_xlsx, gravar_parquet, ler_tabela
+from ..sugestao import mascara_belmicro
+from .cache import CacheComparacoes, chave_par
+from .indice import SIMILARIDADE_SIM, IndiceProdutos
+from .llm import MODELO_PADRAO, ClienteGroq, ErroRespostaLLM
+from .prefiltro import NAO, SIM
+
+COLUNA_COMPARATIVO = 'Comparativo'
+COLUNA_MOTIVO = 'Motivo Comparativo'
+COLUNA_REFERENCIA = 'Termo_Referencia_Belmicro'
+TAMANHO_LOTE = 20
+
+
+def consultar_llm(cliente, pares, tamanho_lote=TAMANHO_LOTE, pausa=0.0):
+    """Classifica os pares em lotes; um lote com erro é dividido ao meio e refeito.
+
+    Devolve uma lista alinhada com `pares` (None onde não houve resposta).
+    """
+    respostas = [None] * len(pares)
+    pendentes = [(inicio, pares[inicio:inicio + tamanho_lote]) for inicio in range(0, len(pares), tamanho_lote)]
+    while pendentes:
+        inicio, lote = pendentes.pop(0)
+        try:
+            respostas[inicio:inicio + len(lote)] = cliente.classificar(lote)
+        except (ErroRespostaLLM, requests.RequestException, KeyError) as erro:
+            if len(lote) == 1:
+                print(f"  -> ⚠️ Sem resposta do LLM para '{lote[0][0][:60]}': {erro}")
+                continue
+            meio = len(lote) // 2
+            pendentes[:0] = [(inicio, lote[:meio]), (inicio + meio, lote[meio:])]
+        if pausa:
+            time.sleep(pausa)
+    return respostas
+
+
+def gerar_comparativo(df, cliente=None, cache=None, coluna_nome='Nome', coluna_referencia=COLUNA_REFERENCIA,
+                      tamanho_lote=TAMANHO_LOTE, referencias=None):
+    """Preenche a coluna Comparativo (SIM/NÃO) comparando cada anúncio com a referência.
+
+    Os pares distintos são classificados em massa pelo índice local (mesmas regras
+    do pré-filtro); os ambíguos são procurados no `cache` e, se faltarem, enviados
+    em lotes ao `cliente` (LLM). Sem cliente, os ambíguos são decididos pela
+    similaridade TF-IDF dos nomes. Se o DataFrame não tiver a coluna de referência,
+    ela é preenchida com a mais parecida entre as `referencias` dadas. Também
+    completa as colunas que a sugestão de preço usa ('Termo Pesquisado' e
+    'Preço Belmicro (R$)').
+    """
+    df = df.copy()
+    if coluna_referencia not in df.columns:
+        if referencias is None:
+            raise KeyError(f"Coluna de referência '{coluna_referencia}' não foi encontrada!")
+        melhores = IndiceProdutos(referencias).buscar(df[coluna_nome]).set_index('posicao')
+        df[coluna_referencia] = melhores['referencia'].reindex(range(len(df))).to_numpy()
+        print(f"🔎 Referência preenchida pelo índice em {len(melhores)} de {len(df)} anúncios.")
+
+    chaves = df[[coluna_nome, coluna_referencia]].astype('string').fillna('')
+    codigos_par, pares = pd.factorize(pd.MultiIndex.from_frame(chaves))
+    pares = pares.to_frame(index=False, name=[coluna_nome, coluna_referencia])
+    avaliacao = IndiceProdutos(pares[coluna_referencia]).classificar(pares[coluna_nome], pares[coluna_referencia])
+    decisoes = avaliacao['decisao'].to_numpy(dtype=object)
+    motivos = avaliacao['motivo'].to_numpy(dtype=object)
+
+    # Só os ambíguos seguem para o cache/LLM, um por par normalizado
+    posicoes_ambiguas = np.flatnonzero(pd.isna(decisoes))
+    ambiguos = {}
+    chaves_ambiguas = []
+    for posicao in posicoes_ambiguas:
+        nome, referencia = pares.iat[posicao, 0], pares.iat[posicao, 1]
+        chave = chave_par(nome, referencia)
+        ambiguos.setdefault(chave, (nome, referencia))
+        chaves_ambiguas.append(chave)
+
+    do_cache = cache.obter_varios(ambiguos) if cache and ambiguos else {}
+    perguntar = [chave for chave in ambiguos if chave not in do_cache]
+    respostas_llm = {}
+    if cliente and perguntar:
+        print(f"🤖 Consultando o LLM para {len(perguntar)} pares ambíguos (lotes de {tamanho_lote})...")
+        respostas = consultar_llm(cliente, [ambiguos[chave] for chave in perguntar], tamanho_lote)
+        respostas_llm = {chave: resposta for chave, resposta in zip(perguntar, respostas) if resposta}
+        if cache and respostas_llm:
+            cache.gravar_varios(respostas_llm, getattr(cliente, 'nome', 'llm'))
+
+    sem_llm = 'semelhança dos nomes (sem LLM)' if cliente is None else 'semelhança dos nomes (LLM falhou)'
+    similaridades = avaliacao['similaridade'].to_numpy()
+    for posicao, chave in zip(posicoes_ambiguas, chaves_ambiguas):
+        if chave in do_cache:
+            decisoes[posicao], motivos[posicao] = do_cache[chave], 'LLM (cache)'
+        elif chave in respostas_llm:
+            decisoes[posicao], motivos[posicao] = respostas_llm[chave], 'LLM'
+        else:
+            decisoes[posicao] = SIM if similaridades[posicao] >= SIMILARIDADE_SIM else NAO
+            motivos[posicao] = sem_llm
+    df[COLUNA_COMPARATIVO] = decisoes[codigos_par]
+    df[COLUNA_MOTIVO] = motivos[codigos_par]
+
+    if 'Termo Pesquisado' not in df.columns:
+        df['Termo Pesquisado'] = df[coluna_referencia]
+    if 'Preço Belmicro (R$)' not in df.columns:
+        # Preço do (primeiro) anúncio da própria Belmicro em cada termo de referência
+        belmicro = df[mascara_belmicro(df)].drop_duplicates(coluna_referencia)
+        df['Preço Belmicro (R$)'] = df[coluna_referencia].map(belmicro.set_index(coluna_referencia)['Preço (R$)'])
+
+    contagem = df[COLUNA_MOTIVO].value_counts()
+    print(f"✅ Comparativo: {len(pares)} pares distintos; {len(pares) - len(posicoes_ambiguas)} decididos pelo "
+          f"índice local, {len(do_cache)} pelo cache, {len(respostas_llm)} pelo LLM.")
+    print(contagem.to_string())
+    return df
+
+
+def executar_comparacao(arquivo_entrada, arquivo_saida, arquivo_xlsx=None, coluna_referencia=COLUNA_REFERENCIA,
+                        arquivo_referencias=None, arquivo_cache=None, tamanho_lote=TAMANHO_LOTE,
+                        modelo=MODELO_PADRAO, usar_llm=True):
+    """Lê os resultados da limpeza, gera o Comparativo e grava o .parquet (e o XLSX opcional).
+
+    O cache das respostas do LLM fica, por padrão, ao lado da saída. Levanta
+    FileNotFoundError se a entrada não existir.
+    """
+    df = ler_tabela(arquivo_entrada)
+    print(f"📂 {len(df)} anúncios lidos de '{arquivo_entrada}'.")
+
+    referencias = ler_tabela(arquivo_referencias, ['Descricao'])['Descricao'] if arquivo_referencias else None
+    cliente = ClienteGroq(modelo=modelo) if usar_llm else None
+    cache = CacheComparacoes(arquivo_cache or os.path.join(os.path.dirname(arquivo_saida), 'cache_comparacoes.sqlite'))
+    try:
+        df = gerar_comparativo(df, cliente=cliente, cache=cache, coluna_referencia=coluna_referencia,
+                               tamanho_lote=tamanho_lote, referencias=referencias)
+    finally:
+        print(cache.resumo())
+        cache.fechar()
+
+    gravar_parquet(df, arquivo_saida, ESQUEMA_COMPARATIVO)
+    print(f"💾 Comparativo salvo em '{arquivo_saida}'.")
+    if arquivo_xlsx:
+        exportar_xlsx(df, arquivo_xlsx)
+        print(f"  -> Cópia em XLSX: '{arquivo_xlsx}'.")
+    return df
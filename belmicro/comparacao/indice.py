@@ -0,0 +1,260 @@
+"""Índice local de produtos para classificar anúncios em massa, sem LLM.
+
+Os nomes de referência da Belmicro são indexados uma vez (tokens normalizados,
+códigos de modelo e capacidades, ver `descrever`), com peso IDF por token. Os
+anúncios são avaliados contra a sua referência de uma vez só, com arrays NumPy:
+cada par (anúncio, referência) vira chaves inteiras `referencia * V + token`
+procuradas com `searchsorted` nas chaves da referência, e as contagens por par
+saem de `bincount`. Sem laço em Python por par.
+
+`classificar` aplica as mesmas regras do pré-filtro (capacidade, código de
+modelo, cobertura dos tokens) e devolve também a similaridade TF-IDF (cobertura
+da referência ponderada pelo IDF), usada para decidir os ambíguos offline.
+`buscar` recupera as referências mais parecidas com cada anúncio, para quando a
+planilha não traz a referência.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .normalizacao import UNIDADES_CAPACIDADE, atributos, codigos_modelo, eh_voltagem, normalizar, tokens
+from .prefiltro import COBERTURA_MINIMA, COBERTURA_SIM, COBERTURA_SIM_COM_CODIGO, NAO, PREFIXO_CODIGO, SIM
+
+# Similaridade TF-IDF a partir da qual um par ambíguo é SIM sem o LLM
+SIMILARIDADE_SIM = 0.75
+
+# Chaves (referência, código) cabem em int64 com folga
+_MULTIPLICADOR = 1 << 32
+_UNIDADE = {unidade: posicao for posicao, unidade in enumerate(UNIDADES_CAPACIDADE)}
+
+
+def _prefixos(codigo):
+    """Prefixos próprios de um código que ainda identificam o modelo (CHA31FBBNA -> CHA31, ...)."""
+    return [codigo[:tamanho] for tamanho in range(PREFIXO_CODIGO, len(codigo))]
+
+
+def _expandir(indptr, linhas):
+    """Para cada linha pedida, as posições dos seus itens num array CSR.
+
+    Devolve (posições dos itens, índice da linha pedida de cada item).
+    """
+    inicios, fins = indptr[linhas], indptr[linhas + 1]
+    tamanhos = fins - inicios
+    dono = np.repeat(np.arange(len(linhas)), tamanhos)
+    deslocamento = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+    return np.repeat(inicios, tamanhos) + deslocamento, dono
+
+
+def _presentes(chaves, ordenadas):
+    """Máscara das chaves que existem no array ordenado."""
+    if not len(ordenadas):
+        return np.zeros(len(chaves), dtype=bool)
+    posicao = np.searchsorted(ordenadas, chaves).clip(max=len(ordenadas) - 1)
+    return ordenadas[posicao] == chaves
+
+
+@lru_cache(maxsize=500_000)
+def _tokens_nome(nome):
+    """Tokens de um nome (memoizado: os mesmos anúncios voltam a cada execução)."""
+    return tokens(normalizar(nome))
+
+
+def _csr(dono, valores, linhas):
+    """indptr + valores de listas por linha, a partir de pares (linha, valor) ordenados por linha."""
+    indptr = np.zeros(linhas + 1, dtype=np.int64)
+    np.cumsum(np.bincount(dono, minlength=linhas), out=indptr[1:])
+    return indptr, np.asarray(valores, dtype=np.int64)
+
+
+class _Tokens:
+    """Tokens de nomes distintos como pares (nome, token) sem repetição.
+
+    Cada nome é normalizado uma vez e cada token distinto é classificado uma vez
+    (voltagem, código de modelo, unidade de capacidade), como em `descrever`.
+    """
+
+    def __init__(self, nomes):
+        listas = [_tokens_nome(nome) for nome in nomes]
+        dono = np.repeat(np.arange(len(listas), dtype=np.int64), [len(lista) for lista in listas])
+        codigos, distintos = pd.factorize(np.array([t for lista in listas for t in lista], dtype=object))
+        pares = np.unique(dono * max(len(distintos), 1) + codigos)
+        self.linhas = len(listas)
+        self.dono, self.token = pares // max(len(distintos), 1), pares % max(len(distintos), 1)
+        self.distintos = pd.Index(distintos, dtype=object)
+        self.voltagem = np.array([eh_voltagem(t) for t in distintos], dtype=bool)
+        self.codigo = np.array([bool(codigos_modelo([t])) for t in distintos], dtype=bool)
+        self.unidade = np.array([_UNIDADE[next(iter(c))] if (c := atributos([t])[0]) else -1 for t in distintos],
+                                dtype=np.int64)
+
+    def unidades(self):
+        """Matriz nome x unidade de capacidade: o nome tem alguma medida nessa unidade."""
+        matriz = np.zeros((self.linhas, len(UNIDADES_CAPACIDADE)), dtype=bool)
+        medida = self.unidade[self.token] >= 0
+        matriz[self.dono[medida], self.unidade[self.token][medida]] = True
+        return matriz
+
+    def tem_codigo(self):
+        return np.bincount(self.dono[self.codigo[self.token]], minlength=self.linhas) > 0
+
+
+class IndiceProdutos:
+    """Índice dos nomes de referência (produtos Belmicro) para comparar anúncios."""
+
+    def __init__(self, referencias):
+        nomes = pd.Series(referencias, dtype='string').dropna().unique()
+        self.referencias = pd.Index(nomes)
+        refs = _Tokens(nomes)
+
+        # Vocabulário: tokens descritivos das referências (voltagem não conta, ver prefiltro)
+        descritivo = ~refs.voltagem[refs.token]
+        dono, token = refs.dono[descritivo], refs.token[descritivo]
+        self._vocabulario = pd.Index(refs.distintos[np.unique(token)], dtype=object)
+        self._ids = self._vocabulario.get_indexer(refs.distintos[token])
+        self._indptr = _csr(dono, self._ids, len(nomes))[0]
+        self._unidade_token = refs.unidade[refs.distintos.get_indexer(self._vocabulario)]
+
+        # IDF suavizado (como no scikit-learn): tokens raros entre as referências pesam mais
+        frequencia = np.bincount(self._ids, minlength=len(self._vocabulario))
+        self.idf = np.log((1 + len(nomes)) / (1 + frequencia)) + 1
+        self._tamanho_ref = np.diff(self._indptr)
+        self._peso_ref = np.bincount(dono, weights=self.idf[self._ids], minlength=len(nomes))
+        self._chaves_tokens = np.sort(dono * len(self._vocabulario) + self._ids)
+        self._unidades_ref = refs.unidades()
+
+        # Códigos de modelo: um código do anúncio é compatível se for igual a um código
+        # da referência ou prefixo dele (e vice-versa), ver `codigos_compativeis`
+        eh_codigo = refs.codigo[refs.token]
+        donos_codigo, codigos = refs.dono[eh_codigo], refs.distintos[refs.token[eh_codigo]]
+        variantes = [(dono, v) for dono, codigo in zip(donos_codigo, codigos) for v in [codigo] + _prefixos(codigo)]
+        self._codigos = pd.Index(sorted({v for _, v in variantes}), dtype=object)
+        self._tem_codigo = refs.tem_codigo()
+        self._chaves_variantes = np.unique(np.array([d for d, _ in variantes], dtype=np.int64) * _MULTIPLICADOR
+                                           + self._codigos.get_indexer([v for _, v in variantes]))
+        self._chaves_exatas = np.unique(donos_codigo * _MULTIPLICADOR + self._codigos.get_indexer(codigos))
+
+        # Lista invertida token -> referências, para `buscar`
+        ordem = np.argsort(self._ids, kind='stable')
+        self._postagens = dono[ordem]
+        self._indptr_postagens = np.zeros(len(self._vocabulario) + 1, dtype=np.int64)
+        np.cumsum(frequencia, out=self._indptr_postagens[1:])
+
+    def __len__(self):
+        return len(self.referencias)
+
+    def _descrever_anuncios(self, nomes):
+        """Arrays CSR dos anúncios distintos: tokens conhecidos e consultas de código."""
+        anuncios = _Tokens(nomes)
+        ids = self._vocabulario.get_indexer(anuncios.distintos)[anuncios.token]
+        conhecido = (ids >= 0) & ~anuncios.voltagem[anuncios.token]
+        tokens = _csr(anuncios.dono[conhecido], ids[conhecido], anuncios.linhas)
+
+        # O código do anúncio é procurado entre os códigos e prefixos da referência;
+        # os prefixos do código do anúncio, entre os códigos exatos da referência
+        eh_codigo = anuncios.codigo[anuncios.token]
+        donos_codigo, codigos = anuncios.dono[eh_codigo], anuncios.distintos[anuncios.token[eh_codigo]]
+        exatos = self._codigos.get_indexer(codigos)
+        consultas = _csr(donos_codigo[exatos >= 0], exatos[exatos >= 0], anuncios.linhas)
+        prefixos = [(dono, p) for dono, codigo in zip(donos_codigo, codigos) for p in _prefixos(codigo)]
+        ids_prefixos = self._codigos.get_indexer([p for _, p in prefixos])
+        donos_prefixos = np.array([d for d, _ in prefixos], dtype=np.int64)
+        variantes = _csr(donos_prefixos[ids_prefixos >= 0], ids_prefixos[ids_prefixos >= 0], anuncios.linhas)
+        return tokens, consultas, variantes, anuncios.unidades(), anuncios.tem_codigo()
+
+    def _casam(self, csr, anuncios, referencias, chaves):
+        """Por par, se algum item do anúncio forma uma chave (referência, item) presente."""
+        indptr, valores = csr
+        posicoes, par = _expandir(indptr, anuncios)
+        presentes = _presentes(referencias[par] * _MULTIPLICADOR + valores[posicoes], chaves)
+        return np.bincount(par[presentes], minlength=len(anuncios)) > 0
+
+    def classificar(self, nomes, referencias):
+        """Classifica pares (nome do anúncio, nome da referência) alinhados.
+
+        Devolve um DataFrame com `decisao` (SIM, NÃO ou None quando ambíguo),
+        `motivo`, `cobertura` (fração dos tokens da referência presentes no anúncio)
+        e `similaridade` (a mesma cobertura ponderada pelo IDF).
+        """
+        nomes = pd.Series(nomes, dtype='string').fillna('').to_numpy()
+        id_ref = self.referencias.get_indexer(pd.Series(referencias, dtype='string').fillna(''))
+        codigos_nome, distintos = pd.factorize(nomes)
+        # Cada par distinto é avaliado uma vez; referência desconhecida fica sem tokens
+        codigos_par, pares = pd.factorize(codigos_nome.astype(np.int64) * (len(self) + 1) + id_ref + 1)
+        anuncio, ref = pares // (len(self) + 1), pares % (len(self) + 1) - 1
+        conhecida = ref >= 0
+        ref = np.where(conhecida, ref, 0)
+
+        tokens, consultas, variantes, unidades, tem_codigo = self._descrever_anuncios(distintos)
+        posicoes, par = _expandir(tokens[0], anuncio)
+        ids = tokens[1][posicoes]
+        presentes = _presentes(ref[par] * len(self._vocabulario) + ids, self._chaves_tokens) & conhecida[par]
+        par, ids = par[presentes], ids[presentes]
+        comuns = np.bincount(par, minlength=len(pares))
+        peso_comum = np.bincount(par, weights=self.idf[ids], minlength=len(pares))
+        tamanho_ref = np.where(conhecida, self._tamanho_ref[ref] if len(self) else 0, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cobertura = np.where(tamanho_ref > 0, comuns / np.maximum(tamanho_ref, 1), 0.0)
+            similaridade = np.where(tamanho_ref > 0, peso_comum / np.maximum(self._peso_ref[ref], 1e-12), 0.0)
+
+        # Capacidade diferente: as duas têm a unidade e nenhum valor em comum
+        unidade = self._unidade_token[ids]
+        medida = unidade >= 0
+        n_unidades = len(UNIDADES_CAPACIDADE)
+        em_comum = np.bincount(par[medida] * n_unidades + unidade[medida],
+                               minlength=len(pares) * n_unidades).reshape(len(pares), n_unidades) > 0
+        capacidade_diferente = (self._unidades_ref[ref] & unidades[anuncio] & ~em_comum).any(axis=1) & conhecida
+
+        com_codigos = tem_codigo[anuncio] & self._tem_codigo[ref] & conhecida
+        compativel = (self._casam(consultas, anuncio, ref, self._chaves_variantes)
+                      | self._casam(variantes, anuncio, ref, self._chaves_exatas))
+
+        condicoes = [
+            capacidade_diferente,
+            com_codigos & ~compativel,
+            com_codigos & (cobertura >= COBERTURA_SIM_COM_CODIGO),
+            com_codigos,
+            cobertura < COBERTURA_MINIMA,
+            cobertura >= COBERTURA_SIM,
+        ]
+        decisoes = np.select(condicoes, [NAO, NAO, SIM, None, NAO, SIM], default=None)
+        motivos = np.select(condicoes, ['capacidade diferente', 'código de modelo diferente',
+                                        'mesmo código de modelo', 'mesmo código, nomes diferentes',
+                                        'nomes pouco parecidos', 'nomes quase iguais'], default='ambíguo')
+        return pd.DataFrame({
+            'decisao': decisoes[codigos_par],
+            'motivo': motivos[codigos_par],
+            'cobertura': cobertura[codigos_par],
+            'similaridade': similaridade[codigos_par],
+        })
+
+    def buscar(self, nomes, k=1):
+        """As `k` referências mais parecidas com cada anúncio (por similaridade TF-IDF).
+
+        Devolve um DataFrame com `posicao` (linha do anúncio em `nomes`),
+        `referencia` e `similaridade`, do mais para o menos parecido; anúncios sem
+        nenhum token em comum com as referências não aparecem.
+        """
+        nomes = pd.Series(nomes, dtype='string').fillna('').to_numpy()
+        codigos_nome, distintos = pd.factorize(nomes)
+        (indptr, ids), *_ = self._descrever_anuncios(distintos)
+        posicoes, anuncio = _expandir(indptr, np.arange(len(distintos)))
+        ids = ids[posicoes]
+        # Cada token do anúncio soma o seu IDF a todas as referências que o contêm
+        postagens, entrada = _expandir(self._indptr_postagens, ids)
+        ref = self._postagens[postagens]
+        chave_par, pares = pd.factorize(anuncio[entrada].astype(np.int64) * len(self) + ref)
+        pontos = np.bincount(chave_par, weights=self.idf[ids[entrada]], minlength=len(pares))
+        candidato, ref = pares // len(self), pares % len(self)
+        similaridade = pontos / self._peso_ref[ref]
+
+        ordem = np.lexsort((-similaridade, candidato))
+        candidato, ref, similaridade = candidato[ordem], ref[ordem], similaridade[ordem]
+        primeira = np.r_[True, candidato[1:] != candidato[:-1]]
+        inicio = np.maximum.accumulate(np.where(primeira, np.arange(len(candidato)), 0))
+        manter = np.arange(len(candidato)) - inicio < k
+        melhores = pd.DataFrame({'candidato': candidato[manter], 'referencia': self.referencias[ref[manter]],
+                                 'similaridade': similaridade[manter]})
+
+        linhas = pd.DataFrame({'posicao': np.arange(len(nomes)), 'candidato': codigos_nome})
+        return linhas.merge(melhores, on='candidato').drop(columns='candidato')
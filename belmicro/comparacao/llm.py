@@ -0,0 +1,82 @@
+"""Cliente de LLM para os pares que o pré-filtro não decide.
+
+Qualquer objeto com `classificar(pares) -> ['SIM' | 'NÃO', ...]` serve de cliente
+(um stub local, por exemplo); ClienteGroq é o usado em produção. Os pares vão em
+lotes num único prompt, e a resposta é um JSON com uma decisão por par.
+"""
+
+import json
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .prefiltro import NAO, SIM
+
+URL_GROQ = 'https://api.groq.com/openai/v1/chat/completions'
+MODELO_PADRAO = 'llama-3.1-8b-instant'
+
+INSTRUCOES = (
+    "Você compara anúncios da Shopee com produtos da Belmicro. Para cada par numerado, "
+    "responda SIM se o anúncio é o mesmo produto (mesma marca, modelo e capacidade; a "
+    "voltagem pode ser diferente) e NÃO caso contrário (outro modelo, outra capacidade, "
+    "acessório, peça ou kit). Responda apenas com JSON no formato "
+    '{"respostas": ["SIM", "NÃO", ...]}, uma resposta por par, na mesma ordem.'
+)
+
+
+class ErroRespostaLLM(ValueError):
+    """Resposta do LLM fora do formato combinado (JSON inválido ou quantidade errada)."""
+
+
+def montar_prompt(pares):
+    linhas = [f"{i}. Anúncio: {nome} | Belmicro: {referencia}" for i, (nome, referencia) in enumerate(pares, 1)]
+    return "\n".join(linhas)
+
+
+def interpretar_resposta(conteudo, quantidade):
+    """Lista de SIM/NÃO a partir do JSON devolvido pelo modelo."""
+    try:
+        respostas = json.loads(conteudo)["respostas"]
+    except (json.JSONDecodeError, KeyError, TypeError) as erro:
+        raise ErroRespostaLLM(f"Resposta fora do formato: {conteudo[:200]!r}") from erro
+    if not isinstance(respostas, list) or len(respostas) != quantidade:
+        raise ErroRespostaLLM(f"Esperava {quantidade} respostas, veio {respostas!r}"[:300])
+    return [SIM if str(r).strip().upper().startswith('S') else NAO for r in respostas]
+
+
+class ClienteGroq:
+    """Classificação de pares pela API da Groq (compatível com a da OpenAI)."""
+
+    nome = 'groq'
+
+    def __init__(self, chave=None, modelo=MODELO_PADRAO, timeout=60, url=URL_GROQ):
+        self.chave = chave or os.environ.get('GROQ_API_KEY')
+        if not self.chave:
+            raise ValueError("Defina a variável de ambiente GROQ_API_KEY (ou rode com --sem-llm).")
+        self.modelo = modelo
+        self.timeout = timeout
+        self.url = url
+        self.chamadas = 0
+        self.sessao = requests.Session()
+        # 429/5xx: espera e tenta de novo (a Groq devolve Retry-After)
+        tentativas = Retry(total=4, backoff_factor=2, status_forcelist=(429, 500, 502, 503, 504),
+                           allowed_methods=frozenset(['POST']))
+        self.sessao.mount('https://', HTTPAdapter(max_retries=tentativas))
+        self.sessao.headers.update({'Authorization': f'Bearer {self.chave}'})
+
+    def classificar(self, pares):
+        self.chamadas += 1
+        resposta = self.sessao.post(self.url, timeout=self.timeout, json={
+            'model': self.modelo,
+            'temperature': 0,
+            'response_format': {'type': 'json_object'},
+            'messages': [
+                {'role': 'system', 'content': INSTRUCOES},
+                {'role': 'user', 'content': montar_prompt(pares)},
+            ],
+        })
+        resposta.raise_for_status()
+        conteudo = resposta.json()['choices'][0]['message']['content']
+        return interpretar_resposta(conteudo, len(pares))
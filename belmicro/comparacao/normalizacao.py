@@ -0,0 +1,93 @@
+"""Normalização de nomes de produto para comparação.
+
+Nomes de anúncio e da Belmicro variam muito na escrita ("1,7 Litros" x "1.7L",
+"Micro-ondas" x "Microondas", caixa, acentos). Aqui eles viram tokens comparáveis e
+são extraídos os atributos que decidem se dois anúncios são o mesmo produto:
+códigos de modelo (CMA20BB, MFV5BB), capacidade (litros, kg) e voltagem.
+"""
+
+import re
+import unicodedata
+
+# Palavras que não ajudam a distinguir produtos
+PALAVRAS_VAZIAS = frozenset("""
+    a o as os de da do das dos e em com para por sem no na nos nas um uma
+    cor cores novo nova original oficial promocao oferta frete gratis envio imediato
+    kit 1 x
+""".split())
+
+# Unidades: o número e a unidade viram um token só ("1,7 Litros" -> "1.7l")
+_UNIDADES = [
+    (r'l(?:itros?|ts?)?', 'l'),
+    (r'kg|quilos?', 'kg'),
+    (r'w(?:atts?)?', 'w'),
+    (r'v(?:olts?)?', 'v'),
+    (r'ml', 'ml'),
+    (r'cm', 'cm'),
+    (r'bocas?', 'bocas'),
+    (r'portas?', 'portas'),
+    (r'garrafas?', 'garrafas'),
+]
+_PADRAO_UNIDADE = re.compile(
+    r'(?<![a-z0-9])(\d+(?:[.,]\d+)?)\s*(' + '|'.join(f'(?:{p})' for p, _ in _UNIDADES) + r')(?![a-z])'
+)
+_CANONICA = [(re.compile(f'^(?:{p})$'), u) for p, u in _UNIDADES]
+
+_PADRAO_TOKEN = re.compile(r'[a-z0-9]+(?:\.[0-9]+)?[a-z]*')
+# Código de modelo: ao menos 2 letras e 2 dígitos misturados (CMA20BB, BLR04, PAD24DZ)
+_PADRAO_CODIGO = re.compile(r'^(?=(?:[a-z0-9]*[a-z]){2})(?=(?:[a-z0-9]*[0-9]){2})[a-z0-9]{4,}$')
+_PADRAO_MEDIDA = re.compile(r'^\d+(?:\.\d+)?(l|kg|w|v|ml|cm|bocas|portas|garrafas)$')
+# Medidas que distinguem produtos (voltagem não: o mesmo modelo sai em 127V e 220V)
+UNIDADES_CAPACIDADE = ('l', 'kg', 'bocas', 'portas', 'garrafas')
+_VOLTAGENS = {'110v': '127v', '127v': '127v', '220v': '220v', 'bivolt': 'bivolt'}
+
+
+def _sem_acentos(texto):
+    if texto.isascii():
+        return texto
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+
+
+def _unidade(encontrado):
+    numero = encontrado.group(1).replace(',', '.')
+    if '.' in numero:
+        numero = numero.rstrip('0').rstrip('.')
+    unidade = encontrado.group(2)
+    for padrao, canonica in _CANONICA:
+        if padrao.match(unidade):
+            return f' {numero}{canonica} '
+    return encontrado.group(0)
+
+
+def normalizar(texto):
+    """Minúsculas, sem acento, hífens colados e medidas no formato '1.7l'."""
+    texto = _sem_acentos(str(texto)).lower()
+    if '-' in texto:
+        texto = re.sub(r'(?<=[a-z])-(?=[a-z])', '', texto)  # micro-ondas -> microondas
+    texto = _PADRAO_UNIDADE.sub(_unidade, texto)
+    return ' '.join(_PADRAO_TOKEN.findall(texto))
+
+
+def tokens(texto_normalizado):
+    """Tokens relevantes (sem palavras vazias) de um texto já normalizado."""
+    return [t for t in texto_normalizado.split() if t not in PALAVRAS_VAZIAS]
+
+
+def codigos_modelo(lista_tokens):
+    """Tokens que parecem código de modelo (mistura de letras e dígitos, sem ser medida)."""
+    return {t for t in lista_tokens if _PADRAO_CODIGO.match(t) and not _PADRAO_MEDIDA.match(t)}
+
+
+def atributos(lista_tokens):
+    """Capacidades por unidade ({'l': {'20l'}, 'bocas': {'5bocas'}}) e voltagens do nome."""
+    capacidades = {}
+    for t in lista_tokens:
+        medida = _PADRAO_MEDIDA.match(t)
+        if medida and medida.group(1) in UNIDADES_CAPACIDADE:
+            capacidades.setdefault(medida.group(1), set()).add(t)
+    voltagem = {_VOLTAGENS[t] for t in lista_tokens if t in _VOLTAGENS}
+    return capacidades, voltagem
+
+
+def eh_voltagem(token):
+    return token in _VOLTAGENS or bool(_PADRAO_MEDIDA.match(token)) and token.endswith('v')
@@ -0,0 +1,75 @@
+"""Pré-filtro local: decide os pares óbvios sem chamar o LLM.
+
+Cada par (nome do anúncio, nome de referência da Belmicro) recebe SIM, NÃO ou
+None (ambíguo, vai para o LLM), com o motivo:
+
+- capacidade diferente (20L x 30L, 4 x 5 bocas)         -> NÃO
+- códigos de modelo incompatíveis (CCV315 x CCV215)     -> NÃO
+- mesmo código de modelo (CHA31FB ~ CHA31FBBNA) e nomes
+  parecidos                                               -> SIM
+- poucos tokens da referência no anúncio                 -> NÃO
+- quase todos os tokens da referência no anúncio         -> SIM
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from .normalizacao import atributos, codigos_modelo, eh_voltagem, normalizar, tokens
+
+SIM = 'SIM'
+NAO = 'NÃO'
+
+# Fração dos tokens da referência presentes no anúncio
+COBERTURA_MINIMA = 0.45
+COBERTURA_SIM = 0.9
+COBERTURA_SIM_COM_CODIGO = 0.6
+# Prefixo mínimo para dois códigos serem variações do mesmo modelo (CHA31FB ~ CHA31FBBNA)
+PREFIXO_CODIGO = 5
+
+Descricao = namedtuple('Descricao', 'normalizado tokens codigos capacidades voltagens')
+
+
+@lru_cache(maxsize=200_000)
+def descrever(texto):
+    """Tokens, códigos de modelo e capacidades de um nome (memoizado por texto)."""
+    normalizado = normalizar(texto)
+    lista = tokens(normalizado)
+    capacidades, voltagens = atributos(lista)
+    # Voltagem não entra na comparação de nomes: o mesmo modelo sai em 127V e 220V
+    descritivos = frozenset(t for t in lista if not eh_voltagem(t))
+    return Descricao(normalizado, descritivos, frozenset(codigos_modelo(lista)), capacidades, frozenset(voltagens))
+
+
+def codigos_compativeis(codigo_a, codigo_b):
+    curto, longo = sorted((codigo_a, codigo_b), key=len)
+    return longo.startswith(curto) and len(curto) >= PREFIXO_CODIGO or curto == longo
+
+
+def capacidade_diferente(anuncio, referencia):
+    return any(unidade in anuncio.capacidades and anuncio.capacidades[unidade].isdisjoint(valores)
+               for unidade, valores in referencia.capacidades.items())
+
+
+def cobertura(anuncio, referencia):
+    if not referencia.tokens:
+        return 0.0
+    return len(anuncio.tokens & referencia.tokens) / len(referencia.tokens)
+
+
+def classificar_par(nome, referencia):
+    """(SIM | NÃO | None, motivo) para um par de nomes."""
+    anuncio, ref = descrever(nome), descrever(referencia)
+    if capacidade_diferente(anuncio, ref):
+        return NAO, 'capacidade diferente'
+    fracao = cobertura(anuncio, ref)
+    if anuncio.codigos and ref.codigos:
+        if not any(codigos_compativeis(a, b) for a in anuncio.codigos for b in ref.codigos):
+            return NAO, 'código de modelo diferente'
+        if fracao >= COBERTURA_SIM_COM_CODIGO:
+            return SIM, 'mesmo código de modelo'
+        return None, 'mesmo código, nomes diferentes'
+    if fracao < COBERTURA_MINIMA:
+        return NAO, 'nomes pouco parecidos'
+    if fracao >= COBERTURA_SIM:
+        return SIM, 'nomes quase iguais'
+    return None, 'ambíguo'
@@ -0,0 +1,135 @@
+"""Estratégias de preço sugerido, aplicadas por termo de forma vetorizada.
+
+Uma estratégia é uma função que recebe os candidatos de todos os termos de uma vez
+(DataFrame com as colunas `termo`, `preco`, `avaliacao`, `vendidos` e
+`eh_belmicro`) e devolve uma Series termo -> preço sugerido. Os candidatos são os
+anúncios aprovados dos concorrentes mais uma linha por termo com o preço de
+referência da Belmicro (`eh_belmicro=True`).
+
+As estratégias prontas ficam em ESTRATEGIAS, pelo nome usado no relatório; as
+fábricas (enesimo_menor, percentil, ...) criam variações com outros parâmetros.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_CANDIDATOS = ["termo", "preco", "avaliacao", "vendidos", "eh_belmicro"]
+
+
+def _concorrentes(candidatos):
+    return candidatos[~candidatos["eh_belmicro"] & candidatos["preco"].notna()]
+
+
+def _mediana_ponderada(candidatos, pesos):
+    """Preço em que o peso acumulado (ordenado por preço) passa da metade, por termo."""
+    dados = pd.DataFrame({"termo": candidatos["termo"], "preco": candidatos["preco"], "peso": pesos})
+    dados = dados[dados["peso"] > 0].sort_values(["termo", "preco"], kind="stable")
+    acumulado = dados.groupby("termo")["peso"].cumsum()
+    metade = dados.groupby("termo")["peso"].transform("sum") / 2
+    return dados[acumulado >= metade].drop_duplicates("termo").set_index("termo")["preco"]
+
+
+def enesimo_menor(n=3):
+    """N-ésimo menor preço distinto (Belmicro incluída); com menos de N, o maior."""
+    def estrategia(candidatos):
+        precos = candidatos[candidatos["preco"].notna()].drop_duplicates(["termo", "preco"])
+        posicao = precos.groupby("termo")["preco"].rank(method="first")
+        alvo = precos.groupby("termo")["preco"].transform("size").clip(upper=n)
+        return precos[posicao == alvo].set_index("termo")["preco"]
+    estrategia.__name__ = f"enesimo_menor_{n}"
+    return estrategia
+
+
+def percentil(p=25):
+    """Percentil p dos preços dos concorrentes (robusto a anúncios fora da curva)."""
+    def estrategia(candidatos):
+        return _concorrentes(candidatos).groupby("termo")["preco"].quantile(p / 100)
+    estrategia.__name__ = f"percentil_{p}"
+    return estrategia
+
+
+def ponderado_avaliacao(expoente=2.0, avaliacao_minima=1.0):
+    """Média dos preços dos concorrentes ponderada pela avaliação da loja.
+
+    Lojas bem avaliadas pesam mais (avaliacao ** expoente); anúncios sem avaliação
+    contam com a avaliação mínima.
+    """
+    def estrategia(candidatos):
+        concorrentes = _concorrentes(candidatos)
+        pesos = concorrentes["avaliacao"].fillna(avaliacao_minima).clip(lower=avaliacao_minima) ** expoente
+        soma = (concorrentes["preco"] * pesos).groupby(concorrentes["termo"]).sum()
+        return (soma / pesos.groupby(concorrentes["termo"]).sum()).round(2)
+    estrategia.__name__ = "ponderado_avaliacao"
+    return estrategia
+
+
+def undercut_volume(desconto=0.01):
+    """Um pouco abaixo do preço em que se concentram as vendas dos concorrentes.
+
+    Usa a mediana dos preços ponderada por `Vendidos` (+1, para anúncios novos
+    também contarem) e aplica o desconto.
+    """
+    def estrategia(candidatos):
+        concorrentes = _concorrentes(candidatos)
+        pesos = concorrentes["vendidos"].fillna(0).clip(lower=0) + 1
+        return (_mediana_ponderada(concorrentes, pesos) * (1 - desconto)).round(2)
+    estrategia.__name__ = f"undercut_volume_{desconto:g}"
+    return estrategia
+
+
+def sem_outliers(estrategia, fator=1.5):
+    """Aplica a estratégia só aos preços dentro das cercas de Tukey (IQR) do termo."""
+    def filtrada(candidatos):
+        precos = candidatos.groupby("termo")["preco"]
+        q1, q3 = precos.transform("quantile", 0.25), precos.transform("quantile", 0.75)
+        margem = (q3 - q1) * fator
+        dentro = candidatos["preco"].between(q1 - margem, q3 + margem) | candidatos["preco"].isna()
+        return estrategia(candidatos[dentro])
+    filtrada.__name__ = f"{estrategia.__name__}_sem_outliers"
+    return filtrada
+
+
+ESTRATEGIA_PADRAO = "3º menor"
+
+ESTRATEGIAS = {
+    "3º menor": enesimo_menor(3),
+    "2º menor": enesimo_menor(2),
+    "menor": enesimo_menor(1),
+    "percentil 25": percentil(25),
+    "mediana": percentil(50),
+    "ponderado por avaliação": ponderado_avaliacao(),
+    "undercut por volume": undercut_volume(0.01),
+    "3º menor sem outliers": sem_outliers(enesimo_menor(3)),
+}
+
+
+def obter_estrategia(estrategia):
+    """Aceita o nome de uma estratégia registrada ou a própria função."""
+    if callable(estrategia):
+        return estrategia
+    try:
+        return ESTRATEGIAS[estrategia]
+    except KeyError:
+        raise KeyError(f"Estratégia '{estrategia}' não existe. Opções: {', '.join(ESTRATEGIAS)}") from None
+
+
+def aplicar_estrategias(candidatos, estrategias):
+    """Roda várias estratégias sobre os mesmos candidatos: DataFrame termo x estratégia."""
+    termos = pd.Index(candidatos["termo"].unique())
+    colunas = {}
+    for nome in estrategias:
+        resultado = obter_estrategia(nome)(candidatos)
+        colunas[nome if isinstance(nome, str) else nome.__name__] = resultado.reindex(termos).astype(float)
+    return pd.DataFrame(colunas, index=termos)
+
+
+def comparar_estrategias(sugestoes, preco_belmicro):
+    """Resumo lado a lado: cobertura e diferença média para o preço atual da Belmicro."""
+    preco_belmicro = preco_belmicro.reindex(sugestoes.index)
+    diferenca = sugestoes.sub(preco_belmicro, axis=0).div(preco_belmicro, axis=0) * 100
+    return pd.DataFrame({
+        "Termos com sugestão": sugestoes.notna().sum(),
+        "Preço médio sugerido": sugestoes.mean().round(2),
+        "Diferença média p/ Belmicro (%)": diferenca.mean().round(2),
+        "Termos abaixo da Belmicro": (sugestoes.lt(preco_belmicro, axis=0)).sum(),
+    }).replace([np.inf, -np.inf], np.nan)
@@ -0,0 +1,208 @@
+"""Etapa 3 do pipeline como funções: lê o comparativo e grava o relatório de sugestão.
+
+`executar_sugestao(config)` faz o mesmo que o script `sujestao_preço.py` (que só
+monta a ConfigSugestao com as constantes do topo e chama esta função), sem
+`exit()`: arquivo de entrada ausente levanta FileNotFoundError e coluna
+obrigatória ausente levanta KeyError. Cada passo também pode ser chamado sozinho.
+"""
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .armazenamento import (ESQUEMA_IMPRESSOES, ESQUEMA_RELATORIO, ESQUEMA_VARIACOES, gravar_parquet,
+                            ler_parquet, ler_tabela)
+from .estrategias import comparar_estrategias
+from .historico import JANELA_MEDIANA_DIAS, HistoricoPrecos, precos_medianos
+from .incremental import atualizar_sugestoes, impressoes_termos, variacoes_precos
+from .numeros import converter_precos
+from .produtos import ids_produtos
+from .relatorio import (AMARELO, ESTILO_CENTRO, ESTILO_DESTAQUE, escrever_aba, formatar_reais, novo_workbook,
+                        salvar_workbook)
+from .sugestao import (COLUNA_ANALISE, PREFIXO_COMPARADA, SEPARADOR, VENDEDOR_BELMICRO, gerar_sugestoes,
+                       sugestoes_por_termo)
+
+ESTRATEGIA = "3º menor"
+ESTRATEGIAS_COMPARADAS = ("percentil 25", "ponderado por avaliação", "undercut por volume")
+
+
+@dataclass
+class ConfigSugestao:
+    """Arquivos e opções da etapa de sugestão de preço."""
+
+    # Produtos com a coluna Comparativo (.parquet da comparação ou .xlsx feito à mão)
+    arquivo_entrada: str
+    # Relatório tipado (Parquet) para as próximas análises
+    arquivo_saida_dados: str
+    # Relatório formatado para leitura (XLSX); None para não gerar
+    arquivo_saida: str = None
+    # Modo incremental: impressões digitais por termo e variações desde o relatório anterior
+    modo_incremental: bool = True
+    arquivo_impressoes: str = None
+    arquivo_variacoes: str = None
+    # Histórico de preços do robô; "atual" usa a última coleta, "mediana" (opcional) a mediana da janela
+    arquivo_historico: str = None
+    preco_referencia: str = "atual"
+    janela_mediana_dias: float = JANELA_MEDIANA_DIAS
+    coluna_analise: str = COLUNA_ANALISE
+    estrategia: str = ESTRATEGIA
+    estrategias_comparadas: tuple = ESTRATEGIAS_COMPARADAS
+
+    def __post_init__(self):
+        pasta = os.path.dirname(self.arquivo_saida_dados)
+        if self.arquivo_impressoes is None:
+            self.arquivo_impressoes = os.path.join(pasta, 'relatorio_sugestao_termos.parquet')
+        if self.arquivo_variacoes is None:
+            self.arquivo_variacoes = os.path.join(pasta, 'variacoes_precos.parquet')
+        self.estrategias_comparadas = tuple(self.estrategias_comparadas)
+
+
+def ler_entrada(caminho):
+    """Lê o comparativo e converte as colunas de preço em float."""
+    print(f"📂 Lendo planilha: {caminho}")
+    df = ler_tabela(caminho)
+    print("🧹 Limpando e corrigindo todos os preços...")
+    df["Preço (R$)"] = converter_precos(df.get("Preço (R$)", pd.Series(np.nan, index=df.index)))
+    df["Preço Belmicro (R$)"] = converter_precos(df.get("Preço Belmicro (R$)", pd.Series(np.nan, index=df.index)))
+    print("✅ Preços corrigidos e normalizados para float.")
+    return df
+
+
+def aplicar_historico(df, caminho, preco_referencia="atual", dias=JANELA_MEDIANA_DIAS):
+    """Usa o histórico de preços: mudanças de preço dos produtos da entrada e, se pedida, a mediana da janela.
+
+    Devolve (df, eventos); sem histórico, o df volta igual e eventos é None.
+    """
+    if not caminho or not os.path.exists(caminho):
+        return df, None
+    historico = HistoricoPrecos(caminho)
+    try:
+        print(historico.resumo())
+        if preco_referencia == "mediana":
+            medianas = historico.medianas(dias)
+            df = df.assign(**{"Preço (R$)": precos_medianos(df, medianas)})
+            print(f"📐 Preços dos concorrentes pela mediana de {dias} dias ({len(medianas)} produtos no histórico).")
+        # Mudanças de preço da janela, só dos produtos desta entrada
+        produtos = ids_produtos(df["URL"].to_numpy()).assign(URL=df["URL"].to_numpy()).drop_duplicates(["loja", "item"])
+        eventos = historico.eventos(dias=dias).merge(produtos, on=["loja", "item"])
+        print(f"📉 {len(eventos)} mudanças de preço nos últimos {dias} dias ({(eventos['variacao'] < 0).sum()} quedas).")
+    finally:
+        historico.fechar()
+    return df, eventos
+
+
+def gerar_relatorio(df, config, anterior=None, impressoes_anteriores=None):
+    """Relatório de sugestão (inteiro, ou incremental se houver o relatório anterior).
+
+    Devolve (relatório, impressões por termo). Levanta KeyError se faltar coluna.
+    """
+    print("📊 Gerando relatório de sugestão de preço...")
+    if anterior is not None:
+        relatorio, impressoes, recalculados = atualizar_sugestoes(
+            df, anterior, impressoes_anteriores, coluna_analise=config.coluna_analise,
+            estrategia=config.estrategia, comparar=config.estrategias_comparadas)
+        print(f"🔁 Modo incremental: {len(recalculados)} de {len(impressoes)} termos recalculados "
+              f"(os demais vieram do relatório anterior).")
+    else:
+        relatorio = gerar_sugestoes(df, coluna_analise=config.coluna_analise,
+                                    estrategia=config.estrategia, comparar=config.estrategias_comparadas)
+        impressoes = impressoes_termos(df, coluna_analise=config.coluna_analise,
+                                       configuracao=(config.coluna_analise, config.estrategia,
+                                                     config.estrategias_comparadas))
+    print(f" -> {relatorio['Termo Pesquisado (produto belmicro)'].eq(SEPARADOR).sum()} termos com produtos "
+          f"aprovados ('SIM') analisados.")
+    return relatorio, impressoes
+
+
+def comparar_relatorio(relatorio, estrategia=ESTRATEGIA):
+    """Comparação das estratégias no conjunto inteiro (uma linha por estratégia)."""
+    sugestoes, precos_belmicro = sugestoes_por_termo(relatorio)
+    comparacao = comparar_estrategias(sugestoes.rename(columns={"Preço Sugerido": estrategia}), precos_belmicro)
+    comparacao.index = [nome.removeprefix(PREFIXO_COMPARADA) for nome in comparacao.index]
+    return comparacao
+
+
+def gravar_planilha(caminho, relatorio, comparacao, estrategia=ESTRATEGIA, variacoes=None, eventos=None):
+    """Relatório formatado em XLSX (modo write-only), com as abas de variações e eventos se houver."""
+    print("💾 Salvando planilha final formatada...")
+    # Renomeia as colunas de preço para a formatação final
+    relatorio = relatorio.rename(columns={
+        "Preço Concorrente": "Preço Concorrente (R$)",
+        "Preço Belmicro Atual": "Preço Belmicro (R$)",
+        "Preço Sugerido": "Preço Sugerido (R$)"
+    })
+
+    # Formata as colunas de preço para texto (R$)
+    colunas_preco = (["Preço Concorrente (R$)", "Preço Belmicro (R$)"]
+                     + [c for c in relatorio.columns if c.startswith(PREFIXO_COMPARADA)])
+    for coluna in colunas_preco:
+        relatorio[coluna] = formatar_reais(relatorio[coluna])
+    relatorio["Preço Sugerido (R$)"] = formatar_reais(relatorio["Preço Sugerido (R$)"], sufixo=f" ({estrategia})")
+
+    # Estilos nomeados por coluna, linha da Belmicro em amarelo por formatação
+    # condicional e larguras calculadas pelo DataFrame
+    estilos = {coluna: ESTILO_CENTRO for coluna in colunas_preco}
+    estilos["Preço Sugerido (R$)"] = ESTILO_DESTAQUE
+
+    wb = novo_workbook()
+    escrever_aba(wb, "Relatorio_Final", relatorio, estilos_colunas=estilos,
+                 destacar_linhas=("Vendedor Concorrente", VENDEDOR_BELMICRO, AMARELO))
+    escrever_aba(wb, "Comparacao_Estrategias", comparacao.rename_axis("Estratégia"), incluir_indice=True)
+    if variacoes is not None:
+        # Aba do delta: só os preços que mudaram desde o relatório anterior
+        variacoes = variacoes.copy()
+        for coluna in ["Preço Anterior", "Preço Atual", "Variação (R$)"]:
+            variacoes[coluna] = formatar_reais(variacoes[coluna])
+        escrever_aba(wb, "Variacoes_Precos", variacoes,
+                     estilos_colunas={"Preço Anterior": ESTILO_CENTRO, "Preço Atual": ESTILO_CENTRO,
+                                      "Variação (R$)": ESTILO_CENTRO})
+    if eventos is not None:
+        # Aba das mudanças de preço registradas no histórico (quem baixou/subiu e quando)
+        eventos = pd.DataFrame({
+            "Termo Pesquisado": eventos["termo"],
+            "Vendedor": eventos["vendedor"],
+            "Data": pd.to_datetime(eventos["coletado_em"], unit="s").dt.strftime("%d/%m/%Y %H:%M"),
+            "Preço Anterior": formatar_reais(eventos["preco_anterior"]),
+            "Preço Novo": formatar_reais(eventos["preco"]),
+            "Variação (%)": (eventos["variacao"] * 100).round(2),
+            "URL": eventos["URL"],
+        })
+        escrever_aba(wb, "Eventos_Precos", eventos,
+                     estilos_colunas={"Preço Anterior": ESTILO_CENTRO, "Preço Novo": ESTILO_CENTRO})
+    salvar_workbook(wb, caminho)
+    print(f"✅ Relatório gerado com sucesso: {caminho}")
+
+
+def executar_sugestao(config):
+    """Roda a etapa inteira e devolve o relatório (valores numéricos)."""
+    df = ler_entrada(config.arquivo_entrada)
+    df, eventos = aplicar_historico(df, config.arquivo_historico, config.preco_referencia,
+                                    config.janela_mediana_dias)
+
+    anterior = impressoes_anteriores = None
+    if (config.modo_incremental and os.path.exists(config.arquivo_saida_dados)
+            and os.path.exists(config.arquivo_impressoes)):
+        anterior = ler_parquet(config.arquivo_saida_dados)
+        impressoes_anteriores = ler_parquet(config.arquivo_impressoes).set_index("termo")["impressao"]
+    relatorio, impressoes = gerar_relatorio(df, config, anterior, impressoes_anteriores)
+
+    comparacao = comparar_relatorio(relatorio, config.estrategia)
+    print("📈 Estratégias de preço comparadas:")
+    print(comparacao.to_string())
+
+    # Variações de preço desde o relatório anterior (antes de sobrescrevê-lo)
+    variacoes = None
+    if anterior is not None:
+        variacoes = variacoes_precos(anterior, relatorio)
+        print(f"📉 {len(variacoes)} preços mudaram desde o relatório anterior: "
+              f"{variacoes['Situação'].value_counts().to_dict()}")
+        gravar_parquet(variacoes, config.arquivo_variacoes, ESQUEMA_VARIACOES)
+
+    gravar_parquet(relatorio, config.arquivo_saida_dados, ESQUEMA_RELATORIO)
+    gravar_parquet(impressoes.reset_index(), config.arquivo_impressoes, ESQUEMA_IMPRESSOES)
+    print(f"💾 Relatório (dados) salvo em: {config.arquivo_saida_dados}")
+    if config.arquivo_saida:
+        gravar_planilha(config.arquivo_saida, relatorio, comparacao, config.estrategia, variacoes, eventos)
+    return relatorio
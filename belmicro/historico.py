@@ -0,0 +1,179 @@
+"""Histórico de preços (SQLite, só acréscimo) alimentado pelo robô de coleta.
+
+Cada produto extraído vira uma observação (termo, loja, item, coletado_em, preço,
+vendedor); nada é sobrescrito, então dá para acompanhar quem está baixando preço
+ao longo do tempo. A chave primária (termo, loja, item, coletado_em) é o índice
+agrupado da tabela (WITHOUT ROWID): o último preço, os extremos numa janela e as
+mudanças de preço de um produto são leituras em sequência.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from .numeros import converter_precos
+from .produtos import ids_produtos
+
+DIA = 24 * 3600
+JANELA_MEDIANA_DIAS = 7
+CHAVE = ['termo', 'loja', 'item']
+
+
+class HistoricoPrecos:
+    """Histórico de preços por (termo, loja, item), gravado só por acréscimo."""
+
+    def __init__(self, caminho):
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        # Com WAL, NORMAL não corrompe o banco numa queda; só pode perder a última gravação
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS precos (
+                termo TEXT NOT NULL,
+                loja TEXT NOT NULL,
+                item TEXT NOT NULL,
+                coletado_em REAL NOT NULL,
+                preco REAL NOT NULL,
+                vendedor TEXT,
+                PRIMARY KEY (termo, loja, item, coletado_em)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_precos_data ON precos (coletado_em);
+        """)
+        self.conexao.commit()
+
+    def registrar(self, termo, produtos, coletado_em=None):
+        """Acrescenta os produtos (dicts do robô) de um termo; devolve quantos entraram."""
+        if not produtos:
+            return 0
+        df = pd.DataFrame([{'URL': dados.get('URL', ''), 'Preço (R$)': dados.get('Preço (R$)'),
+                            'Vendedor': dados.get('Vendedor')} for dados in produtos])
+        return self.importar(df.assign(termo=termo), 'termo', coletado_em)
+
+    def importar(self, df, coluna_termo, coletado_em=None):
+        """Acrescenta uma tabela de resultados (colunas URL, Preço (R$), Vendedor).
+
+        Serve também para carregar saídas antigas do robô. Produtos sem preço
+        ficam de fora; repetir a mesma observação (mesmo instante) não duplica.
+        """
+        coletado_em = time.time() if coletado_em is None else coletado_em
+        ids = ids_produtos(df['URL'].to_numpy())
+        linhas = pd.DataFrame({
+            'termo': df[coluna_termo].to_numpy(),
+            'loja': ids['loja'].to_numpy(),
+            'item': ids['item'].to_numpy(),
+            'coletado_em': coletado_em,
+            'preco': converter_precos(df['Preço (R$)'].reset_index(drop=True), corrigir_100x=False).to_numpy(),
+            'vendedor': df['Vendedor'].to_numpy() if 'Vendedor' in df.columns else None,
+        })
+        linhas = linhas[linhas['termo'].notna() & linhas['preco'].notna()]
+        linhas = linhas.astype({'coletado_em': float, 'preco': float}).astype(object)
+        linhas = linhas.where(linhas.notna(), None)
+        with self._trava, self.conexao:
+            antes = self.conexao.total_changes
+            self.conexao.executemany('INSERT OR IGNORE INTO precos VALUES (?, ?, ?, ?, ?, ?)',
+                                     linhas.itertuples(index=False, name=None))
+            return self.conexao.total_changes - antes
+
+    def _consultar(self, sql, parametros=()):
+        with self._trava:
+            return pd.read_sql_query(sql, self.conexao, params=parametros)
+
+    @staticmethod
+    def _filtro(termo, desde=None, ate=None):
+        condicoes, parametros = [], []
+        if termo is not None:
+            condicoes.append('termo = ?')
+            parametros.append(termo)
+        if desde is not None:
+            condicoes.append('coletado_em >= ?')
+            parametros.append(desde)
+        if ate is not None:
+            condicoes.append('coletado_em <= ?')
+            parametros.append(ate)
+        return (' WHERE ' + ' AND '.join(condicoes) if condicoes else ''), parametros
+
+    def ultimos_precos(self, termo=None):
+        """Último preço observado de cada produto (termo, loja, item)."""
+        onde, parametros = self._filtro(termo)
+        # Com MAX(), o SQLite devolve as outras colunas da linha do máximo
+        return self._consultar(
+            'SELECT termo, loja, item, MAX(coletado_em) AS coletado_em, preco, vendedor '
+            f'FROM precos{onde} GROUP BY termo, loja, item', parametros)
+
+    def extremos(self, dias=JANELA_MEDIANA_DIAS, agora=None, termo=None):
+        """Menor e maior preço de cada produto nos últimos `dias`."""
+        agora = time.time() if agora is None else agora
+        onde, parametros = self._filtro(termo, agora - dias * DIA, agora)
+        return self._consultar(
+            'SELECT termo, loja, item, MIN(preco) AS minimo, MAX(preco) AS maximo, COUNT(*) AS observacoes '
+            f'FROM precos{onde} GROUP BY termo, loja, item', parametros)
+
+    def eventos(self, dias=None, agora=None, termo=None):
+        """Mudanças de preço: cada observação com preço diferente da anterior do produto.
+
+        Com `dias`, só as mudanças dos últimos `dias`. A janela funciona em cima
+        do índice de datas; a observação anterior à janela de cada produto vem da
+        chave primária, sem ler o histórico inteiro.
+        """
+        agora = time.time() if agora is None else agora
+        desde = agora - dias * DIA if dias is not None else float('-inf')
+        onde, parametros = self._filtro(termo, desde, agora)
+        eventos = self._consultar(
+            'SELECT termo, loja, item, coletado_em, vendedor, preco_anterior, preco FROM ('
+            '  SELECT termo, loja, item, coletado_em, vendedor, preco, COALESCE(anterior, ('
+            '    SELECT p.preco FROM precos AS p WHERE p.termo = j.termo AND p.loja = j.loja AND p.item = j.item'
+            '    AND p.coletado_em < ? ORDER BY p.coletado_em DESC LIMIT 1)) AS preco_anterior'
+            '  FROM (SELECT *, LAG(preco) OVER (PARTITION BY termo, loja, item ORDER BY coletado_em) AS anterior'
+            f'        FROM precos{onde}) AS j'
+            ') WHERE preco_anterior IS NOT NULL AND preco != preco_anterior ORDER BY coletado_em',
+            [desde] + parametros)
+        eventos['variacao'] = (eventos['preco'] - eventos['preco_anterior']) / eventos['preco_anterior']
+        return eventos
+
+    def medianas(self, dias=JANELA_MEDIANA_DIAS, agora=None, por_termo=False):
+        """Mediana do preço de cada produto nos últimos `dias`.
+
+        Por padrão agrupa por (loja, item): o preço de um anúncio não depende do
+        termo que o encontrou. Com `por_termo`, por (termo, loja, item).
+        """
+        agora = time.time() if agora is None else agora
+        onde, parametros = self._filtro(None, agora - dias * DIA, agora)
+        observacoes = self._consultar(f'SELECT termo, loja, item, preco FROM precos{onde}', parametros)
+        chave = CHAVE if por_termo else CHAVE[1:]
+        return (observacoes.groupby(chave, sort=False)['preco']
+                .agg(mediana='median', observacoes='size').reset_index())
+
+    def vendedores(self):
+        """Nome mais recente de cada loja: {id da loja: vendedor}."""
+        with self._trava:
+            linhas = self.conexao.execute(
+                "SELECT loja, vendedor, MAX(coletado_em) FROM precos "
+                "WHERE loja != '' AND vendedor IS NOT NULL AND vendedor != 'Não encontrado' GROUP BY loja"
+            ).fetchall()
+        return {loja: vendedor for loja, vendedor, _ in linhas}
+
+    def resumo(self):
+        observacoes, produtos, inicio, fim = self.conexao.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT loja || \'.\' || item), MIN(coletado_em), MAX(coletado_em) '
+            'FROM precos').fetchone()
+        if not observacoes:
+            return "🗄️ Histórico de preços vazio."
+        dias = (fim - inicio) / DIA
+        return f"🗄️ Histórico de preços: {observacoes} observações de {produtos} produtos em {dias:.1f} dias."
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def precos_medianos(df, medianas, coluna_url='URL', coluna_preco='Preço (R$)'):
+    """Preço de cada linha trocado pela mediana do histórico do produto (pela URL).
+
+    Linhas cujo produto não está no histórico mantêm o preço atual. `medianas` é
+    a saída de HistoricoPrecos.medianas() (por loja e item).
+    """
+    ids = ids_produtos(df[coluna_url].to_numpy())
+    mediana = ids.merge(medianas[['loja', 'item', 'mediana']], on=['loja', 'item'], how='left')['mediana']
+    return pd.Series(mediana.to_numpy(), index=df.index).fillna(df[coluna_preco]).rename(coluna_preco)
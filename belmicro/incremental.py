@@ -0,0 +1,123 @@
+"""Sugestão de preço incremental: só os termos cuja entrada mudou são recalculados.
+
+Cada termo ganha uma impressão digital (hash das suas linhas de entrada e da
+configuração das estratégias). Numa nova execução, os termos com a mesma
+impressão reaproveitam as linhas do relatório anterior; os demais passam por
+`gerar_sugestoes`, que calcula tudo por termo, então o resultado é igual ao de
+recalcular o relatório inteiro. `variacoes_precos` compara o relatório anterior
+com o novo e lista os preços que mudaram (concorrentes, Belmicro e sugerido).
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .estrategias import ESTRATEGIA_PADRAO
+from .sugestao import (COLUNA_ANALISE, COLUNA_TERMO, SEPARADOR, VENDEDOR_BELMICRO, avaliacao_belmicro,
+                       gerar_sugestoes, mascara_belmicro, referencias_belmicro)
+
+# Colunas de entrada que influenciam o relatório de um termo
+COLUNAS_ENTRADA = ["Nome", "Preço (R$)", "Avaliação Média", "Vendidos", "Vendedor", "Link Loja", "URL",
+                   "Preço Belmicro (R$)"]
+COLUNA_TERMO_RELATORIO = "Termo Pesquisado (produto belmicro)"
+
+SUBIU, CAIU, NOVO, SAIU = "subiu", "caiu", "novo", "saiu"
+
+
+def _sal(configuracao):
+    return np.uint64(int.from_bytes(hashlib.sha1(repr(configuracao).encode()).digest()[:8], 'little'))
+
+
+def impressoes_termos(df, coluna_termo=COLUNA_TERMO, coluna_analise=COLUNA_ANALISE, configuracao=()):
+    """Series termo -> hash (uint64) das linhas de entrada do termo, na ordem em que aparecem."""
+    df = df[df[coluna_termo].notna()]
+    colunas = [coluna for coluna in COLUNAS_ENTRADA + [coluna_analise] if coluna in df.columns]
+    # A posição dentro do termo entra no hash: a ordem dos concorrentes muda o relatório
+    dados = df[colunas].assign(posicao=df.groupby(coluna_termo).cumcount().to_numpy())
+    # Sem categorize: nomes e URLs quase não se repetem, fatorar antes só custa tempo
+    hashes = pd.util.hash_pandas_object(dados, index=False, categorize=False).to_numpy()
+    # Soma (com estouro de uint64) por termo: não depende da ordem dos termos no arquivo
+    impressoes = pd.Series(hashes).groupby(df[coluna_termo].to_numpy()).sum()
+    return (impressoes.astype(np.uint64) + _sal(configuracao)).rename("impressao").rename_axis("termo")
+
+
+def termos_do_relatorio(relatorio):
+    """Termo de cada linha do relatório (o separador pertence ao termo anterior)."""
+    termos = relatorio[COLUNA_TERMO_RELATORIO]
+    return termos.where(termos != SEPARADOR).ffill()
+
+
+def atualizar_sugestoes(df, relatorio_anterior, impressoes_anteriores, coluna_termo=COLUNA_TERMO,
+                        coluna_analise=COLUNA_ANALISE, estrategia=ESTRATEGIA_PADRAO, comparar=()):
+    """Relatório completo recalculando só os termos novos ou com entrada diferente.
+
+    Devolve (relatório, impressões atuais, termos recalculados). Termos que sumiram
+    da entrada saem do relatório.
+    """
+    configuracao = (coluna_analise, estrategia, tuple(comparar))
+    impressoes = impressoes_termos(df, coluna_termo, coluna_analise, configuracao)
+    anteriores = pd.Series(impressoes_anteriores, dtype="uint64").reindex(impressoes.index)
+    mudaram = impressoes.index[anteriores.isna().to_numpy() | (anteriores.to_numpy() != impressoes.to_numpy())]
+
+    novos = gerar_sugestoes(df[df[coluna_termo].isin(mudaram)], coluna_termo, coluna_analise, estrategia, comparar)
+    termos_anteriores = termos_do_relatorio(relatorio_anterior)
+    eh_mantido = termos_anteriores.isin(impressoes.index.difference(mudaram)).to_numpy()
+    mantidos = relatorio_anterior[eh_mantido]
+    # O Parquet guarda a avaliação como número e o "-" dos termos sem referência volta
+    # como NaN; a entrada desses termos não mudou, então a coluna é refeita a partir dela
+    referencias = referencias_belmicro(df, mascara_belmicro(df), coluna_termo)
+    separador = mantidos[COLUNA_TERMO_RELATORIO] == SEPARADOR
+    mantidos = mantidos.assign(**{"Avaliação Belmicro": avaliacao_belmicro(
+        termos_anteriores[eh_mantido], referencias).where(~separador)})
+
+    # Mesma ordem do relatório completo: termos em ordem alfabética, linhas de cada
+    # termo na ordem em que foram geradas
+    relatorio = pd.concat([mantidos, novos], ignore_index=True)
+    chave = termos_do_relatorio(relatorio)
+    relatorio = relatorio.iloc[np.argsort(chave.to_numpy(dtype=object), kind="stable")]
+    return relatorio.reindex(columns=novos.columns).reset_index(drop=True), impressoes, mudaram
+
+
+def _linhas_de_preco(relatorio):
+    """Uma linha por preço do relatório: concorrentes (por URL), Belmicro e sugerido (por termo)."""
+    termos = termos_do_relatorio(relatorio)
+    linhas = relatorio.assign(termo=termos)[relatorio[COLUNA_TERMO_RELATORIO] != SEPARADOR]
+    concorrentes = linhas[linhas["Vendedor Concorrente"] != VENDEDOR_BELMICRO]
+    por_termo = linhas.drop_duplicates("termo")
+    return pd.concat([
+        pd.DataFrame({"termo": concorrentes["termo"], "Tipo": "Concorrente",
+                      "Vendedor": concorrentes["Vendedor Concorrente"], "URL": concorrentes["URL"],
+                      "preco": concorrentes["Preço Concorrente"]}),
+        pd.DataFrame({"termo": por_termo["termo"], "Tipo": "Preço Belmicro", "Vendedor": VENDEDOR_BELMICRO,
+                      "URL": "", "preco": por_termo["Preço Belmicro Atual"]}),
+        pd.DataFrame({"termo": por_termo["termo"], "Tipo": "Preço Sugerido", "Vendedor": "",
+                      "URL": "", "preco": por_termo["Preço Sugerido"]}),
+    ]).drop_duplicates(["termo", "Tipo", "URL"])
+
+
+def variacoes_precos(relatorio_anterior, relatorio_atual):
+    """Preços que mudaram entre dois relatórios (numéricos, antes da formatação em R$)."""
+    anterior, atual = _linhas_de_preco(relatorio_anterior), _linhas_de_preco(relatorio_atual)
+    juntos = anterior.merge(atual, on=["termo", "Tipo", "URL"], how="outer", suffixes=(" anterior", ""),
+                            indicator=True)
+    preco_anterior = pd.to_numeric(juntos["preco anterior"], errors="coerce")
+    preco_atual = pd.to_numeric(juntos["preco"], errors="coerce")
+    situacao = np.select(
+        [juntos["_merge"] == "right_only", juntos["_merge"] == "left_only",
+         preco_atual > preco_anterior, preco_atual < preco_anterior],
+        [NOVO, SAIU, SUBIU, CAIU], default="",
+    )
+    variacoes = pd.DataFrame({
+        COLUNA_TERMO_RELATORIO: juntos["termo"],
+        "Tipo": juntos["Tipo"],
+        "Vendedor": juntos["Vendedor"].fillna(juntos["Vendedor anterior"]),
+        "Preço Anterior": preco_anterior,
+        "Preço Atual": preco_atual,
+        "Variação (R$)": (preco_atual - preco_anterior).round(2),
+        "Variação (%)": ((preco_atual - preco_anterior) / preco_anterior * 100).round(2),
+        "Situação": situacao,
+        "URL": juntos["URL"],
+    })
+    variacoes = variacoes[variacoes["Situação"] != ""]
+    return variacoes.sort_values([COLUNA_TERMO_RELATORIO, "Tipo"], kind="stable").reset_index(drop=True)
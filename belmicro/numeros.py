@@ -0,0 +1,80 @@
+"""Conversão vetorizada de textos de preço e de contagem (formato brasileiro).
+
+Substitui o `limpar_numero` do robô e o `limpar_preco` da sugestão, que rodavam
+célula a célula com `.apply` e discordavam entre si. Aqui a coluna inteira é
+convertida de uma vez com os acessores `.str` do pandas:
+
+    "R$ 1.234,56"      -> 1234.56
+    "R$ 100 - R$ 150"  -> 100.0   (faixa de preço: vale o menor valor)
+    "4,9 mil" / "4,9k" -> 4900.0
+    "1.234"            -> 1234.0  (ponto como separador de milhar)
+    "350 vendidos"     -> 350.0
+"""
+
+import numpy as np
+import pandas as pd
+
+# Acima disso o preço quase sempre veio sem a vírgula dos centavos (100x maior)
+LIMITE_CORRECAO_100X = 50000
+
+try:
+    # Com o pyarrow as operações .str rodam nos kernels do Arrow, sem laço em Python
+    import pyarrow  # noqa: F401
+    _TIPO_TEXTO = 'string[pyarrow]'
+except ImportError:
+    _TIPO_TEXTO = object
+
+# Tudo antes do 1º dígito e tudo depois do 1º número: numa faixa "R$ 100 - R$ 150"
+# sobra o menor valor
+_PADRAO_ANTES_DO_NUMERO = r'^[^0-9]*'
+_PADRAO_DEPOIS_DO_NUMERO = r'[^0-9.,].*$'
+_PADRAO_MIL = r'(?i)[0-9]\s*(?:mil|k)\b'
+_PADRAO_SO_MILHARES = r'^[0-9]{1,3}(\.[0-9]{3})+$'
+_PADRAO_NUMERO_VALIDO = r'^[0-9]+(\.[0-9]+)?$'
+
+
+def _converter_textos(textos):
+    """Converte um array de valores distintos (textos e/ou números) em float."""
+    valores = pd.Series(textos, dtype=object)
+    # Valores que já são números (ex.: vindos do JSON da página) passam direto; a
+    # coluna pode ter só números e ainda ser object (ex.: um recorte de uma coluna mista)
+    eh_texto = valores.map(lambda valor: isinstance(valor, str)).astype(bool)
+    resultado = pd.to_numeric(valores.where(~eh_texto), errors='coerce').astype(float)
+    if not eh_texto.any():
+        return resultado.to_numpy()
+
+    texto = valores[eh_texto].astype(_TIPO_TEXTO)
+    multiplicador = np.where(texto.str.contains(_PADRAO_MIL, regex=True).fillna(False), 1000.0, 1.0)
+
+    numero = (texto.str.replace(_PADRAO_ANTES_DO_NUMERO, '', regex=True)
+                   .str.replace(_PADRAO_DEPOIS_DO_NUMERO, '', regex=True)
+                   .str.rstrip('.,'))
+    tem_virgula = numero.str.contains(',', regex=False).fillna(False)
+    so_milhares = numero.str.match(_PADRAO_SO_MILHARES).fillna(False)
+    # "1.234,56": ponto é milhar e vírgula é decimal; "1.234": só milhar; "10.5": decimal
+    numero = numero.where(~(tem_virgula | so_milhares), numero.str.replace('.', '', regex=False))
+    numero = numero.str.replace(',', '.', regex=False)
+    numero = numero.where(numero.str.match(_PADRAO_NUMERO_VALIDO).fillna(False))
+
+    resultado[eh_texto] = numero.astype('float64').to_numpy() * multiplicador
+    return resultado.to_numpy()
+
+
+def converter_numeros(serie):
+    """Converte uma coluna de textos/números em float (NaN onde não há número)."""
+    serie = pd.Series(serie)
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    # Colunas de preço/vendidos repetem muito os mesmos textos: cada texto distinto
+    # é interpretado uma única vez e o resultado é espalhado pelos códigos.
+    codigos, distintos = pd.factorize(serie, use_na_sentinel=True)
+    convertidos = np.append(_converter_textos(np.asarray(distintos, dtype=object)), np.nan)
+    return pd.Series(convertidos[codigos], index=serie.index)
+
+
+def converter_precos(serie, corrigir_100x=True, limite=LIMITE_CORRECAO_100X):
+    """Como converter_numeros, corrigindo preços que vieram 100x maiores."""
+    precos = converter_numeros(serie)
+    if corrigir_100x:
+        precos = precos.where(~(precos > limite), precos / 100.0)
+    return precos
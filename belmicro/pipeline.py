@@ -0,0 +1,324 @@
+"""Orquestrador do pipeline: coleta → limpeza → comparação → sugestão, como um DAG.
+
+Cada etapa declara os arquivos que lê e grava e de quais etapas depende. A
+impressão digital de uma etapa é o hash do conteúdo das entradas e dos seus
+parâmetros; se for a mesma da última execução bem-sucedida (guardada em
+`pipeline_estado.json`) e as saídas existirem, a etapa é pulada. As etapas do
+robô também têm validade (`validade_coleta_horas`): mesmo com a lista de termos
+igual, os preços da Shopee mudam, então a coleta roda de novo depois desse prazo.
+
+A coleta bruta não alimenta as outras etapas (a limpeza pesquisa a mesma lista de
+produtos com o termo otimizado), então é um ramo à parte do DAG.
+
+    python -m belmicro --pasta D:\\shopee [--etapas limpeza comparacao sugestao] [--fragmentos 3] [--filas Z:\\filas]
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+
+from .caminhos import PASTA_RESULTADOS, pastas_etapas
+
+ARQUIVO_ESTADO = 'pipeline_estado.json'
+TAMANHO_BLOCO_HASH = 1 << 20
+# Hash de cada arquivo já lido nesta execução, por (caminho, tamanho, data de modificação)
+_IMPRESSOES_ARQUIVOS = {}
+
+EXECUTADA, PULADA, FALHOU, BLOQUEADA = 'executada', 'pulada', 'falhou', 'bloqueada'
+
+
+@dataclass
+class ConfigPipeline:
+    """Pastas e opções de uma execução do pipeline inteiro."""
+
+    pasta: str = PASTA_RESULTADOS
+    # Lista de produtos Belmicro (colunas Descricao e Termo_Busca); padrão: na pasta da coleta bruta
+    lista_produtos: str = None
+    # > 1: a lista de termos do robô é dividida entre esse número de processos
+    fragmentos: int = 1
+    # Pasta das filas da coleta distribuída (fila_<perfil>.sqlite): o robô só coordena, os workers coletam
+    pasta_filas: str = None
+    incremental: bool = False
+    max_termos: int = None
+    motor: str = 'selenium'
+    # Carregamento das páginas no Chrome do robô: 'completo' ou 'leve'
+    carregamento: str = 'completo'
+    navegadores: int = 1
+    aguardar_login: bool = True
+    validade_coleta_horas: float = 24
+    usar_llm: bool = True
+    # Cópias em XLSX das saídas do robô e da comparação (o relatório final é sempre gerado)
+    exportar_xlsx: bool = False
+    # Preço dos concorrentes na sugestão: 'atual' (última coleta) ou 'mediana' (do histórico)
+    preco_referencia: str = 'atual'
+    estrategia: str = '3º menor'
+    estrategias_comparadas: list = field(default_factory=lambda: ['percentil 25', 'ponderado por avaliação',
+                                                                  'undercut por volume'])
+
+    def __post_init__(self):
+        self.pasta_coleta_bruta, self.pasta_limpeza = pastas_etapas(self.pasta)
+        if self.lista_produtos is None:
+            self.lista_produtos = os.path.join(self.pasta_coleta_bruta, 'lista produtos.xlsx')
+
+    @classmethod
+    def de_arquivo(cls, caminho, **substituicoes):
+        """Configuração lida de um JSON com os campos desta classe (e substituições)."""
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        dados.update({campo: valor for campo, valor in substituicoes.items() if valor is not None})
+        return cls(**dados)
+
+
+@dataclass
+class Etapa:
+    nome: str
+    # Função sem argumentos que roda a etapa; devolve None quando não gerou saída
+    executar: object
+    entradas: list
+    saidas: list
+    dependencias: tuple = ()
+    # Opções que mudam o resultado (entram na impressão digital)
+    parametros: dict = field(default_factory=dict)
+    # Horas até a etapa rodar de novo mesmo com a mesma impressão (None: nunca vence)
+    validade_horas: float = None
+
+
+def impressao_arquivo(caminho):
+    """sha1 do conteúdo do arquivo (None se não existir)."""
+    if not os.path.exists(caminho):
+        return None
+    situacao = os.stat(caminho)
+    chave = (os.path.abspath(caminho), situacao.st_size, situacao.st_mtime_ns)
+    if chave not in _IMPRESSOES_ARQUIVOS:
+        hash_arquivo = hashlib.sha1()
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_HASH), b''):
+                hash_arquivo.update(bloco)
+        _IMPRESSOES_ARQUIVOS[chave] = hash_arquivo.hexdigest()
+    return _IMPRESSOES_ARQUIVOS[chave]
+
+
+def impressao_etapa(etapa):
+    """Hash das entradas (conteúdo) e dos parâmetros da etapa."""
+    dados = {
+        'entradas': [(os.path.basename(caminho), impressao_arquivo(caminho)) for caminho in etapa.entradas],
+        'parametros': etapa.parametros,
+    }
+    return hashlib.sha1(json.dumps(dados, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _perfil(config, nome):
+    from .coleta.config import criar_perfis
+
+    perfil = criar_perfis(config.pasta_coleta_bruta, config.pasta_limpeza)[nome]
+    return dataclasses.replace(
+        perfil,
+        arquivo_entrada=config.lista_produtos,
+        arquivo_xlsx=perfil.arquivo_saida.replace('.parquet', '.xlsx') if config.exportar_xlsx else None,
+        motor=config.motor,
+        carregamento=config.carregamento,
+        num_navegadores=config.navegadores,
+        aguardar_login=config.aguardar_login,
+    )
+
+
+def _etapa_robo(config, perfil):
+    def executar():
+        if config.pasta_filas:
+            from .coleta.distribuida import coordenar
+            return coordenar(perfil, os.path.join(config.pasta_filas, f'fila_{perfil.nome}.sqlite'))
+        if config.fragmentos > 1:
+            from .coleta.fragmentos import coletar_em_fragmentos
+            return coletar_em_fragmentos(perfil, config.fragmentos, incremental=config.incremental,
+                                         max_termos=config.max_termos)
+        from .coleta.execucao import executar_coleta
+        return executar_coleta(perfil, incremental=config.incremental, max_termos=config.max_termos)
+
+    return Etapa(perfil.nome, executar, [perfil.arquivo_entrada], [perfil.arquivo_saida],
+                 parametros={'max_produtos': perfil.max_produtos, 'incremental': config.incremental,
+                             'max_termos': config.max_termos},
+                 validade_horas=config.validade_coleta_horas)
+
+
+def montar_etapas(config):
+    """As etapas do pipeline, por nome, com os arquivos derivados da configuração."""
+    from .etapa_sugestao import ConfigSugestao
+
+    perfil_limpeza = _perfil(config, 'limpeza')
+    limpeza = _etapa_robo(config, perfil_limpeza)
+    arquivo_comparativo = os.path.join(config.pasta_limpeza, 'resultados_comparativo.parquet')
+    config_sugestao = ConfigSugestao(
+        arquivo_entrada=arquivo_comparativo,
+        arquivo_saida_dados=os.path.join(config.pasta_limpeza, 'relatorio_sugestao.parquet'),
+        arquivo_saida=os.path.join(config.pasta_limpeza, 'REsLATORIO_CORRIGIDO_V5_FINAL.xlsx'),
+        modo_incremental=True,
+        arquivo_historico=perfil_limpeza.arquivo_historico,
+        preco_referencia=config.preco_referencia,
+        estrategia=config.estrategia,
+        estrategias_comparadas=config.estrategias_comparadas,
+    )
+
+    def comparar():
+        from .comparacao.etapa import executar_comparacao
+        return executar_comparacao(
+            limpeza.saidas[0], arquivo_comparativo,
+            arquivo_xlsx=arquivo_comparativo.replace('.parquet', '.xlsx') if config.exportar_xlsx else None,
+            usar_llm=config.usar_llm)
+
+    def sugerir():
+        from .etapa_sugestao import executar_sugestao
+        return executar_sugestao(config_sugestao)
+
+    etapas = [
+        _etapa_robo(config, _perfil(config, 'coleta')),
+        limpeza,
+        Etapa('comparacao', comparar, limpeza.saidas, [arquivo_comparativo], ('limpeza',),
+              parametros={'usar_llm': config.usar_llm}),
+        Etapa('sugestao', sugerir, [arquivo_comparativo],
+              [config_sugestao.arquivo_saida_dados, config_sugestao.arquivo_saida], ('comparacao',),
+              parametros={campo: getattr(config_sugestao, campo) for campo in
+                          ('preco_referencia', 'janela_mediana_dias', 'estrategia', 'estrategias_comparadas')}),
+    ]
+    return {etapa.nome: etapa for etapa in etapas}
+
+
+def ordem_execucao(etapas, escolhidas=None):
+    """Nomes das etapas escolhidas (padrão: todas) em ordem topológica."""
+    escolhidas = list(etapas) if escolhidas is None else escolhidas
+    desconhecidas = [nome for nome in escolhidas if nome not in etapas]
+    if desconhecidas:
+        raise KeyError(f"Etapas desconhecidas: {', '.join(desconhecidas)}")
+    grafo = TopologicalSorter({nome: etapas[nome].dependencias for nome in etapas})
+    return [nome for nome in grafo.static_order() if nome in escolhidas]
+
+
+def _ler_estado(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def _gravar_estado(caminho, estado):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(estado, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def motivo_para_executar(etapa, anterior, impressao, agora=None):
+    """Por que a etapa precisa rodar (None se pode ser pulada)."""
+    agora = time.time() if agora is None else agora
+    if not anterior:
+        return "nunca executada"
+    if anterior.get('impressao') != impressao:
+        return "entrada ou parâmetros mudaram"
+    faltando = [caminho for caminho in etapa.saidas if not os.path.exists(caminho)]
+    if faltando:
+        return f"saída ausente ({os.path.basename(faltando[0])})"
+    if etapa.validade_horas is not None and agora - anterior['executada_em'] > etapa.validade_horas * 3600:
+        return f"última execução com mais de {etapa.validade_horas:g} h"
+    return None
+
+
+def executar_pipeline(etapas, escolhidas=None, forcar=False, arquivo_estado=None):
+    """Roda as etapas em ordem topológica, pulando as que não mudaram.
+
+    Uma etapa que falha (exceção ou nenhuma saída) bloqueia as que dependem dela.
+    Devolve {etapa: situação}.
+    """
+    estado = _ler_estado(arquivo_estado) if arquivo_estado else {}
+    situacoes = {}
+    for nome in ordem_execucao(etapas, escolhidas):
+        etapa = etapas[nome]
+        bloqueio = [dependencia for dependencia in etapa.dependencias if situacoes.get(dependencia) in (FALHOU, BLOQUEADA)]
+        if bloqueio:
+            print(f"\n⛔ [{nome}] não roda: depende de '{bloqueio[0]}', que não terminou.")
+            situacoes[nome] = BLOQUEADA
+            continue
+        impressao = impressao_etapa(etapa)
+        motivo = 'forçada' if forcar else motivo_para_executar(etapa, estado.get(nome), impressao)
+        if motivo is None:
+            print(f"\n⏭️ [{nome}] pulada: mesma entrada da última execução e saídas presentes.")
+            situacoes[nome] = PULADA
+            continue
+
+        print(f"\n▶️ [{nome}] executando ({motivo})...")
+        inicio = time.perf_counter()
+        try:
+            resultado = etapa.executar()
+        except (FileNotFoundError, KeyError, ValueError) as erro:
+            # Arquivo ou coluna ausente, configuração inválida (ex.: sem GROQ_API_KEY)
+            print(f"❌ [{nome}] ERRO: {erro}")
+            resultado = None
+        duracao = time.perf_counter() - inicio
+        if resultado is None:
+            print(f"❌ [{nome}] falhou após {duracao:.1f}s.")
+            situacoes[nome] = FALHOU
+            continue
+        print(f"✅ [{nome}] concluída em {duracao:.1f}s.")
+        situacoes[nome] = EXECUTADA
+        if arquivo_estado:
+            estado[nome] = {'impressao': impressao, 'executada_em': time.time(), 'duracao': duracao}
+            _gravar_estado(arquivo_estado, estado)
+    return situacoes
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m belmicro',
+        description="Roda o pipeline (coleta, limpeza, comparação e sugestão), pulando as etapas sem mudança.",
+    )
+    parser.add_argument('--config', help="JSON com os campos de ConfigPipeline (as opções abaixo têm prioridade).")
+    parser.add_argument('--pasta', help="Pasta raiz dos arquivos (com 'coleta bruta' e 'limpeza coleta').")
+    parser.add_argument('--lista', help="Lista de produtos Belmicro (.xlsx ou .parquet).")
+    parser.add_argument('--etapas', nargs='+', help="Etapas a rodar (padrão: todas): coleta limpeza comparacao sugestao.")
+    parser.add_argument('--forcar', action='store_true', help="Roda as etapas mesmo sem mudança na entrada.")
+    parser.add_argument('--fragmentos', type=int, help="Processos do robô, cada um com uma parte dos termos.")
+    parser.add_argument('--filas', help="Coleta distribuída: pasta das filas do robô; cada etapa do robô espera os "
+                                        "workers (python -m belmicro.coleta --trabalhar) e monta a saída.")
+    parser.add_argument('--incremental', action='store_true', default=None,
+                        help="Robô no modo incremental (só os termos vencidos).")
+    parser.add_argument('--max-termos', type=int, help="No modo incremental, máximo de termos por execução.")
+    parser.add_argument('--motor', choices=['selenium', 'http'], help="Motor de extração das páginas de produto.")
+    parser.add_argument('--carregamento', choices=['completo', 'leve'],
+                        help="'leve': Chrome sem imagens, fontes nem rastreadores.")
+    parser.add_argument('--navegadores', type=int, help="Chrome extraindo produtos em paralelo (por processo).")
+    parser.add_argument('--sem-login', dest='aguardar_login', action='store_false', default=None,
+                        help="Não espera o Enter do login (perfil do Chrome já logado).")
+    parser.add_argument('--sem-llm', dest='usar_llm', action='store_false', default=None,
+                        help="Comparação sem LLM (ambíguos pela semelhança dos nomes).")
+    parser.add_argument('--preco-referencia', choices=['atual', 'mediana'],
+                        help="Preço dos concorrentes na sugestão: 'mediana' usa a mediana do histórico de preços.")
+    parser.add_argument('--xlsx', dest='exportar_xlsx', action='store_true', default=None,
+                        help="Exporta também cópias em XLSX das saídas intermediárias.")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+    substituicoes = {
+        'pasta': args.pasta, 'lista_produtos': args.lista, 'fragmentos': args.fragmentos, 'pasta_filas': args.filas,
+        'incremental': args.incremental, 'max_termos': args.max_termos, 'motor': args.motor,
+        'carregamento': args.carregamento, 'navegadores': args.navegadores, 'aguardar_login': args.aguardar_login, 'usar_llm': args.usar_llm,
+        'exportar_xlsx': args.exportar_xlsx, 'preco_referencia': args.preco_referencia,
+    }
+    if args.config:
+        config = ConfigPipeline.de_arquivo(args.config, **substituicoes)
+    else:
+        config = ConfigPipeline(**{campo: valor for campo, valor in substituicoes.items() if valor is not None})
+
+    etapas = montar_etapas(config)
+    try:
+        situacoes = executar_pipeline(etapas, args.etapas, args.forcar, os.path.join(config.pasta, ARQUIVO_ESTADO))
+    except KeyError as erro:
+        print(f"❌ ERRO: {erro.args[0]}")
+        return 2
+    print("\n📋 Resumo: " + ", ".join(f"{nome} {situacao}" for nome, situacao in situacoes.items()))
+    return 1 if FALHOU in situacoes.values() or BLOQUEADA in situacoes.values() else 0
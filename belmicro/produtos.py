@@ -0,0 +1,33 @@
+"""Identificação dos produtos da Shopee pelos links (loja e item)."""
+
+import re
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+# Links de produto da Shopee: ".../Nome-do-produto-i.<loja>.<item>" ou ".../product/<loja>/<item>"
+PADRAO_ID_PRODUTO = re.compile(r'(?:-i\.|/product/)(\d+)[./](\d+)')
+
+
+def chave_produto(url):
+    """Chave canônica do produto: '<id loja>.<id item>' (ou a URL sem parâmetros)."""
+    partes = urlsplit(url)
+    encontrado = PADRAO_ID_PRODUTO.search(partes.path)
+    if encontrado:
+        return f"{encontrado.group(1)}.{encontrado.group(2)}"
+    return f"{partes.netloc}{partes.path}".rstrip('/')
+
+
+def ids_produtos(urls):
+    """DataFrame (loja, item) de cada URL, vetorizado.
+
+    Links fora do padrão ficam com loja vazia e item = chave_produto(url).
+    """
+    urls = pd.Series(urls, dtype=object).fillna('').astype(str)
+    caminhos = urls.str.split('?', n=1).str[0]
+    ids = caminhos.str.extract(PADRAO_ID_PRODUTO.pattern).rename(columns={0: 'loja', 1: 'item'})
+    fora = ids['item'].isna()
+    if fora.any():
+        ids.loc[fora, 'loja'] = ''
+        ids.loc[fora, 'item'] = [chave_produto(url) for url in urls[fora]]
+    return ids.astype(object)
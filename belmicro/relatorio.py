@@ -0,0 +1,131 @@
+"""Gravação rápida do relatório em XLSX (openpyxl em modo write-only).
+
+As linhas vão direto do DataFrame para o arquivo, sem montar a planilha inteira
+na memória, então o uso de memória não cresce com o número de linhas. A
+formatação não é aplicada célula a célula depois de gravar:
+
+- estilos nomeados (cabeçalho, preço centralizado, preço sugerido em verde) são
+  registrados uma vez no arquivo e cada célula só aponta para eles;
+- a linha da Belmicro é pintada por uma regra de formatação condicional sobre a
+  coluna do vendedor;
+- a largura das colunas sai do DataFrame com `str.len()` vetorizado.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+
+LARGURA_MAXIMA = 60
+TAMANHO_BLOCO = 5000
+
+ESTILO_CABECALHO = "cabecalho"
+ESTILO_CENTRO = "centro"
+ESTILO_DESTAQUE = "destaque"
+
+VERDE = "C6EFCE"
+AMARELO = "FFFFE0"
+
+
+def _estilos_nomeados():
+    cabecalho = NamedStyle(ESTILO_CABECALHO, font=Font(bold=True), alignment=Alignment(horizontal="center"))
+    centro = NamedStyle(ESTILO_CENTRO, alignment=Alignment(horizontal="center"))
+    destaque = NamedStyle(ESTILO_DESTAQUE, alignment=Alignment(horizontal="center"),
+                          fill=PatternFill(start_color=VERDE, end_color=VERDE, fill_type="solid"))
+    return [cabecalho, centro, destaque]
+
+
+def larguras_colunas(df, maximo=LARGURA_MAXIMA):
+    """Largura de cada coluna: maior texto (valores ou cabeçalho) + 2, até o máximo."""
+    larguras = {}
+    for coluna in df.columns:
+        textos = df[coluna].astype("string").fillna("")
+        maior = max(int(textos.str.len().max() or 0) if len(textos) else 0, len(str(coluna)))
+        larguras[coluna] = min(maior + 2, maximo)
+    return larguras
+
+
+def formatar_reais(serie, sufixo=""):
+    """Formata preços como texto "R$ 1.234,56" (vazio onde não há preço).
+
+    Cada preço distinto é formatado uma vez; preços se repetem muito no relatório.
+    """
+    codigos, distintos = pd.factorize(pd.Series(serie), use_na_sentinel=True)
+    textos = [f"R$ {valor:,.2f}{sufixo}".replace(",", "X").replace(".", ",").replace("X", ".")
+              for valor in distintos]
+    return pd.Series(np.array(textos + [""], dtype=object)[codigos], index=pd.Series(serie).index)
+
+
+def escrever_aba(wb, titulo, df, estilos_colunas=None, destacar_linhas=None, incluir_indice=False):
+    """Grava um DataFrame numa aba nova do workbook write-only.
+
+    estilos_colunas: coluna -> nome do estilo nomeado das células de dados;
+    destacar_linhas: (coluna, valor, cor) pinta a linha inteira quando a coluna tem
+    aquele valor, por formatação condicional.
+    """
+    if incluir_indice:
+        df = df.reset_index()
+    estilos_colunas = estilos_colunas or {}
+    ws = wb.create_sheet(titulo)
+
+    # Larguras e formatação condicional precisam estar definidas antes da 1ª linha
+    for posicao, (coluna, largura) in enumerate(larguras_colunas(df).items(), 1):
+        ws.column_dimensions[get_column_letter(posicao)].width = largura
+    ultima_coluna = get_column_letter(max(len(df.columns), 1))
+    if destacar_linhas and len(df):
+        coluna, valor, cor = destacar_linhas
+        letra = get_column_letter(df.columns.get_loc(coluna) + 1)
+        valor_formula = str(valor).replace('"', '""')
+        ws.conditional_formatting.add(
+            f"A2:{ultima_coluna}{len(df) + 1}",
+            FormulaRule(formula=[f'${letra}2="{valor_formula}"'],
+                        fill=PatternFill(start_color=cor, end_color=cor, fill_type="solid"), stopIfTrue=True),
+        )
+    ws.freeze_panes = "A2"
+
+    cabecalho = []
+    for coluna in df.columns:
+        celula = WriteOnlyCell(ws, value=str(coluna))
+        celula.style = ESTILO_CABECALHO
+        cabecalho.append(celula)
+    ws.append(cabecalho)
+
+    # Células com estilo são reaproveitadas entre linhas (o write-only copia o valor
+    # e o estilo na hora de gravar), então o custo por linha é só o de atribuir valores
+    modelos = {}
+    for posicao, coluna in enumerate(df.columns):
+        if coluna in estilos_colunas:
+            modelos[posicao] = WriteOnlyCell(ws)
+            modelos[posicao].style = estilos_colunas[coluna]
+    # Em blocos, para a conversão (NaN/NA viram célula vazia, o openpyxl não grava
+    # NaN) não duplicar o DataFrame inteiro na memória
+    for inicio in range(0, len(df), TAMANHO_BLOCO):
+        bloco = df.iloc[inicio:inicio + TAMANHO_BLOCO]
+        for linha in bloco.astype(object).where(bloco.notna(), None).itertuples(index=False, name=None):
+            valores = list(linha)
+            for posicao, celula in modelos.items():
+                celula.value = valores[posicao]
+                valores[posicao] = celula
+            ws.append(valores)
+    return ws
+
+
+def novo_workbook():
+    """Workbook write-only com os estilos nomeados do relatório já registrados."""
+    wb = Workbook(write_only=True)
+    for estilo in _estilos_nomeados():
+        wb.add_named_style(estilo)
+    return wb
+
+
+def salvar_workbook(wb, caminho):
+    pasta = os.path.dirname(caminho)
+    if pasta and not os.path.exists(pasta):
+        os.makedirs(pasta)
+        print(f"✅ Pasta de saída criada em: {pasta}")
+    wb.save(caminho)
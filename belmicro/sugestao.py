@@ -0,0 +1,180 @@
+"""Sugestão de preço por termo pesquisado, calculada de forma vetorizada.
+
+Para cada termo com produtos aprovados ("SIM" no Comparativo), junta os preços
+dos concorrentes aprovados e o preço de referência da Belmicro, aplica a estratégia
+de preço (padrão: 3º menor preço distinto, ver belmicro.estrategias) e calcula a
+posição da Belmicro entre os preços distintos ("Nº de M"). O relatório tem, por
+termo, a linha da Belmicro, as linhas dos concorrentes e uma linha separadora.
+
+Tudo é feito com uma máscara "é Belmicro" calculada uma vez, `groupby().rank` e
+merges, sem laço em Python por termo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .estrategias import COLUNAS_CANDIDATOS, ESTRATEGIA_PADRAO, aplicar_estrategias
+from .numeros import converter_numeros
+
+COLUNA_TERMO = "Termo Pesquisado"
+COLUNA_ANALISE = "Comparativo"
+VENDEDOR_BELMICRO = "BELMICRO (REFERÊNCIA)"
+SEPARADOR = "──────────────────────────────────────────────"
+PREFIXO_COMPARADA = "Sugerido: "
+
+COLUNAS_RELATORIO = [
+    "Termo Pesquisado (produto belmicro)",
+    "Termo Encontrado",
+    "Vendedor Concorrente",
+    "Preço Concorrente",
+    "Preço Belmicro Atual",
+    "Preço Sugerido",
+    "Posição Belmicro",
+    "Avaliação Belmicro",
+    "Avaliação Concorrente",
+    "Link da Loja",
+    "URL",
+]
+
+# Ordem das linhas dentro de cada termo
+_ORDEM_BELMICRO, _ORDEM_CONCORRENTE, _ORDEM_SEPARADOR = 0, 1, 2
+
+
+def mascara_belmicro(df):
+    """True nas linhas cujo vendedor é a Belmicro."""
+    return df["Vendedor"].str.contains("belmicro", case=False, na=False).to_numpy()
+
+
+def referencias_belmicro(df, eh_belmicro, coluna_termo=COLUNA_TERMO):
+    """Primeiro anúncio da Belmicro de cada termo (preço e avaliação de referência)."""
+    belmicro = df[eh_belmicro & df[coluna_termo].notna().to_numpy()]
+    return (belmicro.drop_duplicates(coluna_termo)
+                    .set_index(coluna_termo).reindex(columns=["Preço Belmicro (R$)", "Avaliação Média", "Vendidos"]))
+
+
+def avaliacao_belmicro(termos, referencias):
+    """Avaliação da referência da Belmicro para cada termo ("-" nos termos sem referência)."""
+    return termos.map(referencias["Avaliação Média"]).where(termos.isin(referencias.index), "-")
+
+
+def montar_candidatos(concorrentes, referencias, termos, coluna_termo=COLUNA_TERMO):
+    """Candidatos das estratégias: concorrentes aprovados + referência da Belmicro."""
+    referencias = referencias.reindex(termos)
+    referencias = referencias[referencias["Preço Belmicro (R$)"].notna()]
+    return pd.concat([
+        pd.DataFrame({
+            "termo": concorrentes[coluna_termo],
+            "preco": concorrentes["Preço (R$)"],
+            "avaliacao": converter_numeros(concorrentes.get("Avaliação Média", pd.Series(np.nan, index=concorrentes.index))),
+            "vendidos": converter_numeros(concorrentes.get("Vendidos", pd.Series(np.nan, index=concorrentes.index))),
+            "eh_belmicro": False,
+        }),
+        pd.DataFrame({
+            "termo": referencias.index,
+            "preco": referencias["Preço Belmicro (R$)"].to_numpy(),
+            "avaliacao": converter_numeros(referencias["Avaliação Média"]).to_numpy(),
+            "vendidos": converter_numeros(referencias["Vendidos"]).to_numpy(),
+            "eh_belmicro": True,
+        }),
+    ], ignore_index=True)[COLUNAS_CANDIDATOS]
+
+
+def posicao_belmicro(candidatos):
+    """Posição do preço da Belmicro entre os preços distintos do termo ("Nº de M")."""
+    precos = candidatos[candidatos["preco"].notna()].drop_duplicates(["termo", "preco"])
+    posicao = precos.groupby("termo")["preco"].rank(method="first").astype(int).astype(str)
+    total = precos.groupby("termo")["preco"].transform("size").astype(str)
+    referencia = candidatos.loc[candidatos["eh_belmicro"], ["termo", "preco"]]
+    rotulos = precos.assign(rotulo=posicao + "º de " + total)[["termo", "preco", "rotulo"]]
+    return referencia.merge(rotulos, on=["termo", "preco"]).set_index("termo")["rotulo"]
+
+
+def gerar_sugestoes(df, coluna_termo=COLUNA_TERMO, coluna_analise=COLUNA_ANALISE,
+                    estrategia=ESTRATEGIA_PADRAO, comparar=()):
+    """Monta o relatório de sugestão de preço (valores numéricos, sem formatação).
+
+    `estrategia` define o "Preço Sugerido" (padrão: 3º menor preço). Cada estratégia
+    em `comparar` ganha uma coluna "Sugerido: <nome>" ao lado, para comparar as
+    alternativas na mesma execução.
+    """
+    if coluna_analise not in df.columns:
+        raise KeyError(f"Coluna de filtro '{coluna_analise}' não foi encontrada!")
+
+    df = df.reset_index(drop=True)
+    if "Vendidos" not in df.columns:
+        df["Vendidos"] = np.nan
+    eh_belmicro = mascara_belmicro(df)
+    referencias = referencias_belmicro(df, eh_belmicro, coluna_termo)
+
+    aprovado = (df[coluna_analise].astype("string").str.startswith("SIM").fillna(False).to_numpy()
+                & df[coluna_termo].notna().to_numpy())
+    concorrentes = df[aprovado & ~eh_belmicro]
+    termos = pd.Index(df.loc[aprovado, coluna_termo].unique())
+
+    candidatos = montar_candidatos(concorrentes, referencias, termos, coluna_termo)
+    nomes = [estrategia] + [nome for nome in comparar if nome != estrategia]
+    sugestoes = aplicar_estrategias(candidatos, nomes)
+    # Só entram no relatório os termos com algum preço (como no laço original)
+    com_preco = candidatos.loc[candidatos["preco"].notna(), "termo"].unique()
+    sugestoes = sugestoes[sugestoes.index.isin(com_preco)]
+    posicoes = posicao_belmicro(candidatos)
+
+    belmicro = df[aprovado & eh_belmicro].drop_duplicates(coluna_termo)
+    partes = [
+        pd.DataFrame({
+            "termo": belmicro[coluna_termo],
+            "ordem": _ORDEM_BELMICRO,
+            "Termo Encontrado": belmicro["Nome"],
+            "Vendedor Concorrente": VENDEDOR_BELMICRO,
+            "Preço Concorrente": np.nan,
+            "Avaliação Concorrente": belmicro["Avaliação Média"],
+            "Link da Loja": belmicro["Link Loja"],
+            "URL": belmicro["URL"],
+        }),
+        pd.DataFrame({
+            "termo": concorrentes[coluna_termo],
+            "ordem": _ORDEM_CONCORRENTE,
+            "Termo Encontrado": concorrentes["Nome"],
+            "Vendedor Concorrente": concorrentes["Vendedor"],
+            "Preço Concorrente": concorrentes["Preço (R$)"],
+            "Avaliação Concorrente": concorrentes["Avaliação Média"],
+            "Link da Loja": concorrentes["Link Loja"],
+            "URL": concorrentes["URL"],
+        }),
+    ]
+    linhas = pd.concat(partes)
+    linhas = linhas[linhas["termo"].isin(sugestoes.index)]
+    linhas["Preço Belmicro Atual"] = linhas["termo"].map(referencias["Preço Belmicro (R$)"])
+    linhas["Preço Sugerido"] = linhas["termo"].map(sugestoes.iloc[:, 0])
+    linhas["Posição Belmicro"] = linhas["termo"].map(posicoes).fillna("-")
+    linhas["Avaliação Belmicro"] = avaliacao_belmicro(linhas["termo"], referencias)
+    linhas["Termo Pesquisado (produto belmicro)"] = linhas["termo"]
+
+    colunas_comparadas = []
+    for nome in sugestoes.columns[1:]:
+        coluna = f"{PREFIXO_COMPARADA}{nome}"
+        linhas[coluna] = linhas["termo"].map(sugestoes[nome])
+        colunas_comparadas.append(coluna)
+
+    separadores = pd.DataFrame({
+        "termo": sugestoes.index,
+        "ordem": _ORDEM_SEPARADOR,
+        "Termo Pesquisado (produto belmicro)": SEPARADOR,
+    }, index=np.full(len(sugestoes), len(df)))
+
+    # Termos em ordem alfabética (como no groupby) e, dentro de cada um, Belmicro,
+    # concorrentes na ordem da planilha e o separador
+    linhas = pd.concat([linhas, separadores]).rename_axis("linha_original")
+    linhas = linhas.sort_values(["termo", "ordem", "linha_original"], kind="stable")
+    colunas = COLUNAS_RELATORIO.copy()
+    colunas[colunas.index("Preço Sugerido") + 1:colunas.index("Preço Sugerido") + 1] = colunas_comparadas
+    return linhas.reindex(columns=colunas).reset_index(drop=True)
+
+
+def sugestoes_por_termo(relatorio):
+    """Uma linha por termo com as sugestões de cada estratégia e o preço da Belmicro."""
+    coluna_termo = "Termo Pesquisado (produto belmicro)"
+    por_termo = relatorio[relatorio[coluna_termo] != SEPARADOR].drop_duplicates(coluna_termo)
+    por_termo = por_termo.set_index(coluna_termo)
+    colunas = ["Preço Sugerido"] + [c for c in por_termo.columns if c.startswith(PREFIXO_COMPARADA)]
+    return por_termo[colunas], por_termo["Preço Belmicro Atual"]
@@ -0,0 +1,64 @@
+"""Benchmark da troca de dados entre etapas: XLSX x Parquet (memory map).
+
+    python benchmarks/bench_armazenamento.py [--linhas 50000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.armazenamento import ESQUEMA_COMPARATIVO, gravar_parquet, ler_parquet
+
+
+def gerar_produtos(linhas, semente=42):
+    rng = np.random.default_rng(semente)
+    return pd.DataFrame({
+        "Nome": [f"Anúncio concorrente número {i}" for i in range(linhas)],
+        "Preço (R$)": rng.uniform(50, 5000, linhas).round(2),
+        "Avaliação Média": rng.choice([4.5, 4.8, 5.0, np.nan], linhas),
+        "Total de Avaliações": rng.integers(0, 5000, linhas).astype(float),
+        "Vendidos": rng.integers(0, 10000, linhas).astype(float),
+        "Vendedor": rng.choice(["Belmicro Oficial", "Carrefour", "Loja do Zé"], linhas),
+        "Link Loja": "https://shopee.com.br/loja",
+        "URL": [f"https://shopee.com.br/produto-i.1.{i}" for i in range(linhas)],
+        "Termo Pesquisado": [f"Produto Belmicro {i // 20:06d}" for i in range(linhas)],
+        "Preço Belmicro (R$)": rng.uniform(50, 5000, linhas).round(2),
+        "Comparativo": rng.choice(["SIM", "NÃO"], linhas),
+    })
+
+
+def medir(nome, funcao):
+    inicio = time.perf_counter()
+    funcao()
+    decorrido = time.perf_counter() - inicio
+    print(f"  {nome:<40} {decorrido:8.3f}s")
+    return decorrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = gerar_produtos(args.linhas)
+    with tempfile.TemporaryDirectory() as pasta:
+        xlsx, parquet = os.path.join(pasta, "dados.xlsx"), os.path.join(pasta, "dados.parquet")
+        print(f"⏱️ {args.linhas:,} produtos:")
+        escrita_xlsx = medir("to_excel", lambda: df.to_excel(xlsx, index=False))
+        escrita_parquet = medir("gravar_parquet (esquema, zstd)", lambda: gravar_parquet(df, parquet, ESQUEMA_COMPARATIVO))
+        leitura_xlsx = medir("read_excel", lambda: pd.read_excel(xlsx))
+        leitura_parquet = medir("ler_parquet (memory map)", lambda: ler_parquet(parquet))
+        medir("ler_parquet (3 colunas)", lambda: ler_parquet(parquet, ["Termo Pesquisado", "Preço (R$)", "Comparativo"]))
+        print(f"  -> escrita {escrita_xlsx / escrita_parquet:.0f}x e leitura {leitura_xlsx / leitura_parquet:.0f}x "
+              f"mais rápidas; {os.path.getsize(xlsx) / 2**20:.1f} MB (xlsx) x "
+              f"{os.path.getsize(parquet) / 2**20:.1f} MB (parquet).")
+
+
+if __name__ == "__main__":
+    main()
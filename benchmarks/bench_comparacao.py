@@ -0,0 +1,77 @@
+"""Avaliação da etapa de comparação contra um comparativo já rotulado (SIM/NÃO).
+
+Usa um cliente de LLM local que responde com os próprios rótulos, para medir
+quantos pares o pré-filtro decide sozinho, quanto ele concorda com os rótulos e
+quantas chamadas ao LLM sobram (com lotes e com o cache numa segunda rodada).
+
+    python benchmarks/bench_comparacao.py [--planilha 2_limpeza/RESULTADO_COMPARATIVO_GROQ_COMPLETO_V2.xlsx]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.comparacao import CacheComparacoes, gerar_comparativo
+
+PLANILHA_ROTULADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2_limpeza',
+                                 'RESULTADO_COMPARATIVO_GROQ_COMPLETO_V2.xlsx')
+
+
+class ClienteRotulos:
+    """Stub de LLM: responde cada par com o rótulo da planilha."""
+
+    nome = 'rotulos'
+
+    def __init__(self, rotulos):
+        self.rotulos = rotulos
+        self.chamadas = 0
+        self.pares = 0
+
+    def classificar(self, pares):
+        self.chamadas += 1
+        self.pares += len(pares)
+        return [self.rotulos[par] for par in pares]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--planilha', default=PLANILHA_ROTULADA)
+    parser.add_argument('--referencia', default='Termo Pesquisado', help="Coluna de referência na planilha.")
+    parser.add_argument('--lote', type=int, default=20)
+    args = parser.parse_args()
+
+    rotulado = pd.read_excel(args.planilha)
+    rotulos = dict(zip(zip(rotulado['Nome'].astype(str), rotulado[args.referencia].astype(str)),
+                       rotulado['Comparativo']))
+    entrada = rotulado.drop(columns=['Comparativo'])
+
+    with tempfile.TemporaryDirectory() as pasta:
+        cache = CacheComparacoes(os.path.join(pasta, 'cache.sqlite'))
+        cliente = ClienteRotulos(rotulos)
+        inicio = time.perf_counter()
+        resultado = gerar_comparativo(entrada, cliente=cliente, cache=cache,
+                                      coluna_referencia=args.referencia, tamanho_lote=args.lote)
+        decorrido = time.perf_counter() - inicio
+        segunda = ClienteRotulos(rotulos)
+        gerar_comparativo(entrada, cliente=segunda, cache=cache, coluna_referencia=args.referencia)
+        cache.fechar()
+    sem_llm = gerar_comparativo(entrada, coluna_referencia=args.referencia)
+
+    pre_filtro = ~resultado['Motivo Comparativo'].str.startswith('LLM')
+    concorda = resultado['Comparativo'] == rotulado['Comparativo']
+    pares = len(rotulado[['Nome', args.referencia]].drop_duplicates())
+    print(f"\n📊 {len(rotulado)} anúncios, {pares} pares distintos ({decorrido:.2f}s sem contar o LLM real):")
+    print(f"  pré-filtro decidiu {pre_filtro.mean():.0%} dos anúncios, concordando com os rótulos em "
+          f"{concorda[pre_filtro].mean():.0%}")
+    print(f"  LLM: {cliente.pares} pares em {cliente.chamadas} chamadas (um par por chamada seriam {pares}); "
+          f"2ª rodada: {segunda.chamadas} chamadas (cache)")
+    print(f"  sem LLM (só semelhança): {(sem_llm['Comparativo'] == rotulado['Comparativo']).mean():.0%} de concordância")
+
+
+if __name__ == "__main__":
+    main()
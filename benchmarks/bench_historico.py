@@ -0,0 +1,94 @@
+"""Benchmark do histórico de preços: gravação e consultas com muitas observações.
+
+Simula o robô gravando, dia após dia, os produtos de vários termos (alguns mudam
+de preço a cada coleta) e mede as consultas usadas pela sugestão de preço.
+
+    python benchmarks/bench_historico.py [--termos 500] [--por-termo 40] [--dias 60]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.historico import DIA, HistoricoPrecos, precos_medianos
+
+
+def coletas_sinteticas(termos, por_termo, semente=0):
+    """Uma coleta (termo, URL, preço, vendedor) por produto; o preço muda a cada chamada."""
+    gerador = np.random.default_rng(semente)
+    produtos = termos * por_termo
+    lojas = gerador.integers(10_000, 99_999, produtos)
+    itens = gerador.integers(10**9, 10**10, produtos)
+    base = pd.DataFrame({
+        'termo': np.repeat([f'termo {i}' for i in range(termos)], por_termo),
+        'URL': [f'https://shopee.com.br/produto-i.{loja}.{item}' for loja, item in zip(lojas, itens)],
+        'Vendedor': [f'loja {loja}' for loja in lojas],
+    })
+    precos = gerador.uniform(50, 3000, produtos).round(2)
+    while True:
+        # ~10% dos produtos mudam de preço entre duas coletas
+        muda = gerador.random(produtos) < 0.1
+        precos = np.where(muda, (precos * gerador.uniform(0.85, 1.1, produtos)).round(2), precos)
+        yield base.assign(**{'Preço (R$)': precos})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--termos', type=int, default=500)
+    parser.add_argument('--por-termo', type=int, default=40)
+    parser.add_argument('--dias', type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        historico = HistoricoPrecos(os.path.join(pasta, 'historico.sqlite'))
+        agora = time.time()
+        coletas = coletas_sinteticas(args.termos, args.por_termo)
+        inicio = time.perf_counter()
+        for dia in range(args.dias, 0, -1):
+            coleta = next(coletas)
+            historico.importar(coleta, 'termo', agora - dia * DIA)
+        gravacao = time.perf_counter() - inicio
+        observacoes = args.dias * len(coleta)
+
+        inicio = time.perf_counter()
+        # Como o robô grava: um produto por vez
+        for dados in coleta.head(2000).to_dict('records'):
+            historico.registrar(dados['termo'], [dados], agora)
+        unitario = (time.perf_counter() - inicio) / min(2000, len(coleta))
+
+        tempos = {}
+        for nome, consulta in [
+            ('último preço (todos)', lambda: historico.ultimos_precos()),
+            ('último preço (1 termo)', lambda: historico.ultimos_precos('termo 7')),
+            ('mín/máx 7 dias', lambda: historico.extremos(7, agora)),
+            ('mudanças 7 dias', lambda: historico.eventos(dias=7, agora=agora)),
+            ('mudanças (1 termo)', lambda: historico.eventos(termo='termo 7')),
+            ('mediana 7 dias', lambda: historico.medianas(7, agora)),
+        ]:
+            inicio = time.perf_counter()
+            resultado = consulta()
+            tempos[nome] = (time.perf_counter() - inicio, len(resultado))
+        medianas = historico.medianas(7, agora)
+        inicio = time.perf_counter()
+        precos_medianos(coleta, medianas)
+        aplicar = time.perf_counter() - inicio
+        tamanho = os.path.getsize(os.path.join(pasta, 'historico.sqlite'))
+        historico.fechar()
+
+    print(f"\n📊 {observacoes:,} observações ({args.termos * args.por_termo:,} produtos x {args.dias} dias), "
+          f"{tamanho / 2**20:.0f} MB:")
+    print(f"  gravação em lote: {gravacao:.1f}s ({observacoes / gravacao:,.0f} observações/s); "
+          f"um produto por vez: {unitario * 1000:.2f} ms")
+    for nome, (tempo, linhas) in tempos.items():
+        print(f"  {nome:24s} {tempo * 1000:8.0f} ms  ({linhas:,} linhas)")
+    print(f"  {'mediana -> preços':24s} {aplicar * 1000:8.0f} ms  ({len(coleta):,} linhas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark da sugestão incremental: só os termos alterados x relatório inteiro.
+
+Gera um relatório completo, altera os preços de uma fração dos termos e compara
+recalcular tudo com `atualizar_sugestoes` (que reaproveita os termos sem mudança).
+Confere que os dois relatórios são iguais.
+
+    python benchmarks/bench_incremental.py [--anuncios 200000] [--por-termo 20] [--alterados 0.05]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from bench_sugestao import gerar_anuncios
+from belmicro.incremental import atualizar_sugestoes, impressoes_termos, variacoes_precos
+from belmicro.sugestao import COLUNA_ANALISE, gerar_sugestoes
+
+COMPARADAS = ["percentil 25", "undercut por volume"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--anuncios', type=int, default=200_000)
+    parser.add_argument('--por-termo', type=int, default=20)
+    parser.add_argument('--alterados', type=float, default=0.05, help="Fração dos termos com preços alterados.")
+    args = parser.parse_args()
+
+    df = gerar_anuncios(args.anuncios, args.por_termo)
+    configuracao = (COLUNA_ANALISE, "3º menor", tuple(COMPARADAS))
+    anterior = gerar_sugestoes(df, comparar=COMPARADAS)
+    impressoes = impressoes_termos(df, configuracao=configuracao)
+
+    # Nova coleta: uma fração dos termos com preços 5% diferentes
+    gerador = np.random.default_rng(7)
+    termos = df["Termo Pesquisado"].unique()
+    alterados = gerador.choice(termos, int(len(termos) * args.alterados), replace=False)
+    novo = df.copy()
+    mascara = novo["Termo Pesquisado"].isin(alterados) & (gerador.random(len(novo)) < 0.5)
+    novo.loc[mascara, "Preço (R$)"] = (novo.loc[mascara, "Preço (R$)"] * 0.95).round(2)
+
+    inicio = time.perf_counter()
+    completo = gerar_sugestoes(novo, comparar=COMPARADAS)
+    tempo_completo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    incremental, _, recalculados = atualizar_sugestoes(novo, anterior, impressoes, comparar=COMPARADAS)
+    tempo_incremental = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    variacoes = variacoes_precos(anterior, incremental)
+    tempo_delta = time.perf_counter() - inicio
+
+    iguais = completo.astype(str).equals(incremental.astype(str))
+    print(f"\n📊 {len(novo)} anúncios, {len(termos)} termos, {len(recalculados)} recalculados "
+          f"({len(alterados)} com preço alterado):")
+    print(f"  relatório inteiro:  {tempo_completo:.2f}s")
+    print(f"  incremental:        {tempo_incremental:.2f}s ({tempo_completo / tempo_incremental:.1f}x); "
+          f"mesmo relatório: {'✅' if iguais else '❌'}")
+    print(f"  variações de preço: {tempo_delta:.2f}s, {len(variacoes)} linhas "
+          f"{variacoes['Situação'].value_counts().to_dict()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Vazão do índice local de produtos (classificar e buscar) com anúncios sintéticos.
+
+Os anúncios são variações dos nomes da planilha rotulada (tokens embaralhados,
+palavras de anúncio a mais, capacidade trocada), quase todos distintos, para
+medir o custo real de normalização + pontuação. Compara com o pré-filtro par a par.
+
+    python benchmarks/bench_indice.py [--anuncios 100000] [--max-par-a-par 20000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.comparacao.indice import IndiceProdutos, _tokens_nome
+from belmicro.comparacao.prefiltro import classificar_par, descrever
+
+PLANILHA_ROTULADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '2_limpeza',
+                                 'RESULTADO_COMPARATIVO_GROQ_COMPLETO_V2.xlsx')
+PALAVRAS_ANUNCIO = ['promoção', 'envio', 'rápido', 'lançamento', 'premium', 'inox', 'branco', 'preto', '127v',
+                    '220v', 'bivolt', 'garantia', 'nf', 'loja', 'top', 'usado', 'vitrine']
+
+
+def gerar_anuncios(base, quantidade, semente=0):
+    """Anúncios sintéticos (nome, referência) a partir dos pares reais."""
+    gerador = np.random.default_rng(semente)
+    escolhidos = gerador.integers(0, len(base), quantidade)
+    nomes, referencias = [], []
+    for posicao in escolhidos:
+        nome, referencia = base[posicao]
+        palavras = nome.split()
+        gerador.shuffle(palavras)
+        palavras += list(gerador.choice(PALAVRAS_ANUNCIO, gerador.integers(0, 4)))
+        if gerador.random() < 0.2:
+            palavras.append(f"{gerador.integers(5, 60)}L")
+        nomes.append(' '.join(palavras))
+        referencias.append(referencia)
+    return pd.Series(nomes), pd.Series(referencias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--planilha', default=PLANILHA_ROTULADA)
+    parser.add_argument('--anuncios', type=int, default=100_000)
+    parser.add_argument('--max-par-a-par', type=int, default=20_000,
+                        help="Anúncios medidos no pré-filtro par a par (é bem mais lento).")
+    args = parser.parse_args()
+
+    rotulado = pd.read_excel(args.planilha)
+    base = list(rotulado[['Nome', 'Termo Pesquisado']].astype(str).itertuples(index=False, name=None))
+    nomes, referencias = gerar_anuncios(base, args.anuncios)
+
+    inicio = time.perf_counter()
+    indice = IndiceProdutos(referencias)
+    montagem = time.perf_counter() - inicio
+    _tokens_nome.cache_clear()
+    inicio = time.perf_counter()
+    resultado = indice.classificar(nomes, referencias)
+    classificacao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    indice.classificar(nomes, referencias)
+    repetida = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    melhores = indice.buscar(nomes, k=3)
+    busca = time.perf_counter() - inicio
+
+    amostra = min(args.max_par_a_par, len(nomes))
+    descrever.cache_clear()
+    inicio = time.perf_counter()
+    esperado = [classificar_par(n, r) for n, r in zip(nomes[:amostra], referencias[:amostra])]
+    par_a_par = time.perf_counter() - inicio
+    iguais = (resultado['motivo'][:amostra].to_numpy() == np.array([m for _, m in esperado])).mean()
+
+    acerto = (melhores.drop_duplicates('posicao').set_index('posicao')['referencia']
+              .reindex(range(len(nomes))) == referencias).mean()
+    print(f"\n📊 {len(nomes)} anúncios ({nomes.nunique()} nomes distintos), {len(indice)} referências "
+          f"(índice montado em {montagem * 1000:.0f} ms):")
+    print(f"  classificar: {classificacao:.2f}s ({len(nomes) / classificacao:,.0f} anúncios/s); "
+          f"com os nomes já normalizados: {repetida:.2f}s ({len(nomes) / repetida:,.0f}/s)")
+    print(f"  pré-filtro par a par: {par_a_par:.2f}s para {amostra} ({amostra / par_a_par:,.0f} anúncios/s); "
+          f"mesma decisão em {iguais:.1%}")
+    print(f"  buscar (top 3): {busca:.2f}s ({len(nomes) / busca:,.0f} anúncios/s); "
+          f"referência certa em 1º lugar em {acerto:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark da conversão de preços/contagens: vetorizada x célula a célula.
+
+Os valores esperados de cada formato ficam no corpus de tests/test_numeros.py.
+
+    python benchmarks/bench_numeros.py [--linhas 1000000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.numeros import converter_numeros, converter_precos
+
+# Textos como vêm da página (formatos vistos na Shopee)
+FORMATOS = [
+    'R$ 1.234,56', 'R$ 89,90', 'R$1.299', '1.234', '2.345.678', '10.5', '4,8', 'R$ 100 - R$ 150',
+    'R$ 79,90 ~ R$ 99,90', '4,9 mil', '4,9k', '1,2mil vendidos', '12 mil avaliações', '350 vendidos', '0',
+    'Não encontrado', '',
+]
+
+
+def limpar_numero_antigo(texto):
+    """Cópia do limpar_numero original do robô (referência de desempenho)."""
+    if not isinstance(texto, str):
+        return texto
+    texto_limpo = texto.lower()
+    if 'mil' in texto_limpo:
+        texto_limpo = texto_limpo.replace('mil', '000')
+    if 'k' in texto_limpo:
+        texto_limpo = texto_limpo.replace('k', '000')
+    numeros = re.sub(r'[^\d,]', '', texto_limpo)
+    if ',' in numeros:
+        try:
+            return float(numeros.replace(',', '.'))
+        except ValueError:
+            return texto
+    try:
+        return int(numeros)
+    except ValueError:
+        return texto
+
+
+def limpar_preco_antigo(valor):
+    """Cópia do limpar_preco original da sugestão (referência de desempenho)."""
+    if pd.isna(valor): return np.nan
+    if isinstance(valor, (int, float)):
+        if valor > 50000: return valor / 100.0
+        return float(valor)
+    s = str(valor).replace("R$", "").strip()
+    if ',' in s:
+        s = s.replace(".", "")
+        s = s.replace(",", ".")
+    try:
+        preco = float(s)
+        if preco > 50000: return preco / 100.0
+        return preco
+    except Exception: return np.nan
+
+
+def gerar_textos(linhas, semente=42):
+    """Coluna sintética: metade com os FORMATOS conhecidos, metade com preços variados.
+
+    Os preços aleatórios ("R$ 12.345,67") garantem muitos textos distintos, para
+    a medição não depender só da repetição de valores.
+    """
+    rng = np.random.default_rng(semente)
+    modelos = np.array(FORMATOS, dtype=object)
+    repetidos = pd.Series(modelos[rng.integers(0, len(modelos), linhas // 2)], dtype=object)
+
+    n = linhas - len(repetidos)
+    reais = pd.Series(rng.integers(1, 20000, n))
+    centavos = pd.Series(rng.integers(0, 100, n)).astype(str).str.zfill(2)
+    milhar = (reais // 1000).astype(str) + '.' + (reais % 1000).astype(str).str.zfill(3)
+    reais_txt = milhar.where(reais >= 1000, reais.astype(str))
+    variados = ('R$ ' + reais_txt + ',' + centavos).astype(object)
+
+    return pd.concat([repetidos, variados], ignore_index=True).sample(frac=1, random_state=semente).reset_index(drop=True)
+
+
+def medir(nome, funcao, linhas):
+    inicio = time.perf_counter()
+    funcao()
+    decorrido = time.perf_counter() - inicio
+    print(f"  {nome:<38} {decorrido:8.2f}s  ({linhas / decorrido:,.0f} linhas/s)")
+    return decorrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    serie = gerar_textos(args.linhas)
+    print(f"⏱️ {args.linhas:,} linhas:")
+    antigo = medir("limpar_numero (.apply)", lambda: serie.apply(limpar_numero_antigo), args.linhas)
+    novo = medir("converter_numeros (vetorizado)", lambda: converter_numeros(serie), args.linhas)
+    medir("limpar_preco (.apply)", lambda: serie.apply(limpar_preco_antigo), args.linhas)
+    medir("converter_precos (vetorizado)", lambda: converter_precos(serie), args.linhas)
+    print(f"  -> {antigo / novo:.1f}x mais rápido que o limpar_numero.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""Suíte de desempenho do pipeline, offline: coleta, leitura do HTML, limpeza, comparativo, sugestão e XLSX.
+
+A coleta roda contra a Shopee local (servidor_shopee.py, páginas gravadas com
+CAPTCHA, login, respostas lentas e layout antigo) pelo motor HTTP, pelo pool de
+workers do robô e pela fila da coleta distribuída. As etapas seguintes usam os anúncios sintéticos de
+dados_sinteticos.py em cada tamanho de --linhas (padrão: 10 mil, 100 mil e 1 milhão).
+
+Para cada etapa mostra o tempo, a vazão (itens/s) e o pico de memória do Python.
+A memória é medida numa segunda rodada da etapa, com tracemalloc, porque ele
+deixa o código cheio de objetos pequenos (openpyxl, lxml) várias vezes mais lento;
+`--sem-memoria` pula essa rodada. `--salvar` grava os números em JSON e
+`--comparar` mostra a variação contra uma execução anterior, marcando as
+regressões (código de saída 1 se houver alguma).
+
+    python benchmarks/bench_pipeline.py [--linhas 10000 100000 1000000] [--termos 10]
+                                        [--salvar base.json] [--comparar base.json]
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+import requests
+from lxml import html as lxml_html
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.armazenamento import ler_parquet, gravar_parquet
+from belmicro.comparacao import gerar_comparativo
+from belmicro.etapa_sugestao import ESTRATEGIA, ESTRATEGIAS_COMPARADAS, comparar_relatorio, gravar_planilha
+from belmicro.produtos import chave_produto
+from belmicro.sugestao import gerar_sugestoes
+
+from dados_sinteticos import anuncios_coletados
+from servidor_shopee import ServidorShopee
+
+# Uma etapa que ficar mais lenta que isso em relação à execução comparada é regressão
+TOLERANCIA_REGRESSAO = 0.2
+# Arrendamento curto na coleta distribuída, para o do worker caído vencer logo
+ARRENDAMENTO_BENCH = 2
+XPATH_LINKS = '//li[contains(@class,"shopee-search-item-result__item")]//a/@href'
+
+
+def _rodar(funcao):
+    """(resultado, segundos) de `funcao()`, sem as mensagens que ela imprime."""
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(etapa, itens, funcao, memoria=True):
+    """Tempo de `funcao()` e, numa segunda rodada, o pico de memória; devolve (resultado, registro)."""
+    resultado, segundos = _rodar(funcao)
+    pico_mb = None
+    if memoria:
+        tracemalloc.start()
+        _rodar(funcao)
+        pico_mb = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        tracemalloc.stop()
+    quantidade = itens(resultado) if callable(itens) else itens
+    registro = {'etapa': etapa, 'itens': quantidade, 'segundos': round(segundos, 3),
+                'por_segundo': round(quantidade / segundos, 1) if segundos else None, 'pico_mb': pico_mb}
+    print(f"  {etapa:<24} {quantidade:>9,} itens {segundos:8.2f}s {registro['por_segundo'] or 0:>11,.0f}/s "
+          + (f"{pico_mb:>8.1f} MB" if pico_mb is not None else ""))
+    return resultado, registro
+
+
+def links_da_busca(sessao, url_base, termo, limite_paginas, max_produtos, link_valido, cartoes=None,
+                   relevancia=None):
+    """Links de produto das páginas de resultado do termo (mesmos filtros do robô).
+
+    Com um dict em `cartoes`, guarda nele os campos brutos do cartão de cada link.
+    Com um FiltroRelevancia, pagina como o robô: a meta conta só os cartões
+    relevantes, para na página sem nenhum e devolve todos os links (o filtro escolhe).
+    """
+    from belmicro.coleta.seletores import avaliar_cartoes_lxml
+
+    links, chaves_vistas, relevantes = [], set(), 0
+    for numero_pagina in range(limite_paginas):
+        resposta = sessao.get(f"{url_base}/search", params={'keyword': termo, 'page': numero_pagina})
+        arvore = lxml_html.fromstring(resposta.content)
+        if cartoes is None:
+            encontrados = [(href, None) for href in arvore.xpath(XPATH_LINKS)]
+        else:
+            encontrados = avaliar_cartoes_lxml(arvore, url_base)
+        novos = relevantes_pagina = 0
+        for href, campos in encontrados:
+            if link_valido(href) and chave_produto(href) not in chaves_vistas:
+                chaves_vistas.add(chave_produto(href))
+                links.append(href)
+                if cartoes is not None:
+                    cartoes[href] = campos
+                if relevancia is not None:
+                    relevantes_pagina += relevancia.avaliar(href, (campos.get('Nome') or [''])[0])
+                novos += 1
+        if relevancia is not None:
+            relevancia.paginas_lidas = numero_pagina + 1
+            relevantes += relevantes_pagina
+            relevancia.parou_cedo = not relevantes_pagina
+            if not novos or relevancia.parou_cedo or relevantes >= max_produtos:
+                return links
+        elif not novos or len(links) >= max_produtos:
+            break
+    return links if relevancia is not None else links[:max_produtos]
+
+
+def bench_coleta(servidor, args):
+    """Coleta (busca + produtos pelo motor HTTP) e leitura do HTML das páginas gravadas."""
+    # Importados só aqui: o robô lê SHOPEE_URL_BASE ao carregar a configuração
+    from belmicro.coleta.bloqueio import BLOQUEIOS
+    from belmicro.coleta.config import PERFIS
+    from belmicro.coleta.distribuida import enfileirar_termos, montar_saida, trabalhar
+    from belmicro.coleta.extracao import completar_com_cartao, dados_do_cartao, extrair_dados_html, id_loja
+    from belmicro.coleta.motores import MotorHttp, MotorReciclavel
+    from belmicro.coleta.fila import TERMO, FilaColeta
+    from belmicro.coleta.paginacao import link_valido
+    from belmicro.coleta.pool import PoolNavegadores
+    from belmicro.coleta.relevancia import FiltroRelevancia
+
+    perfil = PERFIS['limpeza']
+    termos = [f"Produto Belmicro {numero:03d}" for numero in range(args.termos)]
+    sessao = requests.Session()
+    registros = []
+
+    def coletar():
+        servidor.servidas.clear()
+        pool = PoolNavegadores(args.navegadores,
+                               lambda id_worker: MotorReciclavel(lambda: MotorHttp(extrair_dados_html),
+                                                                 pausa_bloqueio=0),
+                               lambda motor, url: motor.extrair(url), pausa=None).iniciar()
+        produtos = []
+        for termo in termos:
+            links = links_da_busca(sessao, servidor.url_base, termo, perfil.limite_paginas,
+                                   perfil.max_produtos, link_valido)
+            produtos += pool.extrair(links)
+        pool.encerrar()
+        return produtos
+
+    produtos, registro = medir('coleta (http)', len, coletar, args.memoria)
+    registros.append(registro)
+    incompletos = sum('Não encontrado' in dados.values() for dados in produtos)
+    print(f"    páginas servidas: {dict(servidor.servidas)}; {incompletos} produtos com campos faltando")
+    print(f"    {BLOQUEIOS.resumo()}")
+
+    def coletar_cartoes(vendedores):
+        """Como o robô com cartoes='completar': só abre o produto cuja loja ainda não tem nome conhecido."""
+        servidor.servidas.clear()
+        pool = PoolNavegadores(args.navegadores,
+                               lambda id_worker: MotorReciclavel(lambda: MotorHttp(extrair_dados_html),
+                                                                 pausa_bloqueio=0),
+                               lambda motor, url: motor.extrair(url), pausa=None).iniciar()
+        produtos = []
+        for termo in termos:
+            cartoes, pendentes = {}, {}
+            for url in links_da_busca(sessao, servidor.url_base, termo, perfil.limite_paginas,
+                                      perfil.max_produtos, link_valido, cartoes):
+                dados = dados_do_cartao(url, cartoes[url], vendedores)
+                if 'Não encontrado' in (dados[campo] for campo in perfil.campos_cartao):
+                    pendentes[url] = dados
+                else:
+                    produtos.append(dados)
+            for dados in pool.extrair(list(pendentes)):
+                produtos.append(completar_com_cartao(dados, pendentes[dados['URL']]))
+                if dados['Vendedor'] != 'Não encontrado':
+                    vendedores[id_loja(dados['URL'])] = dados['Vendedor']
+        pool.encerrar()
+        return produtos
+
+    # 1ª vez nenhuma loja é conhecida; na 2ª os nomes vêm da 1ª (no robô, do histórico de preços)
+    vendedores = {}
+    for etapa in ('coleta (cartões)', 'coleta (cartões, 2ª)'):
+        produtos, registro = medir(etapa, len, lambda: coletar_cartoes(vendedores), args.memoria)
+        registros.append(registro)
+        abertos = sum(quantidade for tipo, quantidade in servidor.servidas.items() if tipo.startswith('produto'))
+        print(f"    páginas servidas: {dict(servidor.servidas)}; {len(produtos) - abertos} produtos "
+              f"sem abrir a página")
+
+    def coletar_relevantes():
+        """Como o robô com --relevancia: só os cartões parecidos com a referência são abertos."""
+        servidor.servidas.clear()
+        pool = PoolNavegadores(args.navegadores,
+                               lambda id_worker: MotorReciclavel(lambda: MotorHttp(extrair_dados_html),
+                                                                 pausa_bloqueio=0),
+                               lambda motor, url: motor.extrair(url), pausa=None).iniciar()
+        produtos = []
+        contagem['poupados'] = contagem['paginas_busca'] = 0
+        for termo in termos:
+            # Na Shopee local o termo é o próprio nome do produto de referência
+            cartoes, filtro = {}, FiltroRelevancia(termo)
+            links = links_da_busca(sessao, servidor.url_base, termo, perfil.limite_paginas,
+                                   perfil.max_produtos, link_valido, cartoes, filtro)
+            produtos += pool.extrair(filtro.escolher(links, cartoes, perfil.max_produtos))
+            contagem['poupados'] += filtro.poupados
+            contagem['paginas_busca'] += filtro.paginas_lidas
+        pool.encerrar()
+        return produtos
+
+    contagem = {}
+    produtos, registro = medir('coleta (relevância)', len, coletar_relevantes, args.memoria)
+    registros.append(registro)
+    acessorios = sum(dados['Nome'].split()[0] in ('Capa', 'Suporte', 'Prato', 'Filtro', 'Kit', 'Controle',
+                                                   'Placa', 'Tampa') for dados in produtos)
+    print(f"    páginas servidas: {dict(servidor.servidas)}; {contagem['poupados']} acessórios deixaram de ser "
+          f"abertos, {acessorios} abertos mesmo assim")
+
+    def coletar_distribuido():
+        """Como a coleta distribuída: workers em volta da fila SQLite, um deles cai segurando um termo."""
+        servidor.servidas.clear()
+        with tempfile.TemporaryDirectory() as pasta:
+            fila = FilaColeta(os.path.join(pasta, 'fila.sqlite'))
+            enfileirar_termos(fila, perfil, pd.DataFrame({perfil.coluna_pesquisa: termos,
+                                                          perfil.coluna_referencia: termos}))
+            # Arrendado e sem batimento: vence e outro worker faz a busca
+            fila.arrendar('worker caído', ARRENDAMENTO_BENCH, tipos=(TERMO,))
+
+            def worker(numero):
+                fila_worker = FilaColeta(fila.caminho)
+                sessao_worker = requests.Session()
+                motor = MotorReciclavel(lambda: MotorHttp(extrair_dados_html), pausa_bloqueio=0)
+                trabalhar(fila_worker, f'worker {numero}',
+                          lambda termo, referencia: links_da_busca(sessao_worker, servidor.url_base, termo,
+                                                                   perfil.limite_paginas, perfil.max_produtos,
+                                                                   link_valido),
+                          motor.extrair, ARRENDAMENTO_BENCH, pausa=0.1)
+                motor.encerrar()
+                fila_worker.fechar()
+
+            workers = [threading.Thread(target=worker, args=(numero,)) for numero in range(args.navegadores)]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            produtos, falharam = montar_saida(fila, perfil)
+            contagem['fila'] = fila.contagem()
+            fila.fechar()
+        return produtos
+
+    produtos, registro = medir('coleta (fila)', len, coletar_distribuido, args.memoria)
+    registros.append(registro)
+    termos_na_saida = len({dados['Termo_Pesquisado_Otimizado'] for dados in produtos})
+    print(f"    páginas servidas: {dict(servidor.servidas)}; {termos_na_saida}/{len(termos)} termos na saída "
+          f"(um deles vencido no worker caído); fila: {contagem['fila']}")
+
+    # Uma página de cada tipo, lidas em rodízio (as bloqueadas não chegam ao lxml)
+    amostras = {}
+    for url in itertools.chain.from_iterable(
+            links_da_busca(sessao, servidor.url_base, termo, 1, perfil.max_produtos, link_valido)
+            for termo in termos):
+        resposta = sessao.get(url)
+        if resposta.history:
+            continue
+        tipo = 'completo' if 'application/ld+json' in resposta.text else 'sem_seletores'
+        amostras.setdefault(tipo, (resposta.text, url))
+    paginas = list(itertools.islice(itertools.cycle(amostras.values()), args.paginas_html))
+    _, registro = medir('html (lxml)', len(paginas),
+                        lambda: [extrair_dados_html(html, url) for html, url in paginas], args.memoria)
+    registros.append(registro)
+    return registros
+
+
+def bench_dados(linhas, pasta, args):
+    """Limpeza, comparativo, sugestão e XLSX para `linhas` anúncios sintéticos."""
+    from belmicro.coleta.config import PERFIS
+    from belmicro.coleta.extracao import normalizar_campos_numericos
+
+    inicio = time.perf_counter()
+    coletados = anuncios_coletados(linhas)
+    print(f"\n📦 {linhas:,} anúncios sintéticos (gerados em {time.perf_counter() - inicio:.1f}s):")
+    registros = []
+    arquivo = os.path.join(pasta, f'limpeza_{linhas}.parquet')
+
+    def limpar():
+        df = normalizar_campos_numericos(coletados.copy())
+        gravar_parquet(df, arquivo, PERFIS['limpeza'].esquema)
+        return ler_parquet(arquivo)
+
+    limpos, registro = medir('limpeza + parquet', linhas, limpar, args.memoria)
+    registros.append(registro)
+    del coletados
+
+    comparativo, registro = medir('comparativo (sem LLM)', linhas, lambda: gerar_comparativo(limpos), args.memoria)
+    registros.append(registro)
+    del limpos
+
+    relatorio, registro = medir('sugestão', linhas, lambda: gerar_sugestoes(
+        comparativo, estrategia=ESTRATEGIA, comparar=ESTRATEGIAS_COMPARADAS), args.memoria)
+    registros.append(registro)
+    del comparativo
+
+    if len(relatorio) > args.max_xlsx:
+        print(f"  {'xlsx (relatório)':<24} pulado: {len(relatorio):,} linhas > --max-xlsx {args.max_xlsx:,}")
+    else:
+        arquivo_xlsx = os.path.join(pasta, f'relatorio_{linhas}.xlsx')
+        _, registro = medir('xlsx (relatório)', len(relatorio), lambda: gravar_planilha(
+            arquivo_xlsx, relatorio, comparar_relatorio(relatorio, ESTRATEGIA), ESTRATEGIA), args.memoria)
+        registros.append(registro)
+    for registro in registros:
+        registro['linhas'] = linhas
+    return registros
+
+
+def comparar(registros, caminho):
+    """Variação do tempo de cada etapa contra a execução salva em `caminho`; devolve as regressões."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        anteriores = {(r['etapa'], r.get('linhas')): r for r in json.load(arquivo)['etapas']}
+    regressoes = []
+    print(f"\n📈 Comparação com '{caminho}':")
+    for registro in registros:
+        anterior = anteriores.get((registro['etapa'], registro.get('linhas')))
+        if not anterior:
+            continue
+        variacao = registro['segundos'] / anterior['segundos'] - 1 if anterior['segundos'] else 0.0
+        marca = '⚠️ regressão' if variacao > TOLERANCIA_REGRESSAO else ''
+        if marca:
+            regressoes.append(registro)
+        tamanho = f" ({registro['linhas']:,})" if registro.get('linhas') else ''
+        memoria = (f"; memória {anterior['pico_mb']:.0f} -> {registro['pico_mb']:.0f} MB"
+                   if anterior.get('pico_mb') is not None and registro['pico_mb'] is not None else '')
+        print(f"  {registro['etapa'] + tamanho:<34} {anterior['segundos']:8.2f}s -> {registro['segundos']:8.2f}s "
+              f"({variacao:+.0%}){memoria} {marca}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--termos', type=int, default=10, help="Termos pesquisados na Shopee local.")
+    parser.add_argument('--navegadores', type=int, default=4, help="Workers do pool na coleta.")
+    parser.add_argument('--paginas-html', type=int, default=3000, help="Páginas de produto lidas com lxml.")
+    parser.add_argument('--atraso', type=float, default=1.5, help="Atraso das páginas lentas (s).")
+    parser.add_argument('--max-xlsx', type=int, default=200_000,
+                        help="Relatórios maiores que isso não são gravados em XLSX (limite do Excel ~1M linhas).")
+    parser.add_argument('--sem-coleta', action='store_true', help="Mede só as etapas com dados sintéticos.")
+    parser.add_argument('--sem-memoria', dest='memoria', action='store_false',
+                        help="Não roda cada etapa uma segunda vez para medir a memória.")
+    parser.add_argument('--salvar', help="Grava os resultados em JSON.")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparar.")
+    args = parser.parse_args()
+
+    registros = []
+    with ServidorShopee(atraso=args.atraso) as servidor:
+        os.environ['SHOPEE_URL_BASE'] = servidor.url_base
+        if not args.sem_coleta:
+            print(f"🛍️ Coleta na Shopee local ({servidor.url_base}), {args.termos} termos:")
+            registros += bench_coleta(servidor, args)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            for linhas in args.linhas:
+                registros += bench_dados(linhas, pasta, args)
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump({'quando': time.strftime('%Y-%m-%d %H:%M:%S'), 'etapas': registros}, arquivo,
+                      ensure_ascii=False, indent=2)
+        print(f"\n💾 Resultados salvos em '{args.salvar}'.")
+    if args.comparar and comparar(registros, args.comparar):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Benchmark da gravação do relatório: write-only com estilos x formatação célula a célula.
+
+Mede tempo e pico de memória (tracemalloc) das duas formas de gravar o mesmo
+relatório, para alguns tamanhos. A memória do write-only deve ficar quase
+constante com o número de linhas. A forma antiga cresce mais que linearmente, por
+isso só é medida até --max-antigo linhas.
+
+    python benchmarks/bench_relatorio.py [--linhas 5000 20000 100000] [--max-antigo 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.relatorio import (AMARELO, ESTILO_CENTRO, ESTILO_DESTAQUE, escrever_aba,
+                                formatar_reais, novo_workbook, salvar_workbook)
+from belmicro.sugestao import VENDEDOR_BELMICRO
+
+
+def gerar_relatorio(linhas, semente=42):
+    """Relatório já formatado (texto R$), no formato do sujestao_preço.py."""
+    rng = np.random.default_rng(semente)
+    vendedor = rng.choice(np.array(["Carrefour", "Magazine Luiza", "Loja do Zé", VENDEDOR_BELMICRO]), linhas)
+    return pd.DataFrame({
+        "Termo Pesquisado (produto belmicro)": [f"Produto Belmicro {i // 20:06d}" for i in range(linhas)],
+        "Termo Encontrado": [f"Anúncio concorrente número {i}" for i in range(linhas)],
+        "Vendedor Concorrente": vendedor,
+        "Preço Concorrente (R$)": formatar_reais(rng.uniform(50, 5000, linhas).round(2)),
+        "Preço Belmicro (R$)": formatar_reais(rng.uniform(50, 5000, linhas).round(2)),
+        "Preço Sugerido (R$)": formatar_reais(rng.uniform(50, 5000, linhas).round(2), sufixo=" (3º menor)"),
+        "Posição Belmicro": "2º de 5",
+        "Avaliação Belmicro": rng.choice([4.5, 4.9, 5.0], linhas),
+        "Avaliação Concorrente": rng.choice([4.5, 4.9, 5.0, np.nan], linhas),
+        "Link da Loja": "https://shopee.com.br/loja",
+        "URL": [f"https://shopee.com.br/produto-i.1.{i}" for i in range(linhas)],
+    })
+
+
+def gravar_antigo(df_final, caminho):
+    """Gravação original do sujestao_preço.py (to_excel + laços de formatação)."""
+    with pd.ExcelWriter(caminho, engine="openpyxl") as writer:
+        df_final.to_excel(writer, index=False, sheet_name="Relatorio_Final")
+        ws = writer.sheets["Relatorio_Final"]
+        green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+        yellow_fill = PatternFill(start_color="FFFFE0", end_color="FFFFE0", fill_type="solid")
+        align_center = Alignment(horizontal="center")
+        bold_font = Font(bold=True)
+        for cell in ws["1:1"]:
+            cell.font = bold_font
+            cell.alignment = align_center
+        col_letra_sugerido = get_column_letter(df_final.columns.get_loc("Preço Sugerido (R$)") + 1)
+        col_letra_conc = get_column_letter(df_final.columns.get_loc("Preço Concorrente (R$)") + 1)
+        col_letra_bel = get_column_letter(df_final.columns.get_loc("Preço Belmicro (R$)") + 1)
+        col_letra_vendedor = get_column_letter(df_final.columns.get_loc("Vendedor Concorrente") + 1)
+        for row in range(2, ws.max_row + 1):
+            ws[f"{col_letra_sugerido}{row}"].fill = green_fill
+            ws[f"{col_letra_sugerido}{row}"].alignment = align_center
+            ws[f"{col_letra_conc}{row}"].alignment = align_center
+            ws[f"{col_letra_bel}{row}"].alignment = align_center
+            cell_vendedor = ws[f"{col_letra_vendedor}{row}"]
+            if "BELMICRO (REFERÊNCIA)" in str(cell_vendedor.value):
+                for col_idx in range(1, ws.max_column + 1):
+                    ws.cell(row=row, column=col_idx).fill = yellow_fill
+        for col in ws.columns:
+            max_length = 0
+            column = col[0].column_letter
+            for cell in col:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except:
+                    pass
+            ws.column_dimensions[column].width = min(max_length + 2, 60)
+
+
+def gravar_novo(df_final, caminho):
+    estilos = {"Preço Concorrente (R$)": ESTILO_CENTRO, "Preço Belmicro (R$)": ESTILO_CENTRO,
+               "Preço Sugerido (R$)": ESTILO_DESTAQUE}
+    wb = novo_workbook()
+    escrever_aba(wb, "Relatorio_Final", df_final, estilos_colunas=estilos,
+                 destacar_linhas=("Vendedor Concorrente", VENDEDOR_BELMICRO, AMARELO))
+    salvar_workbook(wb, caminho)
+
+
+def medir(funcao, df, caminho):
+    inicio = time.perf_counter()
+    funcao(df, caminho)
+    decorrido = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcao(df, caminho)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return decorrido, pico / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, nargs='+', default=[5_000, 20_000, 100_000])
+    parser.add_argument('--max-antigo', type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>9} | {'antigo (s)':>10} {'pico MB':>8} | {'write-only (s)':>14} {'pico MB':>8} | ganho")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "relatorio.xlsx")
+        for linhas in args.linhas:
+            df = gerar_relatorio(linhas)
+            t_novo, m_novo = medir(gravar_novo, df, caminho)
+            if linhas > args.max_antigo:
+                print(f"{linhas:>9,} | {'-':>10} {'-':>8} | {t_novo:>14.2f} {m_novo:>8.1f} |")
+                continue
+            t_antigo, m_antigo = medir(gravar_antigo, df, caminho)
+            print(f"{linhas:>9,} | {t_antigo:>10.2f} {m_antigo:>8.1f} | {t_novo:>14.2f} {m_novo:>8.1f} | "
+                  f"{t_antigo / t_novo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
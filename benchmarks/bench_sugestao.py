@@ -0,0 +1,150 @@
+"""Benchmark da sugestão de preço: groupby vetorizado x laço por termo.
+
+Confere que o relatório vetorizado bate com o laço antigo (mesmas linhas, mesma
+ordem) e mede os dois num conjunto sintético de anúncios.
+
+    python benchmarks/bench_sugestao.py [--anuncios 200000] [--por-termo 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.numeros import converter_precos
+from belmicro.sugestao import gerar_sugestoes
+
+VENDEDORES = ["Belmicro Oficial", "Carrefour", "Magazine Luiza", "Loja do Zé", "Casas Bahia",
+              "Eletro Sul", "Mega Ofertas", "Fast Shop", None]
+
+
+def gerar_sugestoes_antigo(df, coluna_analise="Comparativo"):
+    """Laço original do sujestao_preço.py (etapas 4.1 a 4.3), para comparação."""
+    mapa_precos_belmicro = {}
+    mapa_avaliacoes_belmicro = {}
+    for termo, grupo in df.groupby("Termo Pesquisado"):
+        belmicro_row = grupo[grupo["Vendedor"].str.contains("belmicro", case=False, na=False)]
+        if not belmicro_row.empty:
+            mapa_precos_belmicro[termo] = belmicro_row.iloc[0]["Preço Belmicro (R$)"]
+            mapa_avaliacoes_belmicro[termo] = belmicro_row.iloc[0]["Avaliação Média"]
+
+    df_aprovados = df[df[coluna_analise].str.startswith('SIM', na=False)].copy()
+    linhas = []
+    for termo, grupo in df_aprovados.groupby("Termo Pesquisado"):
+        preco_belmicro = mapa_precos_belmicro.get(termo, np.nan)
+        avaliacao_belmicro = mapa_avaliacoes_belmicro.get(termo, "-")
+
+        concorrentes_df = grupo[~grupo["Vendedor"].str.contains("belmicro", case=False, na=False)]
+        precos_concorrentes = sorted(concorrentes_df["Preço (R$)"].dropna().unique().tolist())
+        precos_todos = list(precos_concorrentes)
+        if not np.isnan(preco_belmicro):
+            precos_todos.append(preco_belmicro)
+        precos_todos = sorted(list(set(precos_todos)))
+        if len(precos_todos) == 0:
+            continue
+
+        posicao = "-"
+        if not np.isnan(preco_belmicro) and preco_belmicro in precos_todos:
+            posicao = f"{precos_todos.index(preco_belmicro)+1}º de {len(precos_todos)}"
+
+        if len(precos_todos) >= 3:
+            preco_sugerido = precos_todos[2]
+        elif len(precos_todos) == 2:
+            preco_sugerido = precos_todos[1]
+        else:
+            preco_sugerido = precos_todos[0]
+
+        base = {"Preço Belmicro Atual": preco_belmicro, "Preço Sugerido": preco_sugerido,
+                "Posição Belmicro": posicao, "Avaliação Belmicro": avaliacao_belmicro}
+        belmicro_row_df = grupo[grupo["Vendedor"].str.contains("belmicro", case=False, na=False)]
+        if not belmicro_row_df.empty:
+            belmicro_row = belmicro_row_df.iloc[0]
+            linhas.append({
+                "Termo Pesquisado (produto belmicro)": termo,
+                "Termo Encontrado": belmicro_row["Nome"],
+                "Vendedor Concorrente": "BELMICRO (REFERÊNCIA)",
+                "Preço Concorrente": np.nan,
+                **base,
+                "Avaliação Concorrente": belmicro_row["Avaliação Média"],
+                "Link da Loja": belmicro_row["Link Loja"],
+                "URL": belmicro_row["URL"]
+            })
+        for _, row in concorrentes_df.iterrows():
+            linhas.append({
+                "Termo Pesquisado (produto belmicro)": termo,
+                "Termo Encontrado": row["Nome"],
+                "Vendedor Concorrente": row["Vendedor"],
+                "Preço Concorrente": row["Preço (R$)"],
+                **base,
+                "Avaliação Concorrente": row["Avaliação Média"],
+                "Link da Loja": row["Link Loja"],
+                "URL": row["URL"]
+            })
+        linhas.append({"Termo Pesquisado (produto belmicro)": "──────────────────────────────────────────────"})
+    return pd.DataFrame(linhas)
+
+
+def gerar_anuncios(anuncios, por_termo, semente=42):
+    """Planilha sintética no formato da saída da limpeza."""
+    rng = np.random.default_rng(semente)
+    termos = np.array([f"Produto Belmicro {i:06d}" for i in range(max(1, anuncios // por_termo))])
+    termo = rng.choice(termos, anuncios)
+    vendedor = rng.choice(np.array(VENDEDORES, dtype=object), anuncios)
+    preco_base = pd.Series(rng.uniform(50, 5000, len(termos)).round(0), index=termos)
+    preco = (preco_base[termo].to_numpy() * rng.uniform(0.8, 1.3, anuncios)).round(0)
+    preco[rng.random(anuncios) < 0.03] = np.nan
+    return pd.DataFrame({
+        "Nome": [f"Anúncio {i}" for i in range(anuncios)],
+        "Preço (R$)": preco,
+        "Avaliação Média": rng.choice([4.5, 4.8, 4.9, 5.0, np.nan], anuncios),
+        "Vendedor": vendedor,
+        "Link Loja": "https://shopee.com.br/loja",
+        "URL": [f"https://shopee.com.br/produto-i.1.{i}" for i in range(anuncios)],
+        "Termo Pesquisado": termo,
+        "Preço Belmicro (R$)": preco_base[termo].to_numpy(),
+        "Comparativo": rng.choice(["SIM", "SIM - mesmo modelo", "NÃO", None], anuncios),
+    })
+
+
+def conferir(df, nome):
+    esperado = gerar_sugestoes_antigo(df)
+    obtido = gerar_sugestoes(df)[esperado.columns]
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False)
+    print(f"✅ {nome}: {len(obtido):,} linhas idênticas ao laço antigo.")
+
+
+def medir(nome, funcao, anuncios):
+    inicio = time.perf_counter()
+    funcao()
+    decorrido = time.perf_counter() - inicio
+    print(f"  {nome:<34} {decorrido:8.2f}s  ({anuncios / decorrido:,.0f} anúncios/s)")
+    return decorrido
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--anuncios', type=int, default=200_000)
+    parser.add_argument('--por-termo', type=int, default=20)
+    parser.add_argument('--planilha', help="Planilha real da limpeza para conferir também")
+    args = parser.parse_args()
+
+    if args.planilha:
+        real = pd.read_excel(args.planilha)
+        for coluna in ("Preço (R$)", "Preço Belmicro (R$)"):
+            real[coluna] = converter_precos(real[coluna])
+        conferir(real, os.path.basename(args.planilha))
+    conferir(gerar_anuncios(5_000, args.por_termo), "sintético (5.000 anúncios)")
+
+    df = gerar_anuncios(args.anuncios, args.por_termo)
+    print(f"⏱️ {args.anuncios:,} anúncios, ~{args.por_termo} por termo:")
+    antigo = medir("laço por termo (antigo)", lambda: gerar_sugestoes_antigo(df), args.anuncios)
+    novo = medir("groupby vetorizado", lambda: gerar_sugestoes(df), args.anuncios)
+    print(f"  -> {antigo / novo:.1f}x mais rápido.")
+
+
+if __name__ == "__main__":
+    main()
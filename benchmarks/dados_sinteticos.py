@@ -0,0 +1,160 @@
+"""Conjuntos sintéticos para as etapas depois da coleta (limpeza, comparativo e sugestão).
+
+`anuncios_coletados(linhas)` imita a saída do robô no perfil limpeza: um produto
+Belmicro de referência por termo e ~`por_termo` anúncios, parte do mesmo modelo
+(nome embaralhado, palavras de anúncio) e parte de outro modelo. Os campos
+numéricos vêm como texto, nos formatos da página ("R$ 1.234,56", faixas
+"R$ 100 - R$ 150", "1,2mil", "Não encontrado"). É determinístico pela semente.
+
+    python benchmarks/dados_sinteticos.py --linhas 100000 --saida anuncios_100k.parquet
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from belmicro.comparacao.etapa import COLUNA_REFERENCIA
+
+# (tipo de produto, unidade da capacidade, capacidades)
+TIPOS = [
+    ('Micro-ondas', 'Litros', [20, 23, 27, 30, 34]),
+    ('Geladeira Frost Free', 'Litros', [300, 340, 375, 410, 480]),
+    ('Cervejeira', 'Litros', [82, 209, 393, 570, 810]),
+    ('Máquina de Lavar', 'Kg', [8, 11, 12, 13, 16]),
+    ('Ar Condicionado Split', 'BTU/h', [9000, 12000, 18000, 24000]),
+    ('Freezer Vertical', 'Litros', [142, 196, 231, 246]),
+    ('Cafeteira Elétrica', 'Litros', [0.6, 1.2, 1.5]),
+    ('Ventilador de Coluna', 'cm', [40, 50]),
+    ('Adega', 'Garrafas', [8, 12, 16, 24]),
+]
+MARCAS = ['Consul', 'Brastemp', 'Electrolux', 'Midea', 'Panasonic', 'Philco', 'Britânia', 'Mondial', 'Arno',
+          'Imbera', 'Mallory', 'Samsung', 'LG', 'Esmaltec', 'Springer']
+CORES = ['Branco', 'Preto', 'Inox', 'Prata', 'Full Black']
+VOLTAGENS = ['127V', '220V', 'Bivolt']
+PALAVRAS_ANUNCIO = ['Promoção', 'Envio Rápido', 'Lançamento', 'Original', 'Nf', 'Garantia', 'Oferta', 'Top']
+VENDEDORES = ['Carrefour', 'Magazine Luiza', 'Casas Bahia', 'Webcontinental Marketplace', 'Fast Shop',
+              'Eletro Sul', 'Mega Ofertas', 'Loja do Zé', 'Mercado Eletro']
+VENDEDOR_BELMICRO = 'Belmicro Oficial'
+# Coluna do termo buscado no perfil limpeza do robô (a de referência vem da comparação)
+COLUNA_PESQUISA = 'Termo_Pesquisado_Otimizado'
+ROTULOS_CONTAGEM = ['', ' vendidos', 'mil', 'mil vendidos']
+
+
+def referencias_belmicro(quantidade, semente=0):
+    """Nomes de produtos Belmicro distintos (tipo, marca, capacidade, cor, código do modelo e voltagem)."""
+    gerador = np.random.default_rng(semente)
+    tipos = gerador.integers(0, len(TIPOS), quantidade)
+    nomes = []
+    for posicao, indice_tipo in enumerate(tipos):
+        tipo, unidade, capacidades = TIPOS[indice_tipo]
+        marca = MARCAS[gerador.integers(len(MARCAS))]
+        capacidade = capacidades[gerador.integers(len(capacidades))]
+        # Código de modelo único por referência (como CMA20BB, MXSA27P1)
+        codigo = f"{marca[:2].upper()}{tipo[:1].upper()}{capacidade:g}{posicao:05X}".replace('.', '')
+        nomes.append(f"{tipo} {marca} {capacidade:g} {unidade} {CORES[gerador.integers(len(CORES))]} "
+                     f"{codigo} {VOLTAGENS[gerador.integers(len(VOLTAGENS))]}")
+    return nomes
+
+
+def _variacao(nome, gerador, outro_modelo):
+    """Nome de anúncio a partir da referência: embaralhado, com palavras de anúncio, talvez outro modelo."""
+    palavras = nome.split()
+    if outro_modelo:
+        # Troca o código do modelo (penúltima palavra) por outro da mesma linha
+        palavras[-2] = palavras[-2][:-2] + f"{gerador.integers(256):02X}"
+    corpo = palavras[:-2]
+    gerador.shuffle(corpo)
+    extras = list(gerador.choice(PALAVRAS_ANUNCIO, gerador.integers(0, 3)))
+    return ' '.join(corpo + palavras[-2:] + extras)
+
+
+def _reais(valor):
+    return f"R$ {valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def _textos_preco(precos, gerador):
+    """Preços como a página mostra: 'R$ 1.234,56', faixa 'R$ a - R$ b' ou número cru."""
+    formato = gerador.integers(0, 10, len(precos))
+    reais = pd.Series(precos).map(_reais).to_numpy(dtype=object)
+    faixas = [f"{texto} - {_reais(valor * 1.2)}" for texto, valor in zip(reais, precos)]
+    return np.where(formato == 0, faixas, np.where(formato == 1, precos.astype(str), reais))
+
+
+def _textos_contagem(valores, gerador):
+    """Contagens como '350', '1,2mil', '12mil vendidos' ou 'Não encontrado'."""
+    textos = np.where(valores >= 1000,
+                      pd.Series(valores / 1000).map(lambda valor: f"{valor:.1f}".replace('.', ',')).to_numpy(object),
+                      valores.astype(str))
+    sufixo = np.where(valores >= 1000, np.array(ROTULOS_CONTAGEM)[gerador.integers(2, 4, len(valores))],
+                      np.array(ROTULOS_CONTAGEM)[gerador.integers(0, 2, len(valores))])
+    textos = np.char.add(textos.astype(str), sufixo.astype(str)).astype(object)
+    textos[gerador.random(len(valores)) < 0.05] = 'Não encontrado'
+    return textos
+
+
+def _termo_busca(referencia):
+    palavras = referencia.split()
+    return ' '.join([next(palavra for palavra in palavras if palavra in MARCAS), palavras[-2]])
+
+
+def anuncios_coletados(linhas, por_termo=20, semente=0):
+    """DataFrame de `linhas` anúncios no formato da saída do robô (perfil limpeza), campos em texto."""
+    gerador = np.random.default_rng(semente)
+    termos = max(1, linhas // por_termo)
+    referencias = np.array(referencias_belmicro(termos, semente), dtype=object)
+    termo = np.sort(gerador.integers(0, termos, linhas))
+    # O primeiro anúncio de cada termo é o da própria Belmicro
+    belmicro = np.r_[True, termo[1:] != termo[:-1]]
+    outro_modelo = ~belmicro & (gerador.random(linhas) < 0.35)
+    nomes = np.array([nome if propria else _variacao(nome, gerador, outro)
+                      for nome, propria, outro in zip(referencias[termo], belmicro, outro_modelo)], dtype=object)
+
+    preco_base = gerador.uniform(150, 6000, termos).round(0)
+    precos = (preco_base[termo] * np.where(outro_modelo, gerador.uniform(0.5, 1.6, linhas),
+                                           gerador.uniform(0.85, 1.25, linhas))).round(2)
+    precos[belmicro] = preco_base[termo[belmicro]]
+    lojas = gerador.integers(10**8, 10**9, linhas)
+    itens = gerador.integers(10**10, 10**11, linhas)
+    vendedores = np.array(VENDEDORES, dtype=object)[gerador.integers(0, len(VENDEDORES), linhas)]
+    vendedores[belmicro] = VENDEDOR_BELMICRO
+    notas = pd.Series(gerador.choice([4.5, 4.7, 4.8, 4.9, 5.0], linhas)).map(lambda nota: f"{nota:.1f}".replace('.', ','))
+    notas[gerador.random(linhas) < 0.1] = 'Não encontrado'
+
+    urls = [f"https://shopee.com.br/produto-i.{loja}.{item}" for loja, item in zip(lojas, itens)]
+    return pd.DataFrame({
+        'Nome': nomes,
+        'Preço (R$)': _textos_preco(precos, gerador),
+        'Avaliação Média': notas.to_numpy(dtype=object),
+        'Total de Avaliações': _textos_contagem(gerador.choice([0, 3, 27, 140, 1250, 12800], linhas), gerador),
+        'Vendidos': _textos_contagem(gerador.choice([0, 5, 48, 350, 1200, 25000], linhas), gerador),
+        'Vendedor': vendedores,
+        'Link Loja': [f"https://shopee.com.br/loja{loja}" for loja in lojas],
+        'URL': urls,
+        COLUNA_REFERENCIA: referencias[termo],
+        # Termo otimizado da busca: marca + código do modelo
+        COLUNA_PESQUISA: [_termo_busca(nome) for nome in referencias[termo]],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--linhas', type=int, default=100_000)
+    parser.add_argument('--por-termo', type=int, default=20)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', required=True, help="Arquivo .parquet (ou .xlsx) gerado.")
+    args = parser.parse_args()
+
+    df = anuncios_coletados(args.linhas, args.por_termo, args.semente)
+    if args.saida.endswith('.xlsx'):
+        df.to_excel(args.saida, index=False)
+    else:
+        df.to_parquet(args.saida, index=False)
+    print(f"✅ {len(df):,} anúncios de {df['Vendedor'].eq(VENDEDOR_BELMICRO).sum():,} termos em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    main()
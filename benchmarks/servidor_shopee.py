@@ -0,0 +1,285 @@
+"""Servidor HTTP local que imita a Shopee com as páginas gravadas em benchmarks/paginas.
+
+Serve a busca (/search?keyword=...&page=N) e as páginas de produto
+(/<nome>-i.<loja>.<item>), montadas a partir dos modelos HTML gravados com dados
+sintéticos e determinísticos: o mesmo termo sempre devolve os mesmos produtos.
+Uma parte das páginas imita os problemas da Shopee real:
+
+  - sem_seletores: layout antigo, sem o JSON embutido e sem a seção da loja
+    (só os XPaths alternativos acham preço e avaliação; vendedor e vendidos faltam);
+  - lenta: a resposta demora `atraso` segundos;
+  - captcha: redireciona para /verify/captcha, como o bloqueio anti-robô;
+  - login: redireciona para /buyer/login, como quando a sessão cai.
+
+Para rodar o robô inteiro sem acessar a Shopee (o Chrome continua necessário no
+motor selenium):
+
+    python benchmarks/servidor_shopee.py --porta 8765
+    SHOPEE_URL_BASE=http://127.0.0.1:8765 python -m belmicro.coleta --perfil limpeza --entrada ...
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+PASTA_PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'paginas')
+PADRAO_PRODUTO = re.compile(r'^/(?P<slug>.+)-i\.(?P<loja>\d+)\.(?P<item>\d+)$')
+
+VENDEDORES = ['Belmicro Oficial', 'Carrefour', 'Magazine Luiza', 'Casas Bahia', 'Webcontinental Marketplace',
+              'Fast Shop', 'Eletro Sul', 'Mega Ofertas', 'Loja do Zé', 'Mercado Eletro']
+PALAVRAS_ANUNCIO = ['Promoção', 'Envio Rápido', 'Lançamento', 'Original', 'Com Nota Fiscal', 'Garantia',
+                    'Oferta', 'Premium']
+LOCAIS = ['São Paulo', 'Rio de Janeiro', 'Minas Gerais', 'Paraná', 'Santa Catarina', 'Exterior']
+# Peças e acessórios que a busca mistura aos produtos, cada vez mais nas páginas seguintes
+ACESSORIOS = ['Capa Protetora', 'Suporte de Parede', 'Prato Giratório', 'Filtro de Reposição', 'Kit Borrachas',
+              'Controle Remoto', 'Placa Eletrônica', 'Tampa']
+ACESSORIOS_POR_PAGINA = 0.35
+# Ids das lojas: como na Shopee, as mesmas lojas aparecem em muitos termos
+LOJAS = random.Random(0).sample(range(10**8, 10**9), 200)
+
+
+def preencher(modelo, **valores):
+    """Troca os {{campos}} do modelo gravado (str.format não serve: o HTML tem chaves)."""
+    for campo, valor in valores.items():
+        modelo = modelo.replace('{{' + campo + '}}', str(valor))
+    return modelo
+
+
+def sortear(*chave):
+    """Número em [0, 1) fixo para a chave: o mesmo termo/página/item tem sempre o mesmo destino."""
+    return zlib.crc32('|'.join(map(str, chave)).encode()) / 2**32
+
+
+def formatar_reais(valor):
+    return f"{valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def formatar_quantidade(valor):
+    """Como a Shopee mostra contagens: 350, 1,2mil, 12mil."""
+    if valor < 1000:
+        return str(valor)
+    return f"{valor / 1000:.1f}".rstrip('0').rstrip('.').replace('.', ',') + 'mil'
+
+
+def slug(nome):
+    return re.sub(r'[^\w]+', '-', nome).strip('-')
+
+
+class ServidorShopee:
+    """Shopee falsa num ThreadingHTTPServer em segundo plano (use com `with`)."""
+
+    def __init__(self, porta=0, captcha=0.02, lentas=0.05, sem_seletores=0.1, atraso=1.5,
+                 paginas_por_termo=3, por_pagina=60, pasta=PASTA_PAGINAS, login=0.01):
+        self.porta = porta
+        self.captcha = captcha
+        self.login = login
+        self.lentas = lentas
+        self.sem_seletores = sem_seletores
+        self.atraso = atraso
+        self.paginas_por_termo = paginas_por_termo
+        self.por_pagina = por_pagina
+        self.modelos = {}
+        for arquivo in os.listdir(pasta):
+            if arquivo.endswith('.html'):
+                with open(os.path.join(pasta, arquivo), encoding='utf-8') as entrada:
+                    self.modelos[arquivo[:-5]] = entrada.read()
+        # Páginas servidas por tipo (busca, busca_vazia, produto, produto_sem_seletores, captcha, login, lenta...)
+        self.servidas = Counter()
+        self._trava = threading.Lock()
+        self._http = None
+
+    @property
+    def url_base(self):
+        return f"http://127.0.0.1:{self._http.server_address[1]}"
+
+    def iniciar(self):
+        self._http = ThreadingHTTPServer(('127.0.0.1', self.porta), _Requisicao)
+        self._http.daemon_threads = True
+        self._http.shopee = self
+        threading.Thread(target=self._http.serve_forever, daemon=True).start()
+        return self
+
+    def encerrar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *erro):
+        self.encerrar()
+
+    def contar(self, tipo):
+        with self._trava:
+            self.servidas[tipo] += 1
+
+    def destino(self, *chave):
+        """'captcha', 'login', 'lenta', 'sem_seletores' ou 'normal' para a página da chave."""
+        sorteio = sortear(*chave)
+        for tipo, proporcao in (('captcha', self.captcha), ('login', self.login), ('lenta', self.lentas),
+                                ('sem_seletores', self.sem_seletores)):
+            if sorteio < proporcao:
+                return tipo
+            sorteio -= proporcao
+        return 'normal'
+
+    def produtos_da_busca(self, termo, pagina):
+        """(URL, nome, dados) dos produtos de uma página de resultado do termo.
+
+        Uma fração crescente a cada página (30%, 65%, 100%) são acessórios do produto.
+        """
+        gerador = random.Random(f'{termo}|{pagina}')
+        acessorios = min(1.0, 0.3 + ACESSORIOS_POR_PAGINA * pagina)
+        produtos = []
+        for posicao in range(self.por_pagina):
+            loja = gerador.choice(LOJAS)
+            item = gerador.randint(10**10, 10**11)
+            extras = gerador.sample(PALAVRAS_ANUNCIO, gerador.randint(0, 2))
+            if gerador.random() < acessorios:
+                nome = f"{gerador.choice(ACESSORIOS)} Compatível {termo}"
+            elif gerador.random() < 0.7:
+                nome = ' '.join([termo, *extras])
+            else:
+                nome = ' '.join([*extras, termo, 'Similar'])
+            url = f"{self.url_base}/{quote(slug(nome))}-i.{loja}.{item}"
+            produtos.append((url, nome, dados_produto(nome, loja, item)))
+        return produtos
+
+    def pagina_busca(self, termo, pagina):
+        if pagina >= self.paginas_por_termo:
+            self.contar('busca_vazia')
+            return preencher(self.modelos['busca_vazia'], termo=termo)
+        self.contar('busca')
+        cartoes = ''.join(
+            preencher(self.modelos['cartao'], url=url, nome=nome, preco=formatar_reais(dados['preco']),
+                      vendidos=formatar_quantidade(dados['vendidos']), local=dados['local'],
+                      nota=f"{dados['nota']:.1f}", estrela=f"{self.url_base}/imagem/estrela.svg",
+                      imagem=f"{self.url_base}/imagem/{dados['item']}.webp")
+            for url, nome, dados in self.produtos_da_busca(termo, pagina)
+        )
+        return preencher(self.modelos['busca'], termo=termo, pagina=pagina + 1, cartoes=cartoes)
+
+    def pagina_produto(self, nome, loja, item, tipo):
+        dados = dados_produto(nome, loja, item)
+        self.contar('produto_sem_seletores' if tipo == 'sem_seletores' else 'produto')
+        modelo = self.modelos['produto_sem_seletores' if tipo == 'sem_seletores' else 'produto']
+        return preencher(modelo, nome=nome, nome_json=json.dumps(nome, ensure_ascii=False),
+                         preco=formatar_reais(dados['preco']), preco_json=f"{dados['preco']:.2f}",
+                         nota=f"{dados['nota']:.1f}", avaliacoes=formatar_quantidade(dados['avaliacoes']),
+                         avaliacoes_json=dados['avaliacoes'], vendidos=formatar_quantidade(dados['vendidos']),
+                         vendedor=dados['vendedor'], link_loja=f"{self.url_base}/loja{loja}",
+                         imagem=f"{self.url_base}/imagem/{item}.webp")
+
+
+def dados_produto(nome, loja, item):
+    """Campos sintéticos do produto, sempre os mesmos para (loja, item)."""
+    gerador = random.Random(f'{loja}.{item}')
+    # Preço-base do produto anunciado (sem as palavras de anúncio): os anúncios do
+    # mesmo termo ficam em volta do mesmo preço, no cartão e na página
+    produto = slug(nome)
+    for palavra in PALAVRAS_ANUNCIO:
+        produto = produto.replace(slug(palavra), '')
+    preco_base = 50 + zlib.crc32(produto.strip('-').encode()) % 4000
+    return {
+        'item': item,
+        'preco': round(preco_base * gerador.uniform(0.85, 1.3), 2),
+        'nota': round(gerador.uniform(3.5, 5.0), 1),
+        'avaliacoes': gerador.choice([0, 3, 27, 140, 1250, 12800]),
+        'vendidos': gerador.choice([0, 5, 48, 350, 1200, 25000]),
+        'vendedor': VENDEDORES[loja % len(VENDEDORES)],
+        'local': LOCAIS[item % len(LOCAIS)],
+    }
+
+
+class _Requisicao(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass  # sem uma linha por requisição no terminal
+
+    def _responder(self, corpo, status=200, cabecalhos=None):
+        conteudo = corpo.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(conteudo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def do_GET(self):
+        shopee = self.server.shopee
+        partes = urlsplit(self.path)
+        caminho = unquote(partes.path)
+
+        if caminho == '/':
+            return self._responder(shopee.modelos['inicio'])
+        if caminho.startswith('/verify/'):
+            shopee.contar('captcha')
+            return self._responder(preencher(shopee.modelos['captcha'], id=partes.query))
+        if caminho == '/buyer/login':
+            shopee.contar('login')
+            return self._responder(preencher(shopee.modelos['login'], proximo=partes.query))
+
+        if caminho == '/search':
+            parametros = parse_qs(partes.query)
+            termo = parametros.get('keyword', [''])[0]
+            pagina = int(parametros.get('page', ['0'])[0])
+            tipo = shopee.destino('busca', termo, pagina)
+            chave = ('busca', termo, pagina)
+        else:
+            produto = PADRAO_PRODUTO.match(caminho)
+            if not produto:
+                return self._responder('<html><body>Página não encontrada</body></html>', status=404)
+            tipo = shopee.destino('produto', produto['loja'], produto['item'])
+            chave = ('produto', produto['loja'], produto['item'])
+
+        if tipo == 'captcha':
+            return self._responder('', status=302, cabecalhos={
+                'Location': f"/verify/captcha?anti_bot_tracking_id={zlib.crc32(str(chave).encode())}"})
+        if tipo == 'login':
+            return self._responder('', status=302, cabecalhos={'Location': f"/buyer/login?next={quote(self.path)}"})
+        if tipo == 'lenta':
+            shopee.contar('lenta')
+            time.sleep(shopee.atraso)
+
+        if caminho == '/search':
+            return self._responder(shopee.pagina_busca(termo, pagina))
+        nome = produto['slug'].replace('-', ' ')
+        return self._responder(shopee.pagina_produto(nome, int(produto['loja']), int(produto['item']), tipo))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--captcha', type=float, default=0.02, help="Fração das páginas com CAPTCHA.")
+    parser.add_argument('--login', type=float, default=0.01, help="Fração das páginas que caem no login.")
+    parser.add_argument('--lentas', type=float, default=0.05, help="Fração das páginas que demoram --atraso s.")
+    parser.add_argument('--sem-seletores', type=float, default=0.1, help="Fração dos produtos no layout antigo.")
+    parser.add_argument('--atraso', type=float, default=1.5)
+    parser.add_argument('--paginas', type=int, default=3, help="Páginas de resultado por termo.")
+    args = parser.parse_args()
+
+    servidor = ServidorShopee(args.porta, captcha=args.captcha, lentas=args.lentas,
+                              sem_seletores=args.sem_seletores, atraso=args.atraso,
+                              paginas_por_termo=args.paginas, login=args.login).iniciar()
+    print(f"🛍️ Shopee local em {servidor.url_base} (Ctrl+C para parar)")
+    print(f"   Rode o robô com SHOPEE_URL_BASE={servidor.url_base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n📊 Páginas servidas: {dict(servidor.servidas)}")
+        servidor.encerrar()
+
+
+if __name__ == "__main__":
+    main()
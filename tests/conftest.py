@@ -0,0 +1,20 @@
+"""Configuração comum dos testes: raiz do repositório no sys.path e páginas gravadas da Shopee."""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture
+def pagina():
+    """Lê uma página gravada em tests/fixtures pelo nome (sem o .html)."""
+    def ler(nome):
+        with open(os.path.join(PASTA_FIXTURES, f'{nome}.html'), encoding='utf-8') as entrada:
+            return entrada.read()
+    return ler
@@ -0,0 +1,17 @@
+"""Linha de comando do comparativo (belmicro.comparacao.cli)."""
+
+import pandas as pd
+
+from belmicro.comparacao.cli import main
+
+
+def test_sem_groq_api_key_informa_o_erro_em_vez_de_quebrar(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv('GROQ_API_KEY', raising=False)
+    entrada = tmp_path / 'resultados.csv'
+    pd.DataFrame({'Nome': ['Micro-ondas Consul 20L'], 'Termo_Referencia_Belmicro': ['Micro-ondas Consul 20L']}
+                 ).to_csv(entrada, index=False)
+
+    assert main(['--entrada', str(entrada), '--saida', str(tmp_path / 'saida.parquet')]) is None
+    saida = capsys.readouterr().out
+    assert 'GROQ_API_KEY' in saida
+    assert '--sem-llm' in saida
@@ -0,0 +1,59 @@
+"""Perfis das etapas do robô (belmicro.coleta.config): arquivos, colunas de termo e esquema."""
+
+import os
+
+from belmicro.coleta.config import PerfilExecucao, criar_perfis
+
+
+def test_perfis_das_duas_etapas(tmp_path):
+    perfis = criar_perfis(str(tmp_path / 'bruta'), str(tmp_path / 'limpeza'))
+
+    assert set(perfis) == {'coleta', 'limpeza'}
+    coleta, limpeza = perfis['coleta'], perfis['limpeza']
+    assert coleta.arquivo_entrada == limpeza.arquivo_entrada == str(tmp_path / 'bruta' / 'lista produtos.xlsx')
+    assert os.path.dirname(coleta.arquivo_saida) == str(tmp_path / 'bruta')
+    assert os.path.dirname(limpeza.arquivo_saida) == str(tmp_path / 'limpeza')
+    assert (coleta.max_produtos, limpeza.max_produtos) == (45, 20)
+
+
+def test_colunas_obrigatorias():
+    perfis = criar_perfis()
+
+    assert perfis['coleta'].colunas_obrigatorias == ['Descricao']
+    assert perfis['limpeza'].colunas_obrigatorias == ['Descricao', 'Termo_Busca']
+
+
+def test_rotular_coleta():
+    dados = criar_perfis()['coleta'].rotular({'Nome': 'Forno'}, 'Forno Elétrico 44L', 'ignorada')
+
+    assert dados == {'Nome': 'Forno', 'Termo Pesquisado': 'Forno Elétrico 44L'}
+
+
+def test_rotular_limpeza():
+    dados = criar_perfis()['limpeza'].rotular({}, 'Consul CMA20BB', 'Micro-ondas Consul 20L Branco')
+
+    assert dados == {
+        'Termo_Referencia_Belmicro': 'Micro-ondas Consul 20L Branco',
+        'Termo_Pesquisado_Otimizado': 'Consul CMA20BB',
+    }
+
+
+def test_esquema_tem_os_campos_do_produto_e_as_colunas_de_termo():
+    esquema = criar_perfis()['limpeza'].esquema
+
+    assert esquema.names[:2] == ['Nome', 'Preço (R$)']
+    assert esquema.names[-2:] == ['Termo_Referencia_Belmicro', 'Termo_Pesquisado_Otimizado']
+    assert str(esquema.field('Preço (R$)').type) == 'double'
+    assert str(esquema.field('Termo_Pesquisado_Otimizado').type) == 'string'
+
+
+def test_arquivos_auxiliares_ao_lado_da_saida(tmp_path):
+    perfil = PerfilExecucao(nome='teste', arquivo_entrada='entrada.xlsx',
+                            arquivo_saida=str(tmp_path / 'saida.parquet'), coluna_pesquisa='Descricao',
+                            colunas_termo={'Termo Pesquisado': 'pesquisa'})
+
+    assert perfil.arquivo_diario == str(tmp_path / 'diario_teste.sqlite')
+    assert perfil.arquivo_cache == str(tmp_path / 'cache_produtos_teste.sqlite')
+    assert perfil.arquivo_estado == str(tmp_path / 'estado_teste.sqlite')
+    assert perfil.arquivo_historico == str(tmp_path / 'historico_precos_teste.sqlite')
+    assert perfil.arquivo_metricas == str(tmp_path / 'metricas_teste.jsonl')
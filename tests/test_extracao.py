@@ -0,0 +1,108 @@
+"""Extração a partir do HTML baixado (motor http) com as páginas gravadas em tests/fixtures."""
+
+import pytest
+from lxml import html as lxml_html
+
+from belmicro.coleta.bloqueio import BUSCA, CAPTCHA, LOGIN, PRODUTO, VAZIA, PaginaBloqueada, classificar_arvore
+from belmicro.coleta.extracao import dados_do_cartao, extrair_dados_html
+from belmicro.coleta.seletores import avaliar_cartoes_lxml
+
+URL_PRODUTO = 'https://shopee.com.br/Micro-ondas-Electrolux-20L-MEF41-i.123456789.22334455667'
+URL_BUSCA = 'https://shopee.com.br/search?keyword=Micro-ondas%20Electrolux%2020L&page=0'
+
+
+def test_produto_usa_json_embutido_e_seletores(pagina):
+    dados = extrair_dados_html(pagina('produto'), URL_PRODUTO)
+
+    assert dados['Nome'] == 'Micro-ondas Electrolux 20L MEF41'
+    # Preço, nota e avaliações saem do JSON-LD, já como número
+    assert dados['Preço (R$)'] == 3348.96
+    assert dados['Avaliação Média'] == 3.6
+    assert dados['Total de Avaliações'] == 1250
+    # O resto sai dos seletores, como texto bruto (convertido depois na coluna inteira)
+    assert dados['Vendidos'].split() == ['0', 'Vendidos']
+    assert dados['Vendedor'] == 'Mercado Eletro'
+    assert dados['Link Loja'] == 'https://shopee.com.br/loja123456789'
+    assert dados['URL'] == URL_PRODUTO
+
+
+def test_produto_com_total_de_avaliacoes_em_texto_no_json(pagina):
+    html = pagina('produto').replace('"ratingCount": "1250"', '"ratingCount": "1,2mil"')
+
+    assert extrair_dados_html(html, URL_PRODUTO)['Total de Avaliações'] == 1200
+
+
+def test_produto_com_json_invalido_cai_nos_seletores(pagina):
+    html = pagina('produto').replace('"@type": "Product",', '"@type": "Product"')
+
+    dados = extrair_dados_html(html, URL_PRODUTO)
+
+    assert dados['Nome'] == 'Micro-ondas Electrolux 20L MEF41'
+    assert dados['Preço (R$)'] == 'R$3.348,96'
+    assert dados['Total de Avaliações'] == '1,2mil'
+
+
+def test_produto_no_layout_antigo_usa_os_xpaths_alternativos(pagina):
+    dados = extrair_dados_html(pagina('produto_sem_seletores'), URL_PRODUTO)
+
+    assert dados['Nome'] == 'Micro-ondas Electrolux 20L MEF41'
+    assert dados['Preço (R$)'] == 'R$3.348,96'
+    assert dados['Avaliação Média'] == '3.6'
+    assert dados['Total de Avaliações'] == '1,2mil avaliações'
+    for campo in ('Vendidos', 'Vendedor', 'Link Loja'):
+        assert dados[campo] == 'Não encontrado'
+
+
+@pytest.mark.parametrize('nome, estado', [('captcha', CAPTCHA), ('login', LOGIN)])
+def test_bloqueio_pelo_html_levanta_pagina_bloqueada(pagina, nome, estado):
+    with pytest.raises(PaginaBloqueada) as erro:
+        extrair_dados_html(pagina(nome), URL_PRODUTO)
+
+    assert erro.value.estado == estado
+    assert erro.value.url == URL_PRODUTO
+
+
+def test_bloqueio_pela_url_vale_mesmo_com_html_de_produto(pagina):
+    url = 'https://shopee.com.br/verify/captcha?anti_bot_tracking_id=1'
+
+    with pytest.raises(PaginaBloqueada) as erro:
+        extrair_dados_html(pagina('produto'), url)
+
+    assert erro.value.estado == CAPTCHA
+
+
+@pytest.mark.parametrize('nome, estado', [
+    ('produto', PRODUTO), ('produto_sem_seletores', PRODUTO), ('busca', BUSCA), ('busca_vazia', VAZIA),
+    ('captcha', CAPTCHA), ('login', LOGIN),
+])
+def test_classificar_arvore(pagina, nome, estado):
+    assert classificar_arvore(lxml_html.fromstring(pagina(nome)), URL_BUSCA) == estado
+
+
+def test_cartoes_da_busca(pagina):
+    cartoes = avaliar_cartoes_lxml(lxml_html.fromstring(pagina('busca')), URL_BUSCA)
+
+    assert [url for url, _ in cartoes] == [
+        'https://shopee.com.br/Micro-ondas-Electrolux-20L-Oferta-i.628984689.75926784596',
+        'https://shopee.com.br/Micro-ondas-Electrolux-20L-Envio-R%C3%A1pido-i.395959887.36688513186',
+        'https://shopee.com.br/Capa-Protetora-Compat%C3%ADvel-Micro-ondas-Electrolux-20L-i.196448168.17709031790',
+    ]
+    url, brutos = cartoes[0]
+    assert brutos == {
+        'Nome': ['Micro-ondas Electrolux 20L Oferta', 0],
+        'Preço (R$)': ['4.898,67', 0],
+        'Avaliação Média': ['4.8', 0],
+        'Vendidos': ['25mil vendidos', 0],
+    }
+
+
+def test_produto_montado_com_o_cartao(pagina):
+    url, brutos = avaliar_cartoes_lxml(lxml_html.fromstring(pagina('busca')), URL_BUSCA)[0]
+
+    dados = dados_do_cartao(url, brutos, vendedores={'628984689': 'Carrefour'})
+
+    assert dados['Nome'] == 'Micro-ondas Electrolux 20L Oferta'
+    assert dados['Preço (R$)'] == '4.898,67'
+    assert dados['Vendedor'] == 'Carrefour'
+    assert dados['Link Loja'] == 'https://shopee.com.br/shop/628984689'
+    assert dados['Total de Avaliações'] == 'Não encontrado'
@@ -0,0 +1,86 @@
+"""Conversão vetorizada de preços e contagens (belmicro.numeros)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from belmicro.numeros import LIMITE_CORRECAO_100X, converter_numeros, converter_precos
+
+# (texto como vem da página, valor esperado)
+CORPUS_NUMEROS = [
+    ('R$ 1.234,56', 1234.56),
+    ('R$ 89,90', 89.90),
+    ('R$1.299', 1299.0),
+    ('1.234', 1234.0),
+    ('2.345.678', 2345678.0),
+    ('10.5', 10.5),
+    ('4,8', 4.8),
+    ('R$ 100 - R$ 150', 100.0),
+    ('R$ 79,90 ~ R$ 99,90', 79.90),
+    ('4,9 mil', 4900.0),
+    ('4,9k', 4900.0),
+    ('1,2mil vendidos', 1200.0),
+    ('12 mil avaliações', 12000.0),
+    ('350 vendidos', 350.0),
+    ('0', 0.0),
+    (499.9, 499.9),
+    (1299, 1299.0),
+    ('Não encontrado', np.nan),
+    ('', np.nan),
+    (None, np.nan),
+]
+
+# (valor, preço esperado) com a correção de 100x
+CORPUS_PRECOS = [
+    ('R$ 8.990.000', 89900.0),
+    (129900, 1299.0),
+    ('R$ 49.999,00', 49999.0),
+    ('99,90', 99.90),
+]
+
+
+@pytest.mark.parametrize('texto, esperado', CORPUS_NUMEROS)
+def test_corpus_converter_numeros(texto, esperado):
+    np.testing.assert_allclose(converter_numeros(pd.Series([texto], dtype=object)).to_numpy(), [esperado])
+
+
+def test_corpus_converter_numeros_na_mesma_coluna():
+    # Todos juntos: os textos distintos são convertidos de uma vez (factorize)
+    entradas = pd.Series([texto for texto, _ in CORPUS_NUMEROS], dtype=object)
+
+    np.testing.assert_allclose(converter_numeros(entradas).to_numpy(), [valor for _, valor in CORPUS_NUMEROS])
+
+
+@pytest.mark.parametrize('valor, esperado', CORPUS_PRECOS)
+def test_corpus_converter_precos(valor, esperado):
+    np.testing.assert_allclose(converter_precos(pd.Series([valor], dtype=object)).to_numpy(), [esperado])
+
+
+def test_converter_precos_sem_correcao():
+    precos = converter_precos(pd.Series(['R$ 129.900', 'R$ 89,90'], dtype=object), corrigir_100x=False)
+
+    np.testing.assert_allclose(precos.to_numpy(), [129900.0, 89.90])
+
+
+def test_converter_precos_respeita_o_limite():
+    no_limite = float(LIMITE_CORRECAO_100X)
+
+    precos = converter_precos(pd.Series([no_limite, no_limite + 1]), limite=LIMITE_CORRECAO_100X)
+
+    np.testing.assert_allclose(precos.to_numpy(), [no_limite, (no_limite + 1) / 100])
+
+
+def test_converter_precos_mantem_o_indice_e_os_vazios():
+    serie = pd.Series(['R$ 10,00', 'Não encontrado', None], index=[7, 3, 5], dtype=object)
+
+    precos = converter_precos(serie)
+
+    assert list(precos.index) == [7, 3, 5]
+    assert precos.loc[7] == 10.0
+    assert precos.loc[[3, 5]].isna().all()
+
+
+def test_converter_numeros_em_coluna_so_com_numeros():
+    numeros = converter_numeros(pd.Series([1.5, 2, None], dtype=object))
+
+    np.testing.assert_allclose(numeros.to_numpy(), [1.5, 2.0, np.nan])
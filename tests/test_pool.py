@@ -0,0 +1,87 @@
+"""Pool de navegadores: perfis dos workers e extração em paralelo contra a Shopee local (benchmarks/servidor_shopee.py)."""
+
+import os
+import threading
+
+import pytest
+import requests
+from lxml import html as lxml_html
+
+from belmicro.coleta.pool import PoolNavegadores, preparar_perfis_workers
+from benchmarks.servidor_shopee import ServidorShopee
+
+# Sem a pausa entre produtos de cada worker
+SEM_PAUSA = (0, 0)
+
+
+def extrair_url(driver, url):
+    return {'URL': url}
+
+
+def extrair_pagina(sessao, url):
+    """Extração de teste: cada worker usa uma sessão HTTP no lugar do Chrome."""
+    arvore = lxml_html.fromstring(sessao.get(url, timeout=10).content)
+    return {'Nome': arvore.findtext('.//h1').strip(), 'URL': url}
+
+
+def test_perfis_dos_workers_sem_as_travas_do_chrome(tmp_path):
+    perfil = tmp_path / 'perfil'
+    (perfil / 'Default' / 'Cache').mkdir(parents=True)
+    (perfil / 'Default' / 'Cookies').write_text('sessao')
+    (perfil / 'SingletonLock').write_text('')
+
+    caminhos = preparar_perfis_workers(str(perfil), str(tmp_path / 'workers'), 2)
+
+    assert caminhos == [str(tmp_path / 'workers' / f'worker_{id_worker}') for id_worker in range(2)]
+    for caminho in caminhos:
+        assert open(os.path.join(caminho, 'Default', 'Cookies')).read() == 'sessao'
+        assert not os.path.exists(os.path.join(caminho, 'SingletonLock'))
+        assert not os.path.exists(os.path.join(caminho, 'Default', 'Cache'))
+
+
+def test_extrai_na_ordem_da_entrada():
+    pool = PoolNavegadores(2, lambda id_worker: id_worker, extrair_url, pausa=SEM_PAUSA)
+
+    assert pool.extrair(['a', 'b', 'c']) == [{'URL': 'a'}, {'URL': 'b'}, {'URL': 'c'}]
+
+
+def test_falha_na_extracao_nao_vira_linha():
+    def extrair(driver, url):
+        if url == 'b':
+            raise RuntimeError('timeout')
+        return {'URL': url}
+
+    pool = PoolNavegadores(2, lambda id_worker: id_worker, extrair, pausa=SEM_PAUSA)
+
+    assert pool.extrair(['a', 'b', 'c']) == [{'URL': 'a'}, {'URL': 'c'}]
+
+
+def test_workers_extraem_da_shopee_local():
+    concluidos = []
+    pool = PoolNavegadores(3, lambda id_worker: requests.Session(), extrair_pagina, pausa=SEM_PAUSA)
+    with ServidorShopee(captcha=0, login=0, lentas=0, sem_seletores=0, por_pagina=12) as servidor:
+        produtos = servidor.produtos_da_busca('Forno Elétrico 44L', 0)
+        try:
+            dados = pool.extrair([url for url, _, _ in produtos],
+                                 ao_concluir=lambda indice, _: concluidos.append(indice))
+        finally:
+            pool.encerrar()
+
+    assert [(produto['URL'], produto['Nome']) for produto in dados] == [(url, nome) for url, nome, _ in produtos]
+    assert sorted(concluidos) == list(range(len(produtos)))
+    assert servidor.servidas['produto'] == len(produtos)
+
+
+def test_gerador_que_falha_encerra_os_workers():
+    def links():
+        yield 'a'
+        raise RuntimeError('busca falhou')
+
+    pool = PoolNavegadores(2, lambda id_worker: id_worker, extrair_url, pausa=SEM_PAUSA)
+    antes = set(threading.enumerate())
+
+    with pytest.raises(RuntimeError, match='busca falhou'):
+        pool.extrair(links())
+
+    # Sem os sinais de fim, os workers ficariam parados na fila para sempre
+    assert set(threading.enumerate()) <= antes
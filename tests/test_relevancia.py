@@ -0,0 +1,41 @@
+"""Nota de relevância dos cartões da busca (belmicro.coleta.relevancia)."""
+
+import pytest
+
+from belmicro.coleta.relevancia import LIMIAR_RELEVANCIA, PESO_ACESSORIO, FiltroRelevancia, pontuar
+
+REFERENCIA = 'Micro-ondas Consul CMA20BB 20L'
+
+
+def test_mesmo_produto_vale_1():
+    assert pontuar('Micro-ondas Consul CMA20BB 20L Branco', REFERENCIA) == 1.0
+
+
+@pytest.mark.parametrize('nome', [
+    'Kit Micro-ondas Consul CMA20BB 20L',
+    'Capa Protetora Micro-ondas Consul CMA20BB 20L',
+    'Prato Giratório Compatível Micro-ondas Consul CMA20BB 20L',
+])
+def test_kit_e_acessorio_valem_um_terco(nome):
+    # 'kit' é palavra vazia na comparação de nomes, mas ainda marca o cartão como acessório
+    assert pontuar(nome, REFERENCIA) == pytest.approx(PESO_ACESSORIO)
+    assert pontuar(nome, REFERENCIA) < LIMIAR_RELEVANCIA
+
+
+def test_referencia_que_tambem_e_kit_nao_perde_nota():
+    assert pontuar('Kit Panelas Tramontina 5 Peças', 'Kit Panelas Tramontina 5 Peças') == 1.0
+
+
+def test_capacidade_diferente_zera():
+    assert pontuar('Micro-ondas Consul 30L', REFERENCIA) == 0.0
+
+
+def test_filtro_deixa_o_kit_de_fora():
+    cartoes = {
+        'kit': {'Nome': ['Kit Micro-ondas Consul CMA20BB 20L', 0]},
+        'produto': {'Nome': ['Micro-ondas Consul CMA20BB 20L Branco', 0]},
+    }
+    filtro = FiltroRelevancia(REFERENCIA)
+
+    assert list(filtro.filtrar(['kit', 'produto'], cartoes, 2)) == ['produto']
+    assert filtro.poupados == 1
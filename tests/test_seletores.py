@@ -0,0 +1,59 @@
+"""avaliar_spec_lxml: o mesmo resultado do script compilado, sobre o HTML já baixado."""
+
+from lxml import html as lxml_html
+
+from belmicro.coleta.seletores import SELETORES_PRODUTO, avaliar_spec_lxml
+
+URL_PRODUTO = 'https://shopee.com.br/Micro-ondas-Electrolux-20L-MEF41-i.123456789.22334455667'
+
+
+def avaliar(html, spec=SELETORES_PRODUTO, url_base=URL_PRODUTO):
+    return avaliar_spec_lxml(lxml_html.fromstring(html), url_base, spec)
+
+
+def test_layout_atual_usa_o_primeiro_xpath_de_cada_campo(pagina):
+    brutos = avaliar(pagina('produto'))
+
+    # Texto de todos os filhos do elemento, como o textContent do navegador
+    vendidos, indice = brutos.pop('Vendidos')
+    assert (vendidos.split(), indice) == (['0', 'Vendidos'], 0)
+    assert brutos == {
+        'Nome': ['Micro-ondas Electrolux 20L MEF41', 0],
+        'Preço (R$)': ['R$3.348,96', 0],
+        'Avaliação Média': ['3.6', 0],
+        'Total de Avaliações': ['1,2mil', 0],
+        'Vendedor': ['Mercado Eletro', 0],
+        'Link Loja': ['https://shopee.com.br/loja123456789', 0],
+    }
+
+
+def test_layout_antigo_usa_as_alternativas_e_marca_o_indice(pagina):
+    brutos = avaliar(pagina('produto_sem_seletores'))
+
+    assert brutos['Nome'] == ['Micro-ondas Electrolux 20L MEF41', 0]
+    assert brutos['Preço (R$)'] == ['R$3.348,96', 1]
+    assert brutos['Avaliação Média'] == ['3.6', 1]
+    assert brutos['Total de Avaliações'] == ['1,2mil avaliações', 1]
+    assert brutos['Vendidos'] is None
+    assert brutos['Vendedor'] is None
+    assert brutos['Link Loja'] is None
+
+
+def test_valor_vazio_passa_para_a_proxima_alternativa():
+    html = '<html><body><div class="IZPeQz">  </div><div class="pqTWkA">R$ 99,90</div></body></html>'
+
+    assert avaliar(html)['Preço (R$)'] == ['R$ 99,90', 1]
+
+
+def test_atributo_href_relativo_vira_endereco_completo():
+    spec = {'Link Loja': {'xpaths': ['//a'], 'atributo': 'href', 'tipo': 'texto'}}
+
+    brutos = avaliar('<html><body><a href="/shop/42">Loja</a></body></html>', spec)
+
+    assert brutos == {'Link Loja': ['https://shopee.com.br/shop/42', 0]}
+
+
+def test_atributo_vazio_conta_como_ausente():
+    spec = {'Link Loja': {'xpaths': ['//a'], 'atributo': 'href', 'tipo': 'texto'}}
+
+    assert avaliar('<html><body><a>Loja</a></body></html>', spec) == {'Link Loja': None}
@@ -0,0 +1,68 @@
+"""Robô contra a Shopee local (benchmarks/servidor_shopee.py), sem acessar a Shopee nem abrir o Chrome."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from belmicro.coleta.bloqueio import CAPTCHA, LOGIN, PaginaBloqueada
+from belmicro.coleta.extracao import extrair_dados_html
+from belmicro.coleta.motores import MotorHttp
+from benchmarks.servidor_shopee import ServidorShopee
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Roda num processo à parte: a configuração lê SHOPEE_URL_BASE uma única vez, ao ser importada
+SCRIPT_COLETA = """
+import json
+import requests
+from lxml import html as lxml_html
+from belmicro.coleta.config import DOMINIO, URL_BASE
+from belmicro.coleta.extracao import extrair_dados_html
+from belmicro.coleta.motores import MotorHttp
+from belmicro.coleta.paginacao import link_valido
+from belmicro.coleta.seletores import avaliar_cartoes_lxml
+
+resposta = requests.get(f"{URL_BASE}/search", params={'keyword': 'Forno Elétrico 44L', 'page': 0})
+links = [url for url, _ in avaliar_cartoes_lxml(lxml_html.fromstring(resposta.content), URL_BASE)]
+motor = MotorHttp(extrair_dados_html)
+print(json.dumps({'url_base': URL_BASE, 'dominio': DOMINIO, 'links': links,
+                  'validos': [link_valido(url) for url in links], 'produto': motor.extrair(links[0])}))
+"""
+
+
+@pytest.fixture
+def shopee():
+    with ServidorShopee(captcha=0, login=0, lentas=0, sem_seletores=0, por_pagina=5) as servidor:
+        yield servidor
+
+
+def test_shopee_url_base_aponta_o_robo_para_o_servidor_local(shopee):
+    ambiente = dict(os.environ, SHOPEE_URL_BASE=shopee.url_base + '/')
+    saida = subprocess.run([sys.executable, '-c', SCRIPT_COLETA], cwd=RAIZ, env=ambiente,
+                           capture_output=True, text=True, timeout=60, check=True)
+
+    resultado = json.loads(saida.stdout.splitlines()[-1])
+    assert resultado['url_base'] == shopee.url_base  # sem a barra do fim
+    assert resultado['dominio'] == shopee.url_base.split('://')[1]
+    assert len(resultado['links']) == 5
+    # Os links do servidor local passam no filtro de domínio do robô
+    assert all(resultado['validos'])
+    assert resultado['produto']['URL'] == resultado['links'][0]
+    assert isinstance(resultado['produto']['Preço (R$)'], float)
+    assert shopee.servidas['busca'] == 1
+    assert shopee.servidas['produto'] == 1
+
+
+@pytest.mark.parametrize('captcha, login, estado', [(1.0, 0, CAPTCHA), (0, 1.0, LOGIN)])
+def test_motor_http_reconhece_o_redirecionamento_de_bloqueio(captcha, login, estado):
+    with ServidorShopee(captcha=captcha, login=login, lentas=0, por_pagina=1) as servidor:
+        url, _, _ = servidor.produtos_da_busca('Forno Elétrico 44L', 0)[0]
+
+        with pytest.raises(PaginaBloqueada) as erro:
+            MotorHttp(extrair_dados_html).extrair(url)
+
+    assert erro.value.estado == estado
+    assert servidor.servidas[estado] == 1
@@ -0,0 +1,115 @@
+"""Relatório de sugestão de preço (belmicro.sugestao) e o modo incremental sobre ele."""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from belmicro.armazenamento import ESQUEMA_RELATORIO, gravar_parquet, ler_parquet
+from belmicro.etapa_sugestao import aplicar_historico
+from belmicro.historico import HistoricoPrecos
+from belmicro.incremental import atualizar_sugestoes, impressoes_termos
+from belmicro.sugestao import SEPARADOR, VENDEDOR_BELMICRO, gerar_sugestoes, sugestoes_por_termo
+
+
+def anuncio(termo, vendedor, preco, comparativo='SIM', avaliacao=4.5, preco_belmicro=np.nan):
+    return {
+        'Termo Pesquisado': termo, 'Nome': f'{termo} ({vendedor})', 'Vendedor': vendedor, 'Preço (R$)': preco,
+        'Avaliação Média': avaliacao, 'Vendidos': 10.0, 'Link Loja': f'https://shopee.com.br/{vendedor}',
+        'URL': f'https://shopee.com.br/{termo}-{vendedor}', 'Preço Belmicro (R$)': preco_belmicro,
+        'Comparativo': comparativo,
+    }
+
+
+@pytest.fixture
+def anuncios():
+    return pd.DataFrame([
+        # Com referência da Belmicro: preços distintos 90, 100, 110, 120
+        anuncio('Forno', 'Belmicro Oficial', 100.0, avaliacao=4.8, preco_belmicro=100.0),
+        anuncio('Forno', 'Carrefour', 110.0),
+        anuncio('Forno', 'Fast Shop', 90.0),
+        anuncio('Forno', 'Loja do Zé', 50.0, comparativo='NÃO'),
+        anuncio('Forno', 'Eletro Sul', 120.0),
+        # Sem referência da Belmicro
+        anuncio('Micro-ondas', 'Carrefour', 20.0),
+        anuncio('Micro-ondas', 'Casas Bahia', 10.0),
+        # Nenhum aprovado: fica fora do relatório
+        anuncio('Geladeira', 'Carrefour', 3000.0, comparativo='NÃO'),
+    ])
+
+
+def test_linhas_e_ordem_do_relatorio(anuncios):
+    relatorio = gerar_sugestoes(anuncios)
+
+    assert list(relatorio['Termo Pesquisado (produto belmicro)']) == [
+        'Forno', 'Forno', 'Forno', 'Forno', SEPARADOR, 'Micro-ondas', 'Micro-ondas', SEPARADOR]
+    assert list(relatorio['Vendedor Concorrente'].iloc[:4]) == [
+        VENDEDOR_BELMICRO, 'Carrefour', 'Fast Shop', 'Eletro Sul']
+
+
+def test_terceiro_menor_preco_e_posicao_da_belmicro(anuncios):
+    relatorio = gerar_sugestoes(anuncios)
+    forno = relatorio.iloc[0]
+
+    assert forno['Preço Sugerido'] == 110.0
+    assert forno['Preço Belmicro Atual'] == 100.0
+    assert forno['Posição Belmicro'] == '2º de 4'
+    assert forno['Avaliação Belmicro'] == 4.8
+    assert np.isnan(forno['Preço Concorrente'])
+
+
+def test_termo_sem_referencia_da_belmicro(anuncios):
+    relatorio = gerar_sugestoes(anuncios)
+    micro_ondas = relatorio[relatorio['Termo Pesquisado (produto belmicro)'] == 'Micro-ondas']
+
+    # Com menos de 3 preços distintos, vale o maior
+    assert (micro_ondas['Preço Sugerido'] == 20.0).all()
+    assert (micro_ondas['Posição Belmicro'] == '-').all()
+    assert (micro_ondas['Avaliação Belmicro'] == '-').all()
+    assert micro_ondas['Preço Belmicro Atual'].isna().all()
+
+
+def test_estrategias_comparadas_ganham_coluna(anuncios):
+    relatorio = gerar_sugestoes(anuncios, comparar=['menor'])
+
+    sugestoes, precos_belmicro = sugestoes_por_termo(relatorio)
+    assert list(sugestoes.columns) == ['Preço Sugerido', 'Sugerido: menor']
+    assert sugestoes.loc['Forno'].tolist() == [110.0, 90.0]
+    assert precos_belmicro.loc['Forno'] == 100.0
+
+
+def test_sem_coluna_de_analise(anuncios):
+    with pytest.raises(KeyError):
+        gerar_sugestoes(anuncios.drop(columns='Comparativo'))
+
+
+def test_incremental_com_relatorio_lido_do_parquet_igual_ao_completo(anuncios, tmp_path):
+    caminho = str(tmp_path / 'relatorio.parquet')
+    gravar_parquet(gerar_sugestoes(anuncios), caminho, ESQUEMA_RELATORIO)
+    impressoes = impressoes_termos(anuncios, configuracao=('Comparativo', '3º menor', ()))
+    novos = anuncios.copy()
+    novos.loc[novos['Vendedor'] == 'Eletro Sul', 'Preço (R$)'] = 80.0
+
+    relatorio, _, recalculados = atualizar_sugestoes(novos, ler_parquet(caminho), impressoes)
+
+    assert list(recalculados) == ['Forno']
+    # O "-" do termo sem referência (que veio do Parquet) é o mesmo do relatório completo
+    pd.testing.assert_frame_equal(relatorio.astype(str), gerar_sugestoes(novos).astype(str))
+
+
+def test_historico_so_troca_pelo_preco_mediano_quando_pedido(tmp_path):
+    caminho = str(tmp_path / 'historico.sqlite')
+    url = 'https://shopee.com.br/Forno-i.10.20'
+    historico = HistoricoPrecos(caminho)
+    for dias_atras, preco in [(3, 100.0), (2, 120.0), (1, 140.0)]:
+        historico.registrar('Forno', [{'URL': url, 'Preço (R$)': preco}], time.time() - dias_atras * 86400)
+    historico.fechar()
+    coleta = pd.DataFrame({'URL': [url], 'Preço (R$)': [90.0]})
+
+    atual, eventos = aplicar_historico(coleta, caminho)
+    mediana, _ = aplicar_historico(coleta, caminho, preco_referencia='mediana')
+
+    assert atual['Preço (R$)'].tolist() == [90.0]
+    assert mediana['Preço (R$)'].tolist() == [120.0]
+    assert len(eventos) == 2